@@ -0,0 +1,230 @@
+"""Análisis semántico incremental por función para el editor.
+
+El programa se divide en sus bloques "func ... { ... }" y solo los bloques
+cuyo texto cambió desde el análisis anterior se vuelven a parsear y a
+transformar con ASTBuilder. Los demás reutilizan su AST, sus errores y sus
+llamadas; al final se repite únicamente la comprobación entre funciones de
+ASTBuilder.programa (función init y llamadas a funciones no declaradas).
+
+ASTBuilder guarda en la tabla global las declaraciones de la primera
+función y las siguientes la consultan, así que un bloque solo se reutiliza
+si la tabla global con la que se analizó no cambió. Ante cualquier error de
+sintaxis se analiza el programa completo para reportar el mismo mensaje que
+analizar_programa.
+
+Cada bloque se parsea desde su línea 1 y se guarda así; si su posición en
+el programa no es la línea 1 se entrega una copia con las líneas desplazadas,
+de modo que los AST devueltos en análisis anteriores no cambian.
+"""
+import re
+import threading
+
+from lark.exceptions import UnexpectedInput
+
+from analizador_semantico import ASTBuilder, analizar_programa, grammar, resolver_variables
+from nodos_ast import Nodo
+from tablas_parser import crear_parser_lark
+
+
+# Texto permitido entre funciones: espacios y comentarios, igual que en la gramática
+SEPARADOR = re.compile(r"(?:\s+|//[^\n]*)*")
+INICIO_FUNCION = re.compile(r"func(?![a-zA-Z0-9_])")
+
+_parser_funciones = None
+_bloqueo_parser = threading.Lock()
+
+
+def parser_funciones():
+    """Parser LALR de la gramática que empieza en la regla func (se crea una vez)"""
+    global _parser_funciones
+    if _parser_funciones is None:
+        with _bloqueo_parser:
+            if _parser_funciones is None:
+                _parser_funciones = crear_parser_lark(grammar, start='func')
+    return _parser_funciones
+
+
+def dividir_funciones(codigo):
+    """Texto de cada bloque func del programa, o None si hay texto fuera de ellos"""
+    bloques = []
+    posicion = 0
+    longitud = len(codigo)
+    while True:
+        posicion = SEPARADOR.match(codigo, posicion).end()
+        if posicion >= longitud:
+            return bloques
+        if not INICIO_FUNCION.match(codigo, posicion):
+            return None
+        inicio = posicion
+        profundidad = 0
+        while posicion < longitud:
+            caracter = codigo[posicion]
+            if caracter == '"':
+                cierre = codigo.find('"', posicion + 1)
+                if cierre < 0:
+                    return None
+                posicion = cierre
+            elif caracter == "/" and codigo.startswith("//", posicion):
+                salto = codigo.find("\n", posicion)
+                posicion = longitud - 1 if salto < 0 else salto
+            elif caracter == "{":
+                profundidad += 1
+            elif caracter == "}":
+                profundidad -= 1
+                if profundidad == 0:
+                    break
+            posicion += 1
+        else:
+            return None
+        posicion += 1
+        bloques.append(codigo[inicio:posicion])
+
+
+def slots_de(clase):
+    """Slots de una clase de nodo, también los heredados (Entero guarda valor en Literal)"""
+    return [campo for base in clase.__mro__ for campo in base.__dict__.get("__slots__", ())]
+
+
+def copiar_desplazado(valor, desplazamiento):
+    """Copia el subárbol sumando desplazamiento a la línea de cada nodo que la tenga"""
+    if isinstance(valor, Nodo):
+        copia = object.__new__(type(valor))
+        for campo in slots_de(type(valor)):
+            try:
+                hijo = getattr(valor, campo)
+            except AttributeError:
+                continue
+            if campo == "linea" and hijo is not None:
+                hijo += desplazamiento
+            setattr(copia, campo, copiar_desplazado(hijo, desplazamiento))
+        return copia
+    if isinstance(valor, list):
+        return [copiar_desplazado(elemento, desplazamiento) for elemento in valor]
+    return valor
+
+
+class FuncionAnalizada:
+    """Resultado de transformar un bloque func con ASTBuilder"""
+    __slots__ = ("funcion", "errores", "llamadas", "globales", "slots", "tabla", "ambitos", "colocada")
+
+    def __init__(self, funcion, errores, llamadas, globales, slots, tabla, ambitos):
+        # AST con líneas desde 1; nunca se modifica, se copia al moverlo (ver en_linea)
+        self.funcion = funcion
+        self.errores = errores
+        self.llamadas = llamadas
+        # Tabla global con la que se analizó (la que produjo, si es la primera función)
+        self.globales = globales
+        self.slots = slots
+        # Tabla de símbolos de la función (la global, si es la primera)
+        self.tabla = tabla
+        # TablaSimbolos con solo esta función, con líneas desde 1 (ver TablaSimbolos.agregar_funcion)
+        self.ambitos = ambitos
+        # (línea, copia del AST) de la última posición pedida a en_linea
+        self.colocada = (1, funcion)
+
+    def en_linea(self, linea):
+        """AST de la función con sus líneas contadas desde la línea del programa donde empieza.
+
+        Los nodos ya devueltos no cambian: si el bloque se movió se entrega una copia nueva.
+        """
+        if self.colocada[0] != linea:
+            self.colocada = (linea, copiar_desplazado(self.funcion, linea - 1))
+        return self.colocada[1]
+
+
+class AnalizadorIncremental:
+    """Repite analizar_programa reutilizando las funciones que no cambiaron"""
+    def __init__(self):
+        # (texto del bloque, es la primera función) -> FuncionAnalizada
+        self.funciones = {}
+        self.reanalizadas = 0
+        self.reutilizadas = 0
+
+    def analizar(self, codigo, compilacion=None):
+        """Mismo resultado que analizar_programa(codigo).
+
+        Con una Compilacion del mismo código, el análisis completo usa sus
+        tokens en lugar de volver a tokenizar el texto.
+        """
+        bloques = dividir_funciones(codigo)
+        if not bloques:
+            return self.analizar_completo(codigo, compilacion)
+
+        try:
+            analizadas = []
+            globales = {}
+            inicio = fin = 0
+            linea = 1
+            for indice, bloque in enumerate(bloques):
+                anterior, inicio = inicio, codigo.index(bloque, fin)
+                linea += codigo.count("\n", anterior, inicio)
+                fin = inicio + len(bloque)
+                clave = (bloque, indice == 0)
+                analizada = self.funciones.get(clave)
+                if analizada is None or (indice > 0 and analizada.globales != globales):
+                    analizada = self.analizar_funcion(bloque, indice == 0, globales)
+                    self.reanalizadas += 1
+                else:
+                    self.reutilizadas += 1
+                analizadas.append((clave, analizada, linea))
+                if indice == 0:
+                    globales = analizada.globales
+        except UnexpectedInput:
+            # Errores de sintaxis: el análisis completo da el mensaje exacto
+            return self.analizar_completo(codigo, compilacion)
+
+        # Solo se conservan las funciones del programa actual
+        self.funciones = {clave: analizada for clave, analizada, _ in analizadas}
+
+        transformador = ASTBuilder()
+        transformador.tabla_simbolos_global = dict(globales)
+        funciones = []
+        for _, analizada, linea in analizadas:
+            transformador.errores_semanticos.extend(analizada.errores)
+            transformador.llamadas_funciones.extend(analizada.llamadas)
+            # Copia de los símbolos ya resueltos de la función; las llamadas se resuelven en programa
+            transformador.tabla_ambitos.agregar_funcion(analizada.ambitos, linea - 1)
+            funciones.append(analizada.en_linea(linea))
+        ast = transformador.programa(*funciones)
+        analizadas = [analizada for _, analizada, _ in analizadas]
+        slots = {analizada.funcion.nombre: analizada.slots for analizada in analizadas}
+
+        return {
+            "exito": len(transformador.errores_semanticos) == 0,
+            "ast": ast,
+            "tabla_simbolos": {
+                "global": transformador.tabla_simbolos_global,
+                "local": transformador.tabla_simbolos_local,
+                "funciones": {analizada.funcion.nombre: analizada.tabla for analizada in analizadas}
+            },
+            "tabla_funciones": transformador.tabla_funciones,
+            "tabla_ambitos": transformador.tabla_ambitos,
+            "tabla_slots": {nombre: slots[nombre] for nombre in transformador.tabla_funciones},
+            "optimizacion": None,
+            "errores": transformador.errores_semanticos
+        }
+
+    def analizar_funcion(self, bloque, primera, globales):
+        """Transforma un bloque con el mismo estado que tendría ASTBuilder al llegar a él"""
+        arbol = parser_funciones().parse(bloque)
+        transformador = ASTBuilder()
+        if not primera:
+            # Después de la primera función el ámbito ya no es global
+            transformador.ambito_actual = "func"
+            transformador.tabla_simbolos_global = dict(globales)
+        funcion = transformador.transform(arbol)
+        return FuncionAnalizada(
+            funcion,
+            transformador.errores_semanticos,
+            transformador.llamadas_funciones,
+            transformador.tabla_simbolos_global if primera else globales,
+            resolver_variables(funcion),
+            transformador.tablas_funciones[funcion.nombre],
+            transformador.tabla_ambitos
+        )
+
+    def analizar_completo(self, codigo, compilacion=None):
+        self.funciones = {}
+        if compilacion is not None:
+            return compilacion.vista_semantica()
+        return analizar_programa(codigo)
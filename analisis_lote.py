@@ -0,0 +1,153 @@
+"""Análisis léxico, sintáctico y semántico de muchos archivos sin interfaz gráfica.
+
+Los archivos se reparten entre procesos (uno por núcleo por defecto) y el
+resumen se escribe en JSON: errores, tiempos y cantidad de símbolos por
+archivo. El éxito de cada archivo y el código de salida (1 si algún archivo
+falla) dependen del análisis de Lark y ASTBuilder, el del lenguaje completo;
+la gramática de PLY solo acepta "func init { ... }", así que su resultado se
+informa aparte en exito_ply.
+
+Uso: python analisis_lote.py RUTA [RUTA ...] [--patron "*.txt"] [--procesos N]
+                             [--salida resumen.json] [--cache DIRECTORIO]
+"""
+import argparse
+import contextlib
+import fnmatch
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from compilacion import Compilacion
+
+
+# Caché de análisis del proceso (se crea en cada proceso del grupo)
+_cache = None
+
+
+def expandir_rutas(rutas, patron="*.txt"):
+    """Archivos de las rutas: directorios (recursivos, filtrados por patron), globs o archivos"""
+    archivos = set()
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            for directorio, _, nombres in os.walk(ruta):
+                archivos.update(os.path.join(directorio, nombre) for nombre in fnmatch.filter(nombres, patron))
+        elif glob.has_magic(ruta):
+            archivos.update(archivo for archivo in glob.glob(ruta, recursive=True) if os.path.isfile(archivo))
+        else:
+            archivos.add(ruta)
+    return sorted(archivos)
+
+
+def iniciar_proceso(directorio_cache):
+    global _cache
+    if directorio_cache is not None:
+        from cache_analisis import CacheAnalisis
+        _cache = CacheAnalisis(directorio_cache)
+
+
+def analizar_archivo(ruta):
+    """Resumen del análisis de un archivo (se ejecuta en un proceso del grupo)"""
+    resumen = {"archivo": ruta}
+    try:
+        with open(ruta, encoding="utf-8") as archivo:
+            codigo = archivo.read()
+    except (OSError, UnicodeDecodeError) as e:
+        resumen.update(exito=False, error=f"No se pudo leer el archivo: {e}")
+        return resumen
+
+    tiempos = {}
+    compilacion = Compilacion(codigo)
+    # Los analizadores imprimen los caracteres ilegales; el resumen ya los incluye
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        tokens, palabras_reservadas, errores_lexicos = compilacion.vista_tokens()
+        tiempos["lexico"] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        try:
+            _, errores_sintacticos = compilacion.vista_sintactica()
+        except Exception as e:
+            errores_sintacticos = [f"Error: {str(e)}"]
+        tiempos["sintactico"] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        if _cache is not None:
+            resultado = _cache.analizar(codigo, compilacion=compilacion)
+        else:
+            resultado = compilacion.vista_semantica()
+        tiempos["semantico"] = time.perf_counter() - inicio
+
+    if "mensaje" in resultado:
+        errores_semanticos = [resultado["mensaje"]]
+    else:
+        errores_semanticos = list(resultado["errores"])
+    tabla_simbolos = resultado.get("tabla_simbolos", {})
+    globales = tabla_simbolos.get("global", {})
+    # La primera función declara en la tabla global; sus variables no se cuentan dos veces
+    locales = [tabla for tabla in tabla_simbolos.get("funciones", {}).values() if tabla is not globales]
+
+    resumen.update(
+        exito=resultado["exito"],
+        exito_ply=not errores_lexicos and not errores_sintacticos,
+        tokens=len(tokens),
+        palabras_reservadas=len(palabras_reservadas),
+        simbolos_globales=len(globales),
+        simbolos_locales=sum(len(tabla) for tabla in locales),
+        funciones=len(resultado.get("tabla_funciones", {})),
+        errores_lexicos=errores_lexicos,
+        errores_sintacticos=list(errores_sintacticos),
+        errores_semanticos=errores_semanticos,
+        tiempos=tiempos,
+    )
+    return resumen
+
+
+def analizar_archivos(archivos, procesos=None, directorio_cache=None):
+    """Resumen de todos los archivos, en el mismo orden, analizados en paralelo"""
+    procesos = procesos or os.cpu_count() or 1
+    inicio = time.perf_counter()
+    if procesos == 1 or len(archivos) <= 1:
+        iniciar_proceso(directorio_cache)
+        resultados = [analizar_archivo(ruta) for ruta in archivos]
+    else:
+        # Varios archivos por tarea para no pagar la comunicación entre procesos por cada uno
+        tamano_tarea = max(1, len(archivos) // (procesos * 4))
+        with ProcessPoolExecutor(max_workers=procesos, initializer=iniciar_proceso,
+                                 initargs=(directorio_cache,)) as grupo:
+            resultados = list(grupo.map(analizar_archivo, archivos, chunksize=tamano_tarea))
+    return {
+        "archivos": len(resultados),
+        "con_errores": sum(1 for resumen in resultados if not resumen["exito"]),
+        "procesos": procesos,
+        "tiempo_total": time.perf_counter() - inicio,
+        "resultados": resultados,
+    }
+
+
+def main(argumentos=None):
+    lector = argparse.ArgumentParser(description="Analiza archivos fuente sin la interfaz gráfica")
+    lector.add_argument("rutas", nargs="+", help="archivos, directorios o patrones glob")
+    lector.add_argument("--patron", default="*.txt", help="archivos a incluir de cada directorio")
+    lector.add_argument("--procesos", type=int, default=None, help="procesos en paralelo (por defecto, uno por núcleo)")
+    lector.add_argument("--salida", help="archivo JSON del resumen (por defecto, la salida estándar)")
+    lector.add_argument("--cache", help="directorio de la caché de análisis semántico")
+    opciones = lector.parse_args(argumentos)
+
+    archivos = expandir_rutas(opciones.rutas, opciones.patron)
+    resumen = analizar_archivos(archivos, opciones.procesos, opciones.cache)
+
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resumen, archivo, ensure_ascii=False, indent=2)
+    else:
+        json.dump(resumen, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    return 1 if resumen["con_errores"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
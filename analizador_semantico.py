@@ -1,6 +1,18 @@
-from lark import Lark, Transformer, v_args
+import threading
+
+from lark import Transformer, v_args
+from lark.lexer import Lexer
 from lark.exceptions import UnexpectedInput, UnexpectedToken, UnexpectedCharacters
 
+from nodos_ast import (
+    Nodo, Programa, Funcion, LlamadaFuncion, DeclaracionVariable, Asignacion, If, IfElse,
+    While, For, Escribir, Leer, Operacion, Comparacion, Logica, Entero, Flotante, Cadena, Booleano,
+    Variable
+)
+from optimizador import OPERADORES, NO_CONSTANTE, valor_constante, optimizar_programa
+from tabla_simbolos import Ambito, Simbolo, TablaSimbolos
+from tablas_parser import crear_parser_lark
+
 
 grammar = r"""
     ?start: programa
@@ -22,23 +34,25 @@ grammar = r"""
     declaracion_variable: "val" IDENTIFICADOR ("=" expresion)? ";"
     asignacion: IDENTIFICADOR "=" expresion ";"
     
-    estructura_if: "if" "(" condicion ")" "{" instruccion* "}"
-    estructura_else: "if" "(" condicion ")" "{" instruccion* "}" "else" "{" instruccion* "}"
-    estructura_while: "while" "(" condicion ")" "{" instruccion* "}"
+    estructura_if: IF "(" condicion ")" "{" instruccion* "}"
+    estructura_else: IF "(" condicion ")" bloque "else" bloque
+    estructura_while: WHILE "(" condicion ")" "{" instruccion* "}"
     estructura_for: "for" "(" declaracion_variable condicion ";" IDENTIFICADOR operador_incremento ")" "{" instruccion* "}"
     
-    print_statement: "escribir" "(" expresion ")" ";"
+    print_statement: ESCRIBIR "(" expresion ")" ";"
     input_statement: "leer" "(" IDENTIFICADOR ")" ";"
     llamada_funcion: IDENTIFICADOR "(" ")" ";"
     
-    ?operador_incremento: "++"
-                        | "--"
+    bloque: "{" instruccion* "}"
+    
+    ?operador_incremento: INCREMENTO
+                        | DECREMENTO
 
     ?condicion: expresion_logica 
               | valor_booleano
-              | IDENTIFICADOR  
+              | IDENTIFICADOR -> variable
 
-    expresion_logica: expresion_relacional (LOGICO expresion_relacional)*
+    ?expresion_logica: expresion_relacional (LOGICO expresion_relacional)*
 
     ?expresion_relacional: expresion COMPARACION expresion
                          | "(" expresion_logica ")"
@@ -58,6 +72,12 @@ grammar = r"""
     OPERADOR_ARITMETICO: "+" | "-" | "*" | "/"
     COMPARACION: "==" | "!=" | "<" | ">" | "<=" | ">="
     LOGICO: "&&" | "||"
+    // Palabras con nombre para que la línea de la instrucción llegue a ASTBuilder
+    IF: "if"
+    WHILE: "while"
+    ESCRIBIR: "escribir"
+    INCREMENTO: "++"
+    DECREMENTO: "--"
     
     IDENTIFICADOR: /[a-zA-Z_][a-zA-Z0-9_]*/
     NUMERO: /[0-9]+(\.[0-9]+)?/
@@ -70,23 +90,81 @@ grammar = r"""
     %ignore COMENTARIO
 """
 
-# Crear el parser de Lark
-parser = Lark(grammar, parser='lalr', debug=True)
+# Crear el parser de Lark (serializado en el directorio de caché)
+parser = crear_parser_lark(grammar)
+
+
+class LexerTokens(Lexer):
+    """Lexer para Lark que entrega tokens ya generados en lugar de texto.
+
+    En lugar de texto recibe una función siguiente(aceptados) que devuelve el
+    próximo token (o None al final) eligiendo su terminal entre los que
+    acepta el estado actual del parser, como el lexer contextual de Lark.
+    """
+    __future_interface__ = 1
+
+    def __init__(self, lexer_conf):
+        pass
+
+    def lex(self, lexer_state, parser_state):
+        siguiente = lexer_state.text
+        estados = parser_state.parse_conf.parse_table.states
+        while True:
+            token = siguiente(estados[parser_state.position])
+            if token is None:
+                return
+            yield token
+
+
+# Parser con la misma gramática que consume tokens de Lark ya generados
+parser_tokens = crear_parser_lark(grammar, lexer=LexerTokens)
+
+# Parser en línea de cada hilo con su ASTBuilder (ver parser_en_linea)
+_local = threading.local()
+
+
+def linea_de(token):
+    """Línea de un token de Lark (None si el valor no viene de un token)"""
+    return getattr(token, "line", None)
+
+
+def posicion_de(token):
+    return getattr(token, "start_pos", None) or 0
+
+
 @v_args(inline=True)
 class ASTBuilder(Transformer):
     def __init__(self):
         super().__init__()
+        self.reiniciar()
+    
+    def reiniciar(self):
+        """Estado vacío para analizar otro programa (objetos nuevos: los resultados anteriores no cambian)"""
         self.tabla_simbolos_global = {}  
         self.tabla_funciones = {}       
         self.llamadas_funciones = []     
         self.errores_semanticos = []
         self.ambito_actual = None        
         self.tabla_simbolos_local = {}   
+        # Tabla de cada función por nombre (la primera función declara en la global)
+        self.tablas_funciones = {}
+        # Tabla por ámbitos con líneas y usos, llenada junto con las tablas anteriores
+        self.tabla_ambitos = TablaSimbolos()
+        # Simbolo de cada nombre de tabla_simbolos_global y tabla_simbolos_local
+        self.simbolos_global = {}
+        self.simbolos_local = {}
+        # Símbolos y ámbitos de bloque declarados dentro de cada nodo, hasta que los adopte su bloque
+        self.contenido = {}
+        # (posición, símbolo, nombre, línea, clase) de los usos de la función en curso, en orden de evaluación
+        self.usos_pendientes = []
+        self.llamadas_pendientes = []
+        # Índice en tabla_ambitos.simbolos del primer símbolo de la función en curso
+        self.inicio_funcion = 0
     
     def programa(self, *funciones):
     
         for func in funciones:
-            nombre_func = func.get("nombre")
+            nombre_func = func.nombre
             self.tabla_funciones[nombre_func] = func
         
         # Verificar que haya una función init
@@ -98,12 +176,22 @@ class ASTBuilder(Transformer):
             if llamada not in self.tabla_funciones:
                 self.errores_semanticos.append(f"Error semántico: Función '{llamada}' no declarada")
         
-        return {"tipo": "programa", "funciones": list(funciones)}
+        self.tabla_ambitos.resolver_llamadas()
+        return Programa(list(funciones))
     
     def func(self, nombre, *instrucciones):
         nombre_func = str(nombre)
+        # Las instrucciones ya se transformaron: la tabla actual es la de esta función
+        if self.ambito_actual:
+            self.tablas_funciones[nombre_func] = self.tabla_simbolos_local
+            visibles = self.simbolos_local
+        else:
+            self.tablas_funciones[nombre_func] = self.tabla_simbolos_global
+            visibles = self.simbolos_global
+        self.cerrar_ambito_funcion(nombre_func, linea_de(nombre), instrucciones, visibles)
         self.ambito_actual = nombre_func
         self.tabla_simbolos_local = {}  
+        self.simbolos_local = {}
         
       
         instrucciones_procesadas = []
@@ -111,14 +199,70 @@ class ASTBuilder(Transformer):
             instrucciones_procesadas.append(inst)
         
         
-        return {"tipo": "funcion", "nombre": nombre_func, "instrucciones": instrucciones_procesadas}
+        return Funcion(nombre_func, instrucciones_procesadas, linea_de(nombre))
     
+    def cerrar_ambito_funcion(self, nombre_func, linea, instrucciones, visibles):
+        """Arma el ámbito de la función con lo declarado en sus instrucciones y registra sus usos"""
+        ambito = Ambito(nombre_func, "funcion", linea=linea)
+        self.adoptar(ambito, instrucciones)
+        # El símbolo de la función va antes que los de sus variables, en orden del código
+        self.tabla_ambitos.declarar_funcion(ambito, visibles, self.inicio_funcion)
+        self.inicio_funcion = len(self.tabla_ambitos.simbolos)
+        for _, simbolo, nombre, linea_uso, clase in self.usos_pendientes:
+            if simbolo is None:
+                self.tabla_ambitos.no_resueltos.append((nombre, linea_uso, nombre_func, clase))
+            else:
+                simbolo.usos.append((linea_uso, clase))
+        self.tabla_ambitos.llamadas.extend(
+            (nombre, linea_llamada, nombre_func) for nombre, linea_llamada in self.llamadas_pendientes)
+        self.usos_pendientes = []
+        self.llamadas_pendientes = []
+
+    def adoptar(self, ambito, instrucciones):
+        """Pasa a ambito los símbolos y bloques declarados en instrucciones"""
+        for instruccion in instrucciones:
+            contenido = self.contenido.pop(id(instruccion), None)
+            if contenido:
+                ambito.adoptar(contenido)
+
+    def bloque_nuevo(self, nodo, *cuerpos):
+        """Ámbito de cada (nombre, instrucciones) de nodo; quedan pendientes hasta que los adopte su padre"""
+        ambitos = []
+        for nombre, instrucciones in cuerpos:
+            ambito = Ambito(nombre, "bloque", linea=nodo.linea)
+            self.adoptar(ambito, instrucciones)
+            ambitos.append(ambito)
+        self.contenido[id(nodo)] = ambitos
+        return nodo
+
+    def usar(self, nombre, token, clase, antes_del_cuerpo=False):
+        """Anota un uso de nombre resuelto con las tablas actuales (se registra al cerrar la función).
+
+        Los usos quedan en el orden en que se reducen. La variable del for se
+        reduce después de su cuerpo: con antes_del_cuerpo, el uso se ubica
+        antes de los usos que están más adelante en el código.
+        """
+        simbolo = self.simbolos_local.get(nombre) if self.ambito_actual else None
+        if simbolo is None:
+            simbolo = self.simbolos_global.get(nombre)
+        posicion = posicion_de(token)
+        indice = len(self.usos_pendientes)
+        while antes_del_cuerpo and indice > 0 and self.usos_pendientes[indice - 1][0] > posicion:
+            indice -= 1
+        self.usos_pendientes.insert(indice, (posicion, simbolo, nombre, linea_de(token), clase))
+
+    def declarar_simbolo(self, nodo, simbolos, tipo, valor):
+        simbolo = simbolos[nodo.nombre] = self.tabla_ambitos.declarar(Simbolo(nodo.nombre, tipo, valor, nodo.linea))
+        self.contenido[id(nodo)] = [simbolo]
+        return nodo
+
     def llamada_funcion(self, nombre):
         nombre_func = str(nombre)
        
         self.llamadas_funciones.append(nombre_func)
+        self.llamadas_pendientes.append((nombre_func, linea_de(nombre)))
         
-        return {"tipo": "llamada_funcion", "nombre": nombre_func}
+        return LlamadaFuncion(nombre_func, linea_de(nombre))
     
     def declaracion_variable(self, identificador, *args):
         nombre_var = str(identificador)
@@ -134,11 +278,13 @@ class ASTBuilder(Transformer):
                     tipo_expr = self.inferir_tipo(expresion)
                     valor_inicial = self.evaluar_valor_inicial(expresion)
                     self.tabla_simbolos_local[nombre_var] = {"tipo": tipo_expr, "valor": valor_inicial}
-                    return {"tipo": "declaracion_variable", "nombre": nombre_var, "valor": expresion}
+                    return self.declarar_simbolo(DeclaracionVariable(nombre_var, expresion, linea_de(identificador)),
+                                                 self.simbolos_local, tipo_expr, valor_inicial)
                 else:
                     # Si no hay argumentos, es una declaración sin inicialización
                     self.tabla_simbolos_local[nombre_var] = {"tipo": "any", "valor": "No inicializado"}
-                    return {"tipo": "declaracion_variable", "nombre": nombre_var, "valor": None}
+                    return self.declarar_simbolo(DeclaracionVariable(nombre_var, None, linea_de(identificador)),
+                                                 self.simbolos_local, "any", "No inicializado")
         else:  
             if nombre_var in self.tabla_simbolos_global:
                 self.errores_semanticos.append(f"Error semántico: Variable '{nombre_var}' ya declarada")
@@ -148,23 +294,23 @@ class ASTBuilder(Transformer):
                     tipo_expr = self.inferir_tipo(expresion)
                     valor_inicial = self.evaluar_valor_inicial(expresion)
                     self.tabla_simbolos_global[nombre_var] = {"tipo": tipo_expr, "valor": valor_inicial}
-                    return {"tipo": "declaracion_variable", "nombre": nombre_var, "valor": expresion}
+                    return self.declarar_simbolo(DeclaracionVariable(nombre_var, expresion, linea_de(identificador)),
+                                                 self.simbolos_global, tipo_expr, valor_inicial)
                 else:
                     self.tabla_simbolos_global[nombre_var] = {"tipo": "any", "valor": "No inicializado"}
-                    return {"tipo": "declaracion_variable", "nombre": nombre_var, "valor": None}
+                    return self.declarar_simbolo(DeclaracionVariable(nombre_var, None, linea_de(identificador)),
+                                                 self.simbolos_global, "any", "No inicializado")
             
     def evaluar_valor_inicial(self, expresion):
-        """Intenta evaluar el valor inicial de una expresión constante"""
-        if isinstance(expresion, dict):
-            if expresion["tipo"] == "entero":
-                return expresion["valor"]
-            elif expresion["tipo"] == "flotante":
-                return expresion["valor"]
-            elif expresion["tipo"] == "cadena":
-                return f'"{expresion["valor"]}"'
-            elif expresion["tipo"] == "booleano":
-                return "true" if expresion["valor"] else "false"
-        return "Expresión compleja"
+        """Intenta evaluar el valor inicial de una expresión constante (10 * 4 + 2)"""
+        valor = valor_constante(expresion)
+        if valor is NO_CONSTANTE:
+            return "Expresión compleja"
+        if isinstance(valor, bool):
+            return "true" if valor else "false"
+        if isinstance(valor, str):
+            return f'"{valor}"'
+        return valor
     
     def asignacion(self, identificador, expresion):
         nombre_var = str(identificador)
@@ -183,20 +329,26 @@ class ASTBuilder(Transformer):
         else:
             self.errores_semanticos.append(f"Error semántico: Variable '{nombre_var}' no declarada")
         
-        return {"tipo": "asignacion", "nombre": nombre_var, "valor": expresion}
+        self.usar(nombre_var, identificador, "escritura")
+        return Asignacion(nombre_var, expresion, linea_de(identificador))
     
-    def estructura_if(self, condicion, *instrucciones):
+    def estructura_if(self, palabra, condicion, *instrucciones):
       
         instrucciones_lista = list(instrucciones)
-        return {"tipo": "if", "condicion": condicion, "cuerpo": instrucciones_lista}
+        return self.bloque_nuevo(If(condicion, instrucciones_lista, linea_de(palabra)), ("if", instrucciones_lista))
+    
+    def bloque(self, *instrucciones):
+        return list(instrucciones)
     
-    def estructura_else(self, condicion, cuerpo_if, cuerpo_else):
-        return {"tipo": "if_else", "condicion": condicion, "cuerpo_if": cuerpo_if, "cuerpo_else": cuerpo_else}
+    def estructura_else(self, palabra, condicion, cuerpo_if, cuerpo_else):
+        return self.bloque_nuevo(IfElse(condicion, cuerpo_if, cuerpo_else, linea_de(palabra)),
+                                 ("if", cuerpo_if), ("else", cuerpo_else))
     
-    def estructura_while(self, condicion, *instrucciones):
+    def estructura_while(self, palabra, condicion, *instrucciones):
        
         instrucciones_lista = list(instrucciones)
-        return {"tipo": "while", "condicion": condicion, "cuerpo": instrucciones_lista}
+        return self.bloque_nuevo(While(condicion, instrucciones_lista, linea_de(palabra)),
+                                 ("while", instrucciones_lista))
     
     def estructura_for(self, inicializacion, condicion, variable, operador, *instrucciones):
         nombre_var = str(variable)
@@ -206,17 +358,13 @@ class ASTBuilder(Transformer):
         if not (nombre_var in self.tabla_simbolos_local or nombre_var in self.tabla_simbolos_global):
             self.errores_semanticos.append(f"Error semántico: Variable '{nombre_var}' no declarada en bucle for")
         
-        return {
-            "tipo": "for", 
-            "inicializacion": inicializacion, 
-            "condicion": condicion, 
-            "variable": nombre_var,
-            "operador": operador,
-            "cuerpo": instrucciones_lista
-        }
+        self.usar(nombre_var, variable, "escritura", antes_del_cuerpo=True)
+        return self.bloque_nuevo(
+            For(inicializacion, condicion, nombre_var, str(operador), instrucciones_lista, linea_de(variable)),
+            ("for", [inicializacion] + instrucciones_lista))
     
-    def print_statement(self, expresion):
-        return {"tipo": "escribir", "expresion": expresion}
+    def print_statement(self, palabra, expresion):
+        return Escribir(expresion, linea_de(palabra))
     
     def input_statement(self, identificador):
         nombre_var = str(identificador)
@@ -225,7 +373,8 @@ class ASTBuilder(Transformer):
         if not (nombre_var in self.tabla_simbolos_local or nombre_var in self.tabla_simbolos_global):
             self.errores_semanticos.append(f"Error semántico: Variable '{nombre_var}' no declarada en input")
         
-        return {"tipo": "leer", "variable": nombre_var}
+        self.usar(nombre_var, identificador, "escritura")
+        return Leer(nombre_var, linea_de(identificador))
     
     def operacion(self, izquierda, operador, derecha):
         tipo_izq = self.inferir_tipo(izquierda)
@@ -234,7 +383,7 @@ class ASTBuilder(Transformer):
         if not self.tipos_compatibles(tipo_izq, tipo_der):
             self.errores_semanticos.append(f"Error semántico: Incompatibilidad de tipos en operación aritmética")
         
-        return {"tipo": "operacion", "operador": str(operador), "izquierda": izquierda, "derecha": derecha}
+        return Operacion(str(operador), izquierda, derecha)
     
     def expresion_relacional(self, izquierda, operador, derecha):
         tipo_izq = self.inferir_tipo(izquierda)
@@ -244,39 +393,47 @@ class ASTBuilder(Transformer):
         if not self.tipos_compatibles(tipo_izq, tipo_der):
             self.errores_semanticos.append(f"Error semántico: Incompatibilidad de tipos en comparación")
         
-        return {"tipo": "comparacion", "operador": str(operador), "izquierda": izquierda, "derecha": derecha}
+        return Comparacion(str(operador), izquierda, derecha)
+    
+    def expresion_logica(self, izquierda, *resto):
+        # resto alterna operador y operando: a && b || c se agrupa como (a && b) || c
+        expresion = izquierda
+        for indice in range(0, len(resto), 2):
+            expresion = Logica(str(resto[indice]), expresion, resto[indice + 1])
+        return expresion
     
     def booleano(self, valor):
         valor_bool = str(valor).lower() == "true"
-        return {"tipo": "booleano", "valor": valor_bool}
+        return Booleano(valor_bool)
     
     def true(self):
-        return {"tipo": "booleano", "valor": True}
+        return Booleano(True)
     
     def false(self):
-        return {"tipo": "booleano", "valor": False}
+        return Booleano(False)
     
     def numero(self, valor):
         if "." in str(valor):
-            return {"tipo": "flotante", "valor": float(valor)}
+            return Flotante(float(valor))
         else:
-            return {"tipo": "entero", "valor": int(valor)}
+            return Entero(int(valor))
     
     def variable(self, nombre):
         nombre_var = str(nombre)
+        self.usar(nombre_var, nombre, "lectura")
         
      
         if self.ambito_actual and nombre_var in self.tabla_simbolos_local:
-            return {"tipo": "variable", "nombre": nombre_var}
+            return Variable(nombre_var, linea_de(nombre))
         elif nombre_var in self.tabla_simbolos_global:
-            return {"tipo": "variable", "nombre": nombre_var}
+            return Variable(nombre_var, linea_de(nombre))
         else:
             self.errores_semanticos.append(f"Error semántico: Variable '{nombre_var}' no declarada")
-            return {"tipo": "variable", "nombre": nombre_var}
+            return Variable(nombre_var, linea_de(nombre))
     
     def cadena(self, valor):
         valor_str = str(valor)[1:-1]
-        return {"tipo": "cadena", "valor": valor_str}
+        return Cadena(valor_str)
     
     def parentesis(self, expresion):
         return expresion
@@ -292,26 +449,26 @@ class ASTBuilder(Transformer):
         return False
     
     def inferir_tipo(self, expresion):
-        if isinstance(expresion, dict):
-            if expresion["tipo"] == "entero":
+        if isinstance(expresion, Nodo):
+            if expresion.tipo == "entero":
                 return "entero"
-            elif expresion["tipo"] == "flotante":
+            elif expresion.tipo == "flotante":
                 return "flotante"
-            elif expresion["tipo"] == "cadena":
+            elif expresion.tipo == "cadena":
                 return "cadena"
-            elif expresion["tipo"] == "booleano":
+            elif expresion.tipo == "booleano":
                 return "booleano"
-            elif expresion["tipo"] == "variable":
-                nombre_var = expresion["nombre"]
+            elif expresion.tipo == "variable":
+                nombre_var = expresion.nombre
               
                 if self.ambito_actual and nombre_var in self.tabla_simbolos_local:
                     return self.tabla_simbolos_local[nombre_var]["tipo"]
                 elif nombre_var in self.tabla_simbolos_global:
                     return self.tabla_simbolos_global[nombre_var]["tipo"]
                 return "any"
-            elif expresion["tipo"] == "operacion":
-                tipo_izq = self.inferir_tipo(expresion["izquierda"])
-                tipo_der = self.inferir_tipo(expresion["derecha"])
+            elif expresion.tipo == "operacion":
+                tipo_izq = self.inferir_tipo(expresion.izquierda)
+                tipo_der = self.inferir_tipo(expresion.derecha)
                 
                
                 if tipo_izq == tipo_der:
@@ -329,22 +486,65 @@ class ASTBuilder(Transformer):
         return "any" 
 
 
-def analizar_programa(codigo):
+def parser_en_linea(tokens=False):
+    """(parser, transformador) de este hilo: el LALR llama a ASTBuilder en cada reducción.
+    
+    El AST se construye durante el parseo, sin el árbol de Lark intermedio ni
+    el segundo recorrido de transform. Como el transformador queda fijo en el
+    parser, cada hilo tiene el suyo y se reinicia antes de cada programa. Con
+    tokens=True el parser consume tokens ya generados (ver LexerTokens).
+    """
+    clave = "en_linea_tokens" if tokens else "en_linea"
+    en_linea = getattr(_local, clave, None)
+    if en_linea is None:
+        transformador = ASTBuilder()
+        lexer = LexerTokens if tokens else "contextual"
+        en_linea = (crear_parser_lark(grammar, lexer=lexer, transformer=transformador), transformador)
+        setattr(_local, clave, en_linea)
+    return en_linea
+
+
+def analizar_programa(codigo, siguiente_token=None, optimizar=False, en_linea=False):
+    """Analiza el programa; con en_linea=True el AST se construye durante el parseo.
+
+    siguiente_token reemplaza al lexer de Lark (ver LexerTokens).
+    """
     try:
-        # Parseo inicial
-        arbol = parser.parse(codigo)
+        # Parseo inicial (desde el texto o desde tokens ya generados)
+        if en_linea:
+            parser_hilo, transformador = parser_en_linea(siguiente_token is not None)
+            transformador.reiniciar()
+            ast = parser_hilo.parse(codigo if siguiente_token is None else siguiente_token)
+        else:
+            if siguiente_token is None:
+                arbol = parser.parse(codigo)
+            else:
+                arbol = parser_tokens.parse(siguiente_token)
+            transformador = ASTBuilder()
+            ast = transformador.transform(arbol)
         
-        transformador = ASTBuilder()
-        ast = transformador.transform(arbol)
+        # Plegado de constantes y eliminación de ramas muertas (opcional)
+        reporte_optimizacion = optimizar_programa(ast) if optimizar else None
+        
+        # Resolución de variables a slots de marco por función
+        tabla_slots = {
+            nombre: resolver_variables(funcion)
+            for nombre, funcion in transformador.tabla_funciones.items()
+        }
         
         return {
             "exito": len(transformador.errores_semanticos) == 0,
             "ast": ast,
             "tabla_simbolos": {
                 "global": transformador.tabla_simbolos_global,
-                "local": transformador.tabla_simbolos_local
+                "local": transformador.tabla_simbolos_local,
+                "funciones": transformador.tablas_funciones
             },
             "tabla_funciones": transformador.tabla_funciones,
+            # Símbolos por ámbito con líneas y usos (antes de optimizar, tal como están en el código)
+            "tabla_ambitos": transformador.tabla_ambitos,
+            "tabla_slots": tabla_slots,
+            "optimizacion": reporte_optimizacion,
             "errores": transformador.errores_semanticos
         }
     except UnexpectedToken as e:
@@ -368,7 +568,7 @@ def analizar_programa(codigo):
 
 # Función para imprimir el AST de forma legible
 def imprimir_ast(ast, nivel=0):
-    if isinstance(ast, dict):
+    if isinstance(ast, Nodo):
         indent = "  " * nivel
         print(f"{indent}{ast.get('tipo', 'nodo')}")
         for clave, valor in ast.items():
@@ -383,22 +583,177 @@ def imprimir_ast(ast, nivel=0):
         print(f"{indent}{ast}")
 
 
+def resolver_variables(funcion):
+    """Asigna a cada variable de una función un índice fijo (slot) en su marco.
+    
+    Anota los nodos que leen o escriben variables con la clave "slot" y
+    devuelve el diccionario {nombre: slot} de la función.
+    """
+    indices = {}
+    
+    def slot(nombre):
+        if nombre not in indices:
+            indices[nombre] = len(indices)
+        return indices[nombre]
+    
+    def resolver_expresion(expresion):
+        if not isinstance(expresion, Nodo):
+            return
+        tipo_expr = expresion.tipo
+        if tipo_expr == "variable":
+            expresion.slot = slot(expresion.nombre)
+        elif tipo_expr in ("operacion", "comparacion", "logica"):
+            resolver_expresion(expresion.izquierda)
+            resolver_expresion(expresion.derecha)
+    
+    def resolver_instrucciones(instrucciones):
+        if not isinstance(instrucciones, list):
+            instrucciones = [instrucciones]
+        for nodo in instrucciones:
+            if not isinstance(nodo, Nodo):
+                continue
+            tipo_nodo = nodo.tipo
+            if tipo_nodo in ("declaracion_variable", "asignacion"):
+                resolver_expresion(nodo.valor)
+                nodo.slot = slot(nodo.nombre)
+            elif tipo_nodo in ("if", "while"):
+                resolver_expresion(nodo.condicion)
+                resolver_instrucciones(nodo.cuerpo)
+            elif tipo_nodo == "if_else":
+                resolver_expresion(nodo.condicion)
+                resolver_instrucciones(nodo.cuerpo_if)
+                resolver_instrucciones(nodo.cuerpo_else)
+            elif tipo_nodo == "for":
+                resolver_instrucciones([nodo.inicializacion])
+                resolver_expresion(nodo.condicion)
+                resolver_instrucciones(nodo.cuerpo)
+                nodo.slot = slot(nodo.variable)
+            elif tipo_nodo == "escribir":
+                resolver_expresion(nodo.expresion)
+            elif tipo_nodo == "leer":
+                nodo.slot = slot(nodo.variable)
+    
+    resolver_instrucciones(funcion.instrucciones)
+    return indices
+
+
+class Marco:
+    """Marco de activación de una función: valores de sus variables por slot"""
+    __slots__ = ("funcion", "indices", "valores")
+    
+    def __init__(self, funcion, indices):
+        self.funcion = funcion
+        self.indices = indices
+        # Las variables no asignadas valen 0, igual que una variable no encontrada
+        self.valores = [0] * len(indices)
+
+
+class EjecucionCancelada(Exception):
+    """Se lanza dentro de Interprete cuando otro hilo llama a cancelar()"""
+
+
 class Interprete:
-    def __init__(self, debug=True):
+    def __init__(self, debug=True, compilado=False, optimizar=False, perfil=None):
         self.memoria_global = {}
-        self.memoria_local = {}
         self.entradas = []
         self.salidas = []
         self.debug = debug
         self.tabla_funciones = {}
         self.ambito_actual = None
+        # Slots de variables por función y pila de marcos en ejecución
+        self.tabla_slots = {}
+        self.marcos = []
+        self.marco = None
+        # Modo compilado: cada función se traduce una vez a closures de Python
+        self.compilado = compilado
+        self.funciones_compiladas = {}
+        # Optimiza el AST (constantes y ramas muertas) antes de ejecutarlo
+        self.optimizar = optimizar
+        # Lo activa cancelar() desde otro hilo; se revisa en cada ciclo y llamada
+        self.cancelado = False
+        # PerfilEjecucion opcional (ver perfil_ejecucion); sin él no se instrumenta nada
+        self.perfil = perfil
+        if perfil is not None:
+            self.instrumentar()
+    
+    def instrumentar(self):
+        """Reemplaza en esta instancia los métodos del recorrido por versiones que cuentan en self.perfil.
+        
+        Las llamadas recursivas pasan por self, así que también se cuentan; las
+        demás instancias siguen usando los métodos de la clase sin costo extra.
+        """
+        perfil = self.perfil
+        ejecutar_cuerpo = Interprete.ejecutar_cuerpo.__get__(self)
+        
+        def ejecutar_cuerpo_medido(nombre_funcion, funcion):
+            perfil.entrar(nombre_funcion)
+            try:
+                ejecutar_cuerpo(nombre_funcion, funcion)
+            finally:
+                perfil.salir()
+        self.ejecutar_cuerpo = ejecutar_cuerpo_medido
+        
+        if self.compilado:
+            compilar_nodo = Interprete.compilar_nodo.__get__(self)
+            compilar_expresion = Interprete.compilar_expresion.__get__(self)
+            
+            def compilar_nodo_contado(nodo):
+                paso = compilar_nodo(nodo)
+                if paso is None:
+                    return None
+                
+                def contado(valores):
+                    perfil.nodo(nodo)
+                    paso(valores)
+                return contado
+            
+            def compilar_expresion_contada(expresion):
+                evaluar = compilar_expresion(expresion)
+                if not isinstance(expresion, Nodo):
+                    return evaluar
+                
+                def contada(valores):
+                    perfil.nodo(expresion)
+                    return evaluar(valores)
+                return contada
+            self.compilar_nodo = compilar_nodo_contado
+            self.compilar_expresion = compilar_expresion_contada
+        else:
+            ejecutar_nodo = Interprete.ejecutar_nodo.__get__(self)
+            evaluar_expresion = Interprete.evaluar_expresion.__get__(self)
+            
+            def ejecutar_nodo_contado(nodo):
+                if isinstance(nodo, Nodo):
+                    perfil.nodo(nodo)
+                ejecutar_nodo(nodo)
+            
+            def evaluar_expresion_contada(expresion):
+                if isinstance(expresion, Nodo):
+                    perfil.nodo(expresion)
+                return evaluar_expresion(expresion)
+            self.ejecutar_nodo = ejecutar_nodo_contado
+            self.evaluar_expresion = evaluar_expresion_contada
+    
+    @property
+    def memoria_local(self):
+        """Variables del marco actual como diccionario (vacío fuera de funciones)"""
+        if self.marco is None:
+            return {}
+        valores = self.marco.valores
+        return {nombre: valores[indice] for nombre, indice in self.marco.indices.items()}
     
     def establecer_entradas(self, entradas):
         self.entradas = entradas
     
+    def cancelar(self):
+        """Detiene la ejecución en curso en el próximo ciclo o llamada a función"""
+        self.cancelado = True
+    
     def ejecutar(self, codigo):
-        resultado_analisis = analizar_programa(codigo)
-        
+        return self.ejecutar_analisis(analizar_programa(codigo, optimizar=self.optimizar))
+    
+    def ejecutar_analisis(self, resultado_analisis):
+        """Ejecuta un resultado de analizar_programa sin volver a analizar el código"""
         if not resultado_analisis["exito"]:
             return {
                 "exito": False,
@@ -408,20 +763,22 @@ class Interprete:
         
         try:
             self.memoria_global = {}  
-            self.memoria_local = {}
+            self.marcos = []
+            self.marco = None
             self.salidas = []
             self.tabla_funciones = resultado_analisis["tabla_funciones"]
+            self.tabla_slots = dict(resultado_analisis.get("tabla_slots", {}))
             
             ast = resultado_analisis["ast"]
             print(">>> Iniciando ejecución del programa <<<")
             
             # Primero, registrar todas las funciones en la tabla de funciones
-            if ast["tipo"] == "programa":
-                funciones = ast.get("funciones", [])
+            if ast.tipo == "programa":
+                funciones = ast.funciones
                 
                 # Registramos todas las funciones primero
                 for funcion in funciones:
-                    nombre_func = funcion.get("nombre")
+                    nombre_func = funcion.nombre
                     self.tabla_funciones[nombre_func] = funcion
                     if self.debug:
                         print(f"Registrando función: {nombre_func}")
@@ -440,12 +797,22 @@ class Interprete:
             print(">>> Estado final de la memoria global:", self.memoria_global)
             print(">>> Salidas generadas:", self.salidas)
             
-            return {
+            resultado = {
                 "exito": True,
                 "memoria_global": self.memoria_global,
                 "memoria_local": self.memoria_local,
                 "salidas": self.salidas
             }
+            if self.perfil is not None:
+                resultado["perfil"] = self.perfil
+            return resultado
+        except EjecucionCancelada as e:
+            return {
+                "exito": False,
+                "cancelado": True,
+                "error": str(e),
+                "salidas": self.salidas
+            }
         except Exception as e:
             return {
                 "exito": False,
@@ -453,6 +820,8 @@ class Interprete:
             }
     
     def ejecutar_funcion(self, nombre_funcion):
+        if self.cancelado:
+            raise EjecucionCancelada("Ejecución cancelada")
         if self.debug:
             print(f"EJECUTANDO FUNCIÓN: {nombre_funcion}")
         
@@ -460,28 +829,37 @@ class Interprete:
             print(f"Error: Función '{nombre_funcion}' no encontrada")
             return
         
-        # Guardar el ámbito anterior
-        ambito_anterior = self.ambito_actual
-        memoria_local_anterior = self.memoria_local
+        self.ejecutar_cuerpo(nombre_funcion, self.tabla_funciones[nombre_funcion])
+    
+    def ejecutar_cuerpo(self, nombre_funcion, funcion):
+        """Ejecuta una función en un marco nuevo que se apila y desapila"""
+        indices = self.tabla_slots.get(nombre_funcion)
+        if indices is None:
+            indices = self.tabla_slots[nombre_funcion] = resolver_variables(funcion)
         
-        # Establecer nuevo ámbito
+        # Guardar el ámbito anterior y establecer el nuevo
+        ambito_anterior = self.ambito_actual
         self.ambito_actual = nombre_funcion
-        self.memoria_local = {}
+        marco = Marco(nombre_funcion, indices)
+        self.marcos.append(marco)
+        self.marco = marco
         
-        funcion = self.tabla_funciones[nombre_funcion]
-        instrucciones = funcion.get("instrucciones", [])
-        
-        for instruccion in instrucciones:
-            self.ejecutar_nodo(instruccion)
-        
-        # Restaurar el ámbito anterior
-        self.ambito_actual = ambito_anterior
-        self.memoria_local = memoria_local_anterior
+        try:
+            if self.compilado:
+                self.obtener_funcion_compilada(nombre_funcion, funcion)(marco.valores)
+            else:
+                for instruccion in funcion.instrucciones:
+                    self.ejecutar_nodo(instruccion)
+        finally:
+            # Restaurar el ámbito anterior
+            self.marcos.pop()
+            self.marco = self.marcos[-1] if self.marcos else None
+            self.ambito_actual = ambito_anterior
     
     def obtener_variable(self, nombre):
-        """Busca una variable primero en el ámbito local, luego en el global"""
-        if self.ambito_actual and nombre in self.memoria_local:
-            return self.memoria_local[nombre]
+        """Busca una variable por nombre, primero en el marco actual, luego en el global"""
+        if self.marco is not None and nombre in self.marco.indices:
+            return self.marco.valores[self.marco.indices[nombre]]
         elif nombre in self.memoria_global:
             return self.memoria_global[nombre]
         else:
@@ -490,83 +868,72 @@ class Interprete:
             return 0
     
     def asignar_variable(self, nombre, valor):
-        """Asigna una variable en el ámbito correcto"""
-        if self.ambito_actual:
-            # Si estamos en una función y la variable existe localmente
-            if nombre in self.memoria_local:
-                self.memoria_local[nombre] = valor
-            # Si existe globalmente, la asignamos allí (a menos que sea shadowing)
-            elif nombre in self.memoria_global:
-                self.memoria_global[nombre] = valor
-            else:
-                # Por defecto, creamos la variable en el ámbito local
-                self.memoria_local[nombre] = valor
+        """Asigna una variable por nombre en el ámbito correcto"""
+        if self.marco is not None and nombre in self.marco.indices:
+            self.marco.valores[self.marco.indices[nombre]] = valor
         else:
-            # Ámbito global
             self.memoria_global[nombre] = valor
     
     def ejecutar_nodo(self, nodo):
-        if isinstance(nodo, dict):
-            tipo_nodo = nodo.get("tipo")
+        if isinstance(nodo, Nodo):
+            tipo_nodo = nodo.tipo
             
             if tipo_nodo == "programa":
-                for funcion in nodo.get("funciones", []):
-                    if funcion.get("nombre") == "init":
+                for funcion in nodo.funciones:
+                    if funcion.nombre == "init":
                         self.ejecutar_nodo(funcion)
             
             elif tipo_nodo == "funcion":
-                if nodo.get("nombre") == "init":
-                    for instruccion in nodo.get("instrucciones", []):
-                        self.ejecutar_nodo(instruccion)
+                if nodo.nombre == "init":
+                    self.ejecutar_cuerpo("init", nodo)
             
             elif tipo_nodo == "llamada_funcion":
-                nombre_func = nodo.get("nombre")
+                nombre_func = nodo.nombre
                 self.ejecutar_funcion(nombre_func)
             
             elif tipo_nodo == "declaracion_variable":
-                nombre = nodo.get("nombre")
-                valor = self.evaluar_expresion(nodo.get("valor")) if nodo.get("valor") is not None else 0
-                self.asignar_variable(nombre, valor)
+                nombre = nodo.nombre
+                valor = self.evaluar_expresion(nodo.valor) if nodo.valor is not None else 0
+                self.marco.valores[nodo.slot] = valor
                 if self.debug:
                     print(f"DECLARACIÓN: {nombre} = {valor}")
             
             elif tipo_nodo == "asignacion":
-                nombre = nodo.get("nombre")
-                valor = self.evaluar_expresion(nodo.get("valor"))
-                self.asignar_variable(nombre, valor)
+                nombre = nodo.nombre
+                valor = self.evaluar_expresion(nodo.valor)
+                self.marco.valores[nodo.slot] = valor
                 if self.debug:
                     print(f"ASIGNACIÓN: {nombre} = {valor}")
-            
             elif tipo_nodo == "if":
-                condicion = self.evaluar_expresion(nodo.get("condicion"))
+                condicion = self.evaluar_expresion(nodo.condicion)
                 if self.debug:
                     print(f"EVALUACIÓN IF: condición = {condicion}")
                 if condicion:
                     if self.debug:
                         print("EJECUTANDO BLOQUE IF")
-                    for instruccion in nodo.get("cuerpo", []):
+                    for instruccion in nodo.cuerpo:
                         self.ejecutar_nodo(instruccion)
             
             elif tipo_nodo == "if_else":
-                condicion = self.evaluar_expresion(nodo.get("condicion"))
+                condicion = self.evaluar_expresion(nodo.condicion)
                 if self.debug:
                     print(f"EVALUACIÓN IF-ELSE: condición = {condicion}")
                 if condicion:
                     if self.debug:
                         print("EJECUTANDO BLOQUE IF")
-                    for instruccion in nodo.get("cuerpo_if", []):
+                    for instruccion in nodo.cuerpo_if:
                         self.ejecutar_nodo(instruccion)
                 else:
                     if self.debug:
                         print("EJECUTANDO BLOQUE ELSE")
-                    for instruccion in nodo.get("cuerpo_else", []):
+                    for instruccion in nodo.cuerpo_else:
                         self.ejecutar_nodo(instruccion)
             
             elif tipo_nodo == "while":
                 # Modificado para manejar correctamente el cuerpo del while
                 iteracion = 0
                 while True:
-                    condicion = self.evaluar_expresion(nodo.get("condicion"))
+                    condicion = self.evaluar_expresion(nodo.condicion)
                     if self.debug:
                         print(f"EVALUACIÓN WHILE (iteración {iteracion}): condición = {condicion}")
                     if not condicion:
@@ -576,20 +943,24 @@ class Interprete:
                         print(f"EJECUTANDO CUERPO WHILE (iteración {iteracion})")
                     
                     # Ejecutar cada instrucción en el cuerpo del while
-                    cuerpo = nodo.get("cuerpo", [])
+                    cuerpo = nodo.cuerpo
                     for instruccion in cuerpo:
                         self.ejecutar_nodo(instruccion)
                     
                     iteracion += 1
+                    if self.cancelado:
+                        raise EjecucionCancelada("Ejecución cancelada")
+                if self.perfil is not None:
+                    self.perfil.ciclo(nodo, iteracion)
             
             elif tipo_nodo == "for":
                 if self.debug:
                     print("INICIALIZACIÓN FOR")
-                self.ejecutar_nodo(nodo.get("inicializacion"))
+                self.ejecutar_nodo(nodo.inicializacion)
                 
                 iteracion = 0
                 while True:
-                    condicion = self.evaluar_expresion(nodo.get("condicion"))
+                    condicion = self.evaluar_expresion(nodo.condicion)
                     if self.debug:
                         print(f"EVALUACIÓN FOR (iteración {iteracion}): condición = {condicion}")
                     if not condicion:
@@ -599,29 +970,35 @@ class Interprete:
                         print(f"EJECUTANDO CUERPO FOR (iteración {iteracion})")
                     
                     # Ejecutar cada instrucción en el cuerpo del for
-                    cuerpo = nodo.get("cuerpo", [])
+                    cuerpo = nodo.cuerpo
                     for instruccion in cuerpo:
                         self.ejecutar_nodo(instruccion)
                     
-                    variable = nodo.get("variable")
-                    operador = nodo.get("operador")
-                    valor_anterior = self.obtener_variable(variable)
+                    variable = nodo.variable
+                    operador = nodo.operador
+                    valores = self.marco.valores
+                    slot = nodo.slot
+                    valor_anterior = valores[slot]
                     
                     if operador == "++":
                         nuevo_valor = valor_anterior + 1
-                        self.asignar_variable(variable, nuevo_valor)
+                        valores[slot] = nuevo_valor
                         if self.debug:
                             print(f"INCREMENTO: {variable} = {valor_anterior} + 1 = {nuevo_valor}")
                     elif operador == "--":
                         nuevo_valor = valor_anterior - 1
-                        self.asignar_variable(variable, nuevo_valor)
+                        valores[slot] = nuevo_valor
                         if self.debug:
                             print(f"DECREMENTO: {variable} = {valor_anterior} - 1 = {nuevo_valor}")
                     
                     iteracion += 1
+                    if self.cancelado:
+                        raise EjecucionCancelada("Ejecución cancelada")
+                if self.perfil is not None:
+                    self.perfil.ciclo(nodo, iteracion)
             
             elif tipo_nodo == "escribir":
-                valor = self.evaluar_expresion(nodo.get("expresion"))
+                valor = self.evaluar_expresion(nodo.expresion)
                 self.salidas.append(str(valor))
                 if self.debug:
                     print(f"ESCRIBIR: {valor}")
@@ -629,14 +1006,14 @@ class Interprete:
                     print(f">>> {valor}")
             
             elif tipo_nodo == "leer":
-                variable = nodo.get("variable")
+                variable = nodo.variable
                 if self.entradas:
                     valor = self.entradas.pop(0)
-                    self.asignar_variable(variable, valor)
+                    self.marco.valores[nodo.slot] = valor
                     if self.debug:
                         print(f"LEER: {variable} = {valor}")
                 else:
-                    self.asignar_variable(variable, 0)
+                    self.marco.valores[nodo.slot] = 0
                     if self.debug:
                         print(f"LEER (sin entrada disponible): {variable} = 0")
         
@@ -647,26 +1024,25 @@ class Interprete:
     
     def evaluar_expresion(self, expresion):
         """Evalúa una expresión y devuelve su valor"""
-        if not isinstance(expresion, dict):
+        if not isinstance(expresion, Nodo):
             return expresion
         
-        tipo_expr = expresion.get("tipo")
+        tipo_expr = expresion.tipo
         
         if tipo_expr == "entero":
-            return int(expresion.get("valor"))
+            return int(expresion.valor)
         elif tipo_expr == "flotante":
-            return float(expresion.get("valor"))
+            return float(expresion.valor)
         elif tipo_expr == "cadena":
-            return str(expresion.get("valor"))
+            return str(expresion.valor)
         elif tipo_expr == "booleano":
-            return bool(expresion.get("valor"))
+            return bool(expresion.valor)
         elif tipo_expr == "variable":
-            nombre = expresion.get("nombre")
-            return self.obtener_variable(nombre)
+            return self.marco.valores[expresion.slot]
         elif tipo_expr == "operacion":
-            izq = self.evaluar_expresion(expresion.get("izquierda"))
-            der = self.evaluar_expresion(expresion.get("derecha"))
-            operador = expresion.get("operador")
+            izq = self.evaluar_expresion(expresion.izquierda)
+            der = self.evaluar_expresion(expresion.derecha)
+            operador = expresion.operador
             
             if operador == "+":
                 return izq + der
@@ -677,9 +1053,9 @@ class Interprete:
             elif operador == "/":
                 return izq / der if der != 0 else 0
         elif tipo_expr == "comparacion":
-            izq = self.evaluar_expresion(expresion.get("izquierda"))
-            der = self.evaluar_expresion(expresion.get("derecha"))
-            operador = expresion.get("operador")
+            izq = self.evaluar_expresion(expresion.izquierda)
+            der = self.evaluar_expresion(expresion.derecha)
+            operador = expresion.operador
             
             if operador == "==":
                 return izq == der
@@ -693,5 +1069,193 @@ class Interprete:
                 return izq <= der
             elif operador == ">=":
                 return izq >= der
+        elif tipo_expr == "logica":
+            # Cortocircuito: el operando derecho solo se evalúa si decide el resultado
+            izq = self.evaluar_expresion(expresion.izquierda)
+            if expresion.operador == "&&":
+                return bool(izq) and bool(self.evaluar_expresion(expresion.derecha))
+            return bool(izq) or bool(self.evaluar_expresion(expresion.derecha))
+        
+        return 0
+
+    def obtener_funcion_compilada(self, nombre_funcion, funcion):
+        """Devuelve el cuerpo compilado de una función, compilándolo solo la primera vez"""
+        en_cache = self.funciones_compiladas.get(nombre_funcion)
+        if en_cache is not None and en_cache[0] is funcion:
+            return en_cache[1]
+        cuerpo = self.compilar_bloque(funcion.instrucciones)
+        self.funciones_compiladas[nombre_funcion] = (funcion, cuerpo)
+        return cuerpo
+    
+    def compilar_bloque(self, instrucciones):
+        """Compila una lista de instrucciones a un único callable"""
+        if not isinstance(instrucciones, list):
+            instrucciones = [instrucciones]
+        pasos = tuple(paso for paso in map(self.compilar_nodo, instrucciones) if paso is not None)
+        
+        if len(pasos) == 1:
+            return pasos[0]
+        
+        def bloque(valores):
+            for paso in pasos:
+                paso(valores)
+        return bloque
+    
+    def compilar_nodo(self, nodo):
+        """Compila una instrucción a un callable que recibe los valores del marco.
+        
+        Devuelve None si la instrucción no tiene efecto. En modo compilado solo
+        se conserva la salida de escribir, no las trazas de debug.
+        """
+        if not isinstance(nodo, Nodo):
+            return None
+        
+        tipo_nodo = nodo.tipo
+        
+        if tipo_nodo == "llamada_funcion":
+            nombre_func = nodo.nombre
+            ejecutar_funcion = self.ejecutar_funcion
+            return lambda valores: ejecutar_funcion(nombre_func)
+        
+        elif tipo_nodo in ("declaracion_variable", "asignacion"):
+            slot = nodo.slot
+            if nodo.valor is None:
+                def declaracion(valores):
+                    valores[slot] = 0
+                return declaracion
+            valor = self.compilar_expresion(nodo.valor)
+            
+            def asignacion(valores):
+                valores[slot] = valor(valores)
+            return asignacion
+        
+        elif tipo_nodo == "if":
+            condicion = self.compilar_expresion(nodo.condicion)
+            cuerpo = self.compilar_bloque(nodo.cuerpo)
+            
+            def si(valores):
+                if condicion(valores):
+                    cuerpo(valores)
+            return si
+        
+        elif tipo_nodo == "if_else":
+            condicion = self.compilar_expresion(nodo.condicion)
+            cuerpo_if = self.compilar_bloque(nodo.cuerpo_if)
+            cuerpo_else = self.compilar_bloque(nodo.cuerpo_else)
+            
+            def si_no(valores):
+                if condicion(valores):
+                    cuerpo_if(valores)
+                else:
+                    cuerpo_else(valores)
+            return si_no
+        
+        elif tipo_nodo == "while":
+            condicion = self.compilar_expresion(nodo.condicion)
+            cuerpo = self.compilar_bloque(nodo.cuerpo)
+            
+            interprete = self
+            perfil = self.perfil
+            
+            def mientras(valores):
+                while condicion(valores):
+                    cuerpo(valores)
+                    if interprete.cancelado:
+                        raise EjecucionCancelada("Ejecución cancelada")
+            
+            # Con perfil, las iteraciones se cuentan en una versión aparte del ciclo
+            def mientras_contado(valores):
+                iteraciones = 0
+                while condicion(valores):
+                    cuerpo(valores)
+                    iteraciones += 1
+                    if interprete.cancelado:
+                        raise EjecucionCancelada("Ejecución cancelada")
+                perfil.ciclo(nodo, iteraciones)
+            return mientras if perfil is None else mientras_contado
+        
+        elif tipo_nodo == "for":
+            inicializacion = self.compilar_nodo(nodo.inicializacion) or (lambda valores: None)
+            condicion = self.compilar_expresion(nodo.condicion)
+            cuerpo = self.compilar_bloque(nodo.cuerpo)
+            slot = nodo.slot
+            paso = {"++": 1, "--": -1}.get(nodo.operador, 0)
+            
+            interprete = self
+            perfil = self.perfil
+            
+            def para(valores):
+                inicializacion(valores)
+                while condicion(valores):
+                    cuerpo(valores)
+                    if paso:
+                        valores[slot] = valores[slot] + paso
+                    if interprete.cancelado:
+                        raise EjecucionCancelada("Ejecución cancelada")
+            
+            def para_contado(valores):
+                inicializacion(valores)
+                iteraciones = 0
+                while condicion(valores):
+                    cuerpo(valores)
+                    if paso:
+                        valores[slot] = valores[slot] + paso
+                    iteraciones += 1
+                    if interprete.cancelado:
+                        raise EjecucionCancelada("Ejecución cancelada")
+                perfil.ciclo(nodo, iteraciones)
+            return para if perfil is None else para_contado
+        
+        elif tipo_nodo == "escribir":
+            expresion = self.compilar_expresion(nodo.expresion)
+            debug = self.debug
+            
+            def escribir(valores):
+                valor = expresion(valores)
+                self.salidas.append(str(valor))
+                if debug:
+                    print(f"ESCRIBIR: {valor}")
+                else:
+                    print(f">>> {valor}")
+            return escribir
+        
+        elif tipo_nodo == "leer":
+            slot = nodo.slot
+            
+            def leer(valores):
+                valores[slot] = self.entradas.pop(0) if self.entradas else 0
+            return leer
+        
+        return None
+    
+    def compilar_expresion(self, expresion):
+        """Compila una expresión a un callable que recibe los valores del marco"""
+        if not isinstance(expresion, Nodo):
+            return lambda valores: expresion
+        
+        tipo_expr = expresion.tipo
+        
+        if tipo_expr in ("entero", "flotante", "cadena", "booleano"):
+            constante = self.evaluar_expresion(expresion)
+            return lambda valores: constante
+        
+        elif tipo_expr == "variable":
+            slot = expresion.slot
+            return lambda valores: valores[slot]
+        
+        elif tipo_expr in ("operacion", "comparacion"):
+            funcion = OPERADORES.get(expresion.operador)
+            if funcion is None:
+                return lambda valores: None
+            izquierda = self.compilar_expresion(expresion.izquierda)
+            derecha = self.compilar_expresion(expresion.derecha)
+            return lambda valores: funcion(izquierda(valores), derecha(valores))
+        
+        elif tipo_expr == "logica":
+            izquierda = self.compilar_expresion(expresion.izquierda)
+            derecha = self.compilar_expresion(expresion.derecha)
+            if expresion.operador == "&&":
+                return lambda valores: bool(izquierda(valores)) and bool(derecha(valores))
+            return lambda valores: bool(izquierda(valores)) or bool(derecha(valores))
         
-        return 0
\ No newline at end of file
+        return lambda valores: 0
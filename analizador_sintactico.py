@@ -1,5 +1,9 @@
-import ply.yacc as yacc
-from lexico import tokens
+import copy
+import sys
+import threading
+
+from lexico import tokens, nuevo_lexer
+from tablas_parser import crear_parser_ply
 
 
 precedence = (
@@ -112,19 +116,31 @@ def p_termino(p):
     else:
         p[0] = ('parentesis', p[2])
 
-errores_sintacticos = []
+# Lista de errores del análisis en curso en cada hilo (p_error no recibe el parser)
+_estado = threading.local()
+
 def p_error(p):
-    global errores_sintacticos
     if p:
         mensaje = f"Error de sintaxis en '{p.value}' (token {p.type}), línea {p.lineno}"
     else:
         mensaje = "Error de sintaxis en el final de la entrada"
-    errores_sintacticos.append(mensaje)
-
-parser = yacc.yacc(debug=True)
-
-def analizar_sintaxis(codigo):
-    global errores_sintacticos
-    errores_sintacticos = []
-    resultado = parser.parse(codigo)
-    return resultado, errores_sintacticos
\ No newline at end of file
+    _estado.errores.append(mensaje)
+
+# Tablas LR cargadas desde el directorio de caché (se generan la primera vez)
+parser = crear_parser_ply(sys.modules[__name__])
+
+def nuevo_parser():
+    """Copia del parser con su propio estado de análisis (las tablas LR se comparten)"""
+    return copy.copy(parser)
+
+def analizar_sintaxis(codigo, lexer=None, parser_propio=None):
+    """(resultado, errores) del análisis; sin lexer ni parser_propio se usan copias nuevas"""
+    errores = []
+    anteriores = getattr(_estado, "errores", None)
+    _estado.errores = errores
+    try:
+        resultado = (parser_propio or nuevo_parser()).parse(
+            codigo, lexer=lexer if lexer is not None else nuevo_lexer())
+    finally:
+        _estado.errores = anteriores
+    return resultado, errores
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""Mide el tiempo de importación de cada módulo en un proceso nuevo, sin
+tablas de parser en caché (primera ejecución) y con las tablas ya guardadas.
+
+Uso: python benchmarks/benchmark_arranque.py [modulo ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULOS = ["lexico", "analizador_sintactico", "analizador_semantico", "compilacion"]
+
+MEDICION = "import time; inicio = time.perf_counter(); import {modulo}; print(time.perf_counter() - inicio)"
+
+
+def importar(modulo, directorio_cache, repeticiones=3):
+    """Mejor tiempo de importación de modulo en procesos nuevos"""
+    entorno = dict(os.environ, ANALIZADOR_CACHE=directorio_cache)
+    mejor = None
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", MEDICION.format(modulo=modulo)], cwd=RAIZ, env=entorno,
+                                capture_output=True, text=True, check=True).stdout
+        duracion = float(salida.split()[-1])
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+def main(modulos):
+    print(f"{'módulo':>22} {'sin tablas (s)':>15} {'con tablas (s)':>15}")
+    for modulo in modulos:
+        with tempfile.TemporaryDirectory() as directorio:
+            # Con una sola repetición el directorio vacío mide la construcción de las tablas
+            t_sin_tablas = importar(modulo, directorio, repeticiones=1)
+            t_con_tablas = importar(modulo, directorio)
+        print(f"{modulo:>22} {t_sin_tablas:>15.3f} {t_con_tablas:>15.3f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or MODULOS)
@@ -0,0 +1,39 @@
+"""Compara el análisis sin caché, con la caché vacía y con la caché llena.
+
+Uso: python benchmarks/benchmark_cache.py [funciones ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analizador_semantico import analizar_programa
+from cache_analisis import CacheAnalisis
+from generador_programas import generar_programa
+
+
+def medir(analizar):
+    inicio = time.perf_counter()
+    resultado = analizar()
+    return time.perf_counter() - inicio, resultado
+
+
+def main(tamanos):
+    print(f"{'funciones':>10} {'sin caché (s)':>14} {'fallo (s)':>10} {'acierto (s)':>12} {'entrada (KB)':>13}")
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CacheAnalisis(directorio)
+        for funciones in tamanos:
+            codigo = generar_programa(funciones)
+            t_directo, _ = medir(lambda: analizar_programa(codigo))
+            t_fallo, _ = medir(lambda: cache.analizar(codigo))
+            t_acierto, resultado = medir(lambda: cache.analizar(codigo))
+            assert resultado["exito"]
+            tamano = os.path.getsize(cache.ruta(cache.clave(codigo))) / 1024
+            print(f"{funciones:>10} {t_directo:>14.3f} {t_fallo:>10.3f} {t_acierto:>12.3f} {tamano:>13.1f}")
+        print(cache.estadisticas())
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [50, 200, 800])
@@ -0,0 +1,39 @@
+"""Compara el tamaño del código de tres direcciones de GeneradorCodigoIntermedio
+con y sin optimizador_intermedio, y el tiempo que toma optimizarlo.
+
+Uso: python benchmarks/benchmark_codigo_intermedio.py [bloques ...]
+"""
+import importlib.util
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from analizador_semantico import analizar_programa
+from generador_programas import generar_programa
+
+# El módulo del generador tiene un punto en el nombre y no se puede importar directamente
+_especificacion = importlib.util.spec_from_file_location(
+    "codigo_intermedio", os.path.join(RAIZ, "codido.intermedio.py"))
+codigo_intermedio = importlib.util.module_from_spec(_especificacion)
+_especificacion.loader.exec_module(codigo_intermedio)
+
+
+def main(tamanos):
+    print(f"{'bloques':>8} {'instrucciones':>14} {'optimizadas':>12} {'reducción':>10} {'tiempo (s)':>11}")
+    for bloques in tamanos:
+        ast = analizar_programa(generar_programa(bloques))["ast"]
+        generador = codigo_intermedio.GeneradorCodigoIntermedio()
+        inicio = time.perf_counter()
+        generador.generar_codigo(ast, optimizar=True)
+        duracion = time.perf_counter() - inicio
+        reporte = generador.reporte_optimizacion
+        antes = reporte["instrucciones_antes"]
+        despues = reporte["instrucciones_despues"]
+        print(f"{bloques:>8} {antes:>14} {despues:>12} {1 - despues / antes:>10.0%} {duracion:>11.3f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [100, 1000, 5000])
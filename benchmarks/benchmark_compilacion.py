@@ -0,0 +1,88 @@
+"""Compara el análisis en tres pasadas (léxico, PLY y Lark por separado)
+con la compilación de una sola pasada léxica de compilacion.Compilacion.
+
+Uso: python benchmarks/benchmark_compilacion.py [bloques ...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexico import analisis
+from analizador_sintactico import analizar_sintaxis
+from analizador_semantico import analizar_programa
+from compilacion import Compilacion
+from generador_programas import generar_programa
+
+
+def tres_pasadas(codigo):
+    analisis(codigo)
+    analizar_sintaxis(codigo)
+    return analizar_programa(codigo)
+
+
+def una_pasada(codigo):
+    compilacion = Compilacion(codigo)
+    compilacion.vista_tokens()
+    compilacion.vista_sintactica()
+    return compilacion.vista_semantica()
+
+
+# Programas donde los lexers de PLY y de Lark no coinciden o el parser elige el terminal por contexto
+CASOS_BORDE = [
+    'func init() {\n /* x */ val a = 1;\n}',
+    'func init() {\n val a = "a\nb";\n}',
+    'func init() {\n val true = 1;\n}',
+    'func init() {\n val a = 1;\n a == 3;\n}',
+    'func init ( ) {\n val a = 1;\n}',
+    'func init() {\n otra();\n}\nfunc otra() { escribir(1); }',
+    'func init() {\n for (val i = 0; i < 3; i++) { escribir(i); }\n}',
+    'func init() {\n for (val i = 0; i < 3; i + +) { escribir(i); }\n}',
+    'func init() {\n val a = 1 ++ 2;\n}',
+    'func init() {\r\n val a = 1; // c\r\n val b = !a;\n}',
+    'func init() {\n val ñ = 1.;\n}',
+    'func init() {\n val b = 1;\n if (!b) { escribir(b); }\n}',
+    'func init() {\n escribir("/*"); // */\n}',
+    'func init() {\n val a = 1;\n',
+    '',
+]
+
+
+def comparable(resultado):
+    """Texto del resultado para compararlo (TablaSimbolos no define __repr__ con su contenido)"""
+    resultado = dict(resultado)
+    tabla = resultado.pop("tabla_ambitos", None)
+    simbolos = None if tabla is None else [
+        (simbolo, simbolo.valor, simbolo.ambito.nombre, simbolo.usos) for simbolo in tabla.simbolos]
+    return repr(resultado) + repr(simbolos)
+
+
+def verificar(codigo):
+    assert comparable(analizar_programa(codigo)) == comparable(Compilacion(codigo).vista_semantica()), codigo
+
+
+def medir(funcion, codigo, repeticiones=3):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(codigo)
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+def main(tamanos):
+    for codigo in CASOS_BORDE:
+        verificar(codigo)
+    print(f"{'bloques':>8} {'bytes':>10} {'3 pasadas (s)':>14} {'1 pasada (s)':>13} {'aceleración':>12}")
+    for bloques in tamanos:
+        codigo = generar_programa(bloques)
+        assert comparable(tres_pasadas(codigo)) == comparable(una_pasada(codigo))
+        t_tres = medir(tres_pasadas, codigo)
+        t_una = medir(una_pasada, codigo)
+        print(f"{bloques:>8} {len(codigo):>10} {t_tres:>14.3f} {t_una:>13.3f} {t_tres / t_una:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [200, 1000, 3000])
@@ -0,0 +1,90 @@
+"""Prueba de carga del análisis en paralelo: los mismos programas analizados en
+serie, en un grupo de hilos y desde asyncio deben dar resultados idénticos.
+
+Incluye programas con errores léxicos y sintácticos (las listas de errores y
+los números de línea son los que dependían del estado global) y repite cada
+programa varias veces para que los hilos se crucen. Sale con código 1 si
+algún resultado difiere del análisis en serie.
+
+Uso: python benchmarks/benchmark_concurrencia.py [repeticiones] [hilos]
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from sesion_analisis import SesionAnalisis, analizar_async, analizar_en_paralelo
+from generador_programas import generar_programa, generar_programa_ciclos, generar_programa_funciones
+
+
+def programas():
+    codigos = []
+    for nombre in ("prueba.txt", "prueba2.txt", "prueba3.txt", "prueba4.txt"):
+        with open(os.path.join(RAIZ, nombre), encoding="utf-8") as archivo:
+            codigos.append(archivo.read())
+    codigos += [generar_programa(40), generar_programa_ciclos(50, 5), generar_programa_funciones(20, 4)]
+    # Errores en distintas líneas: un caracter ilegal y un token inesperado
+    codigos.append(generar_programa(20).replace("val", "val @", 3))
+    codigos.append(generar_programa_funciones(10, 3).replace(";", "", 7))
+    return codigos
+
+
+def forma(resultado):
+    """Resultado comparable entre análisis (los nodos y árboles de Lark se comparan por texto)"""
+    semantico = resultado["semantico"]
+    tabla = semantico.get("tabla_ambitos")
+    return (
+        resultado["tokens"], resultado["palabras_reservadas"], resultado["errores_lexicos"],
+        repr(resultado["sintactico"]), resultado["errores_sintacticos"],
+        semantico["exito"], semantico.get("mensaje"), semantico.get("errores"),
+        repr(semantico["ast"].a_diccionario()) if "ast" in semantico else None,
+        semantico.get("tabla_simbolos"),
+        [(simbolo.nombre, simbolo.linea, simbolo.usos) for simbolo in tabla.simbolos] if tabla else None,
+    )
+
+
+async def analizar_todos_async(codigos, hilos):
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        return await asyncio.gather(*(analizar_async(codigo, ejecutor) for codigo in codigos))
+
+
+def main(repeticiones=20, hilos=8):
+    codigos = programas()
+    lote = codigos * repeticiones
+    # Cambios de hilo mucho más frecuentes para que los análisis se intercalen
+    sys.setswitchinterval(1e-5)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        sesion = SesionAnalisis()
+        esperados = [forma(sesion.analizar(codigo)) for codigo in lote]
+        t_serie = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        en_hilos = [forma(resultado) for resultado in analizar_en_paralelo(lote, hilos)]
+        t_hilos = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        en_async = [forma(resultado) for resultado in asyncio.run(analizar_todos_async(lote, hilos))]
+        t_async = time.perf_counter() - inicio
+
+    diferentes = sum(1 for esperado, obtenido in zip(esperados, en_hilos) if esperado != obtenido)
+    diferentes += sum(1 for esperado, obtenido in zip(esperados, en_async) if esperado != obtenido)
+    print(f"{len(lote)} análisis ({len(codigos)} programas x {repeticiones}), {hilos} hilos")
+    print(f"{'modo':<8} {'tiempo (s)':>11}")
+    print(f"{'serie':<8} {t_serie:>11.3f}")
+    print(f"{'hilos':<8} {t_hilos:>11.3f}")
+    print(f"{'asyncio':<8} {t_async:>11.3f}")
+    print("resultados idénticos" if not diferentes else f"{diferentes} resultados distintos al análisis en serie")
+    return 1 if diferentes else 0
+
+
+if __name__ == "__main__":
+    argumentos = [int(n) for n in sys.argv[1:]]
+    sys.exit(main(*argumentos))
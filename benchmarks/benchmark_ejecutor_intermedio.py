@@ -0,0 +1,64 @@
+"""Compara Interprete (recorrido del AST) con EjecutorIntermedio sobre el
+código intermedio, sin optimizar y optimizado, en ciclos anidados profundos.
+
+Uso: python benchmarks/benchmark_ejecutor_intermedio.py [iteraciones ...]
+"""
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from analizador_semantico import Interprete, analizar_programa
+from ejecutor_intermedio import EjecutorIntermedio
+from generador_programas import generar_programa_ciclos
+
+# El módulo del generador tiene un punto en el nombre y no se puede importar directamente
+_especificacion = importlib.util.spec_from_file_location(
+    "codigo_intermedio", os.path.join(RAIZ, "codido.intermedio.py"))
+codigo_intermedio = importlib.util.module_from_spec(_especificacion)
+_especificacion.loader.exec_module(codigo_intermedio)
+
+
+def medir(ejecutar, repeticiones=3):
+    mejor = None
+    resultado = None
+    for _ in range(repeticiones):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            resultado = ejecutar()
+            duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor, resultado
+
+
+def main(tamanos):
+    print(f"{'iteraciones':>11} {'Interprete (s)':>15} {'Intermedio (s)':>15} {'Optimizado (s)':>15}")
+    for iteraciones in tamanos:
+        analisis = analizar_programa(generar_programa_ciclos(iteraciones))
+        codigo = codigo_intermedio.GeneradorCodigoIntermedio().generar_codigo(analisis["ast"])
+        optimizado = codigo_intermedio.GeneradorCodigoIntermedio().generar_codigo(analisis["ast"], optimizar=True)
+
+        def con_interprete():
+            interprete = Interprete(debug=False)
+            interprete.tabla_funciones = analisis["tabla_funciones"]
+            interprete.salidas = []
+            interprete.ejecutar_funcion("init")
+            return interprete.salidas
+
+        def con_ejecutor(programa):
+            return EjecutorIntermedio(mostrar_salidas=False).ejecutar(programa)["salidas"]
+
+        t_interprete, salidas_interprete = medir(con_interprete)
+        t_intermedio, salidas_intermedio = medir(lambda: con_ejecutor(codigo))
+        t_optimizado, salidas_optimizado = medir(lambda: con_ejecutor(optimizado))
+        assert salidas_interprete == salidas_intermedio == salidas_optimizado
+        print(f"{iteraciones:>11} {t_interprete:>15.3f} {t_intermedio:>15.3f} {t_optimizado:>15.3f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [500, 2000, 5000])
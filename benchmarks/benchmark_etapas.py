@@ -0,0 +1,199 @@
+"""Mide cada etapa del compilador sobre programas generados con una semilla y
+guarda los resultados en un JSON para comparar con ejecuciones anteriores.
+
+Etapas y unidad de su rendimiento:
+
+    lexico          lexico.analisis                              tokens/s
+    sintactico      analizar_sintaxis (programa en dialecto PLY)  tokens/s
+    semantico       analizar_programa                            nodos/s
+    intermedio      GeneradorCodigoIntermedio.generar_codigo     nodos/s
+    ejecucion       Interprete.ejecutar_analisis                 sentencias/s
+    compilado       Interprete.ejecutar_analisis (compilado)     sentencias/s
+
+La ejecución se mide sobre el resultado de analizar_programa para no contar
+el análisis dos veces (Interprete.ejecutar es semantico + ejecucion). Las
+sentencias ejecutadas se cuentan una vez con PerfilEjecucion y el tiempo
+se toma sin perfil. El tiempo es el mejor de las repeticiones; la memoria
+pico se mide aparte con tracemalloc porque lo hace más lento.
+
+Uso: python benchmarks/benchmark_etapas.py [--semilla N] [--funciones N] [--profundidad N]
+         [--sentencias N] [--iteraciones N] [--expresion N] [--repeticiones N]
+         [--etapas lexico ...] [--guardar base.json] [--comparar base.json]
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import lexico
+from analizador_semantico import Interprete, analizar_programa
+from analizador_sintactico import analizar_sintaxis
+from optimizador import contar_nodos
+from perfil_ejecucion import PerfilEjecucion
+from generador_programas import generar_programa_aleatorio
+
+# El módulo del generador tiene un punto en el nombre y no se puede importar directamente
+_especificacion = importlib.util.spec_from_file_location(
+    "codigo_intermedio", os.path.join(RAIZ, "codido.intermedio.py"))
+codigo_intermedio = importlib.util.module_from_spec(_especificacion)
+_especificacion.loader.exec_module(codigo_intermedio)
+
+VERSION_BASE = 1
+ETAPAS = ["lexico", "sintactico", "semantico", "intermedio", "ejecucion", "compilado"]
+SENTENCIAS = {"declaracion_variable", "asignacion", "if", "if_else", "while", "for", "escribir", "leer",
+              "llamada_funcion"}
+
+
+def contar_tokens(codigo):
+    tokens, reservadas, _ = lexico.analisis(codigo)
+    return len(tokens) + len(reservadas)
+
+
+def contar_sentencias(resultado, compilado):
+    perfil = PerfilEjecucion()
+    Interprete(debug=False, compilado=compilado, perfil=perfil).ejecutar_analisis(resultado)
+    return sum(cantidad for tipo, cantidad in perfil.nodos.items() if tipo in SENTENCIAS)
+
+
+def preparar(parametros):
+    """Por etapa: (función sin argumentos que la ejecuta, unidad, función que cuenta las unidades)"""
+    codigo = generar_programa_aleatorio(**parametros)
+    codigo_ply = generar_programa_aleatorio(**parametros, dialecto="ply")
+    resultado = analizar_programa(codigo)
+    if not resultado["exito"]:
+        raise RuntimeError(f"El programa generado no es válido: {resultado.get('mensaje')}")
+    _, errores = analizar_sintaxis(codigo_ply)
+    if errores:
+        raise RuntimeError(f"El programa PLY generado no es válido: {errores[0]}")
+    nodos = contar_nodos(resultado["ast"])
+    tokens = contar_tokens(codigo)
+
+    def intermedio():
+        codigo_intermedio.GeneradorCodigoIntermedio().generar_codigo(resultado["ast"])
+
+    def ejecutar(compilado):
+        return lambda: Interprete(debug=False, compilado=compilado).ejecutar_analisis(resultado)
+
+    return {
+        "lexico": (lambda: lexico.analisis(codigo), "tokens", lambda: tokens),
+        "sintactico": (lambda: analizar_sintaxis(codigo_ply), "tokens", lambda: contar_tokens(codigo_ply)),
+        "semantico": (lambda: analizar_programa(codigo), "nodos", lambda: nodos),
+        "intermedio": (intermedio, "nodos", lambda: nodos),
+        "ejecucion": (ejecutar(False), "sentencias", lambda: contar_sentencias(resultado, False)),
+        "compilado": (ejecutar(True), "sentencias", lambda: contar_sentencias(resultado, True)),
+    }
+
+
+def mejor_tiempo(funcion, repeticiones):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+def memoria_pico(funcion):
+    """Bytes máximos reservados por funcion por encima de lo que ya estaba reservado"""
+    tracemalloc.start()
+    try:
+        inicial = tracemalloc.get_traced_memory()[0]
+        funcion()
+        return tracemalloc.get_traced_memory()[1] - inicial
+    finally:
+        tracemalloc.stop()
+
+
+def medir(parametros, etapas, repeticiones):
+    resultados = {}
+    # El intérprete imprime el progreso y las salidas del programa
+    with contextlib.redirect_stdout(io.StringIO()):
+        preparadas = preparar(parametros)
+        for etapa in etapas:
+            funcion, unidad, contar = preparadas[etapa]
+            cantidad = contar()
+            funcion()  # calentamiento: cachés de Lark, tablas y funciones compiladas
+            segundos = mejor_tiempo(funcion, repeticiones)
+            resultados[etapa] = {
+                "unidad": unidad,
+                "cantidad": cantidad,
+                "segundos": segundos,
+                "por_segundo": cantidad / segundos,
+                "memoria_pico": memoria_pico(funcion),
+            }
+    return resultados
+
+
+def cargar_base(ruta):
+    with open(ruta, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+    if base.get("version") != VERSION_BASE:
+        raise ValueError(f"{ruta}: versión de formato {base.get('version')}, se esperaba {VERSION_BASE}")
+    return base
+
+
+def main(argumentos=None):
+    lector = argparse.ArgumentParser(description="Rendimiento y memoria de cada etapa del compilador")
+    lector.add_argument("--semilla", type=int, default=0)
+    lector.add_argument("--funciones", type=int, default=8)
+    lector.add_argument("--profundidad", type=int, default=3)
+    lector.add_argument("--sentencias", type=int, default=40)
+    lector.add_argument("--iteraciones", type=int, default=40)
+    lector.add_argument("--expresion", type=int, default=5, help="términos máximos por expresión")
+    lector.add_argument("--repeticiones", type=int, default=5)
+    lector.add_argument("--etapas", nargs="+", choices=ETAPAS, default=ETAPAS)
+    lector.add_argument("--guardar", help="escribe los resultados como JSON en esta ruta")
+    lector.add_argument("--comparar", help="JSON de una ejecución anterior para comparar")
+    opciones = lector.parse_args(argumentos)
+
+    parametros = {
+        "semilla": opciones.semilla,
+        "funciones": opciones.funciones,
+        "profundidad": opciones.profundidad,
+        "sentencias": opciones.sentencias,
+        "iteraciones": opciones.iteraciones,
+        "tamano_expresion": opciones.expresion,
+    }
+    base = cargar_base(opciones.comparar) if opciones.comparar else None
+    if base is not None and base["parametros"] != parametros:
+        print(f"Aviso: {opciones.comparar} se midió con otros parámetros: {base['parametros']}", file=sys.stderr)
+
+    resultados = medir(parametros, opciones.etapas, opciones.repeticiones)
+
+    encabezado = f"{'etapa':<11} {'unidades':>10} {'tiempo (s)':>11} {'unidades/s':>13} {'memoria (KiB)':>14}"
+    print(encabezado + (f" {'vs base':>8}" if base else ""))
+    for etapa, medida in resultados.items():
+        fila = (f"{etapa:<11} {medida['cantidad']:>10} {medida['segundos']:>11.4f} "
+                f"{medida['por_segundo']:>13,.0f} {medida['memoria_pico'] / 1024:>14,.0f}")
+        anterior = base["etapas"].get(etapa) if base else None
+        if anterior:
+            fila += f" {medida['por_segundo'] / anterior['por_segundo']:>7.2f}x"
+        print(fila)
+    print("(unidades: " + ", ".join(f"{etapa} = {medida['unidad']}" for etapa, medida in resultados.items()) + ")")
+
+    if opciones.guardar:
+        datos = {
+            "version": VERSION_BASE,
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "parametros": parametros,
+            "repeticiones": opciones.repeticiones,
+            "etapas": resultados,
+        }
+        with open(opciones.guardar, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
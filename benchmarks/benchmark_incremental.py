@@ -0,0 +1,41 @@
+"""Compara el análisis completo con AnalizadorIncremental al editar una sola
+función de un programa con muchas funciones.
+
+Uso: python benchmarks/benchmark_incremental.py [funciones ...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analisis_incremental import AnalizadorIncremental
+from analizador_semantico import analizar_programa
+from generador_programas import generar_programa_funciones
+
+
+def medir(analizar):
+    inicio = time.perf_counter()
+    resultado = analizar()
+    return time.perf_counter() - inicio, resultado
+
+
+def main(tamanos):
+    print(f"{'funciones':>10} {'completo (s)':>13} {'incremental (s)':>16} {'reanalizadas':>13}")
+    for funciones in tamanos:
+        codigo = generar_programa_funciones(funciones)
+        analizador = AnalizadorIncremental()
+        analizador.analizar(codigo)
+
+        # Edición en la función del medio, como al escribir en el editor
+        medio = f"func funcion{funciones // 2}() {{"
+        editado = codigo.replace(medio, medio + "\n    val editada = 1;")
+        t_completo, completo = medir(lambda: analizar_programa(editado))
+        antes = analizador.reanalizadas
+        t_incremental, incremental = medir(lambda: analizador.analizar(editado))
+        assert completo["errores"] == incremental["errores"] and completo["exito"] and incremental["exito"]
+        print(f"{funciones:>10} {t_completo:>13.3f} {t_incremental:>16.3f} {analizador.reanalizadas - antes:>13}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [20, 100, 400])
@@ -0,0 +1,65 @@
+"""Compara construir el AST en dos pasadas (árbol de Lark y luego
+ASTBuilder.transform) con el parser en línea, que llama a ASTBuilder en cada
+reducción del LALR sin crear el árbol intermedio.
+
+Mide el parseo con la construcción del AST (la parte que cambia) y el
+análisis completo de analizar_programa; la memoria es el pico de tracemalloc
+durante el parseo.
+
+Uso: python benchmarks/benchmark_lark_en_linea.py [bloques ...]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analizador_semantico import ASTBuilder, analizar_programa, parser, parser_en_linea
+from generador_programas import generar_programa
+
+
+def dos_pasadas(codigo):
+    return ASTBuilder().transform(parser.parse(codigo))
+
+
+def en_linea(codigo):
+    parser_hilo, transformador = parser_en_linea()
+    transformador.reiniciar()
+    return parser_hilo.parse(codigo)
+
+
+def mejor_tiempo(funcion, codigo, repeticiones=3):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(codigo)
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+def memoria_pico(funcion, codigo):
+    tracemalloc.start()
+    try:
+        funcion(codigo)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(tamanos):
+    # Primer uso fuera de la medición: carga las tablas del parser en línea
+    en_linea("func init() { val x = 1; }")
+    print(f"{'bloques':>8} {'modo':>12} {'parseo+AST (s)':>15} {'memoria (MiB)':>14} {'analizar_programa (s)':>22}")
+    for bloques in tamanos:
+        codigo = generar_programa(bloques)
+        for nombre, funcion, opcion in (("dos pasadas", dos_pasadas, False), ("en línea", en_linea, True)):
+            t_parseo = mejor_tiempo(funcion, codigo)
+            pico = memoria_pico(funcion, codigo)
+            t_analisis = mejor_tiempo(lambda texto: analizar_programa(texto, en_linea=opcion), codigo)
+            print(f"{bloques:>8} {nombre:>12} {t_parseo:>15.3f} {pico / 2**20:>14.1f} {t_analisis:>22.3f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [100, 1000, 5000])
@@ -0,0 +1,56 @@
+"""Compara Interprete (recorrido del AST), Interprete en modo compilado
+(closures) y MaquinaVirtual (bytecode) en programas dominados por ciclos
+while/for.
+
+Uso: python benchmarks/benchmark_maquina_virtual.py [iteraciones ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analizador_semantico import Interprete, analizar_programa
+from maquina_virtual import MaquinaVirtual
+from generador_programas import generar_programa_ciclos
+
+
+def medir(ejecutar, repeticiones=3):
+    mejor = None
+    resultado = None
+    for _ in range(repeticiones):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            resultado = ejecutar()
+            duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor, resultado
+
+
+def main(tamanos):
+    print(f"{'iteraciones':>11} {'Interprete (s)':>15} {'Closures (s)':>13} {'MaquinaVirtual (s)':>19}")
+    for iteraciones in tamanos:
+        codigo = generar_programa_ciclos(iteraciones)
+        analisis = analizar_programa(codigo)
+
+        def con_interprete(compilado=False):
+            interprete = Interprete(debug=False, compilado=compilado)
+            interprete.tabla_funciones = analisis["tabla_funciones"]
+            interprete.salidas = []
+            interprete.ejecutar_funcion("init")
+            return interprete.salidas
+
+        def con_maquina():
+            return MaquinaVirtual(mostrar_salidas=False).ejecutar_ast(analisis["ast"])["salidas"]
+
+        t_interprete, salidas_interprete = medir(con_interprete)
+        t_closures, salidas_closures = medir(lambda: con_interprete(compilado=True))
+        t_maquina, salidas_maquina = medir(con_maquina)
+        assert salidas_interprete == salidas_closures == salidas_maquina
+        print(f"{iteraciones:>11} {t_interprete:>15.3f} {t_closures:>13.3f} {t_maquina:>19.3f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [500, 2000, 5000])
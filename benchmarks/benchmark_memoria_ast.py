@@ -0,0 +1,51 @@
+"""Compara la memoria por nodo del AST con clases __slots__ (nodos_ast) contra
+el formato anterior de diccionarios (Nodo.a_diccionario()).
+
+Uso: python benchmarks/benchmark_memoria_ast.py [bloques ...]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analizador_semantico import analizar_programa
+from nodos_ast import Nodo
+from generador_programas import generar_programa
+
+
+def medir_memoria(raiz):
+    """Cuenta los nodos y suma sys.getsizeof de los nodos y sus listas.
+
+    Las cadenas y números se comparten entre ambos formatos, así que no se cuentan.
+    """
+    nodos = 0
+    total = 0
+    pendientes = [raiz]
+    while pendientes:
+        valor = pendientes.pop()
+        if isinstance(valor, Nodo):
+            nodos += 1
+            total += sys.getsizeof(valor)
+            pendientes.extend(getattr(valor, campo) for campo in valor.campos)
+        elif isinstance(valor, dict):
+            nodos += 1
+            total += sys.getsizeof(valor)
+            pendientes.extend(valor.values())
+        elif isinstance(valor, list):
+            total += sys.getsizeof(valor)
+            pendientes.extend(valor)
+    return nodos, total
+
+
+def main(tamanos):
+    print(f"{'bloques':>8} {'nodos':>8} {'diccionarios (B/nodo)':>22} {'__slots__ (B/nodo)':>19}")
+    for bloques in tamanos:
+        ast = analizar_programa(generar_programa(bloques))["ast"]
+        nodos, bytes_slots = medir_memoria(ast)
+        nodos_dict, bytes_dict = medir_memoria(ast.a_diccionario())
+        assert nodos == nodos_dict
+        print(f"{bloques:>8} {nodos:>8} {bytes_dict / nodos:>22.1f} {bytes_slots / nodos:>19.1f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [50, 200, 800])
@@ -0,0 +1,48 @@
+"""Mide el efecto de optimizador.optimizar_programa (plegado de constantes y
+ramas muertas) sobre el tamaño del AST y el tiempo de Interprete.
+
+Uso: python benchmarks/benchmark_optimizador.py [iteraciones ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analizador_semantico import Interprete, analizar_programa
+from generador_programas import generar_programa_constantes
+
+
+def ejecutar(analisis, repeticiones=3):
+    mejor = None
+    salidas = None
+    for _ in range(repeticiones):
+        interprete = Interprete(debug=False)
+        interprete.tabla_funciones = analisis["tabla_funciones"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            interprete.ejecutar_funcion("init")
+            duracion = time.perf_counter() - inicio
+        salidas = interprete.salidas
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor, salidas
+
+
+def main(tamanos):
+    print(f"{'iteraciones':>11} {'nodos':>8} {'eliminados':>11} {'sin optimizar (s)':>18} {'optimizado (s)':>15}")
+    for iteraciones in tamanos:
+        codigo = generar_programa_constantes(iteraciones)
+        normal = analizar_programa(codigo)
+        optimizado = analizar_programa(codigo, optimizar=True)
+        reporte = optimizado["optimizacion"]
+        t_normal, salidas_normal = ejecutar(normal)
+        t_optimizado, salidas_optimizado = ejecutar(optimizado)
+        assert salidas_normal == salidas_optimizado
+        print(f"{iteraciones:>11} {reporte['nodos_antes']:>8} {reporte['nodos_eliminados']:>11} "
+              f"{t_normal:>18.3f} {t_optimizado:>15.3f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [1000, 10000, 50000])
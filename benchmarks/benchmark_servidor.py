@@ -0,0 +1,90 @@
+"""Compara analizar cada programa en un proceso nuevo con enviarlo al servidor
+de análisis, que mantiene los parsers cargados en sus procesos.
+
+El servidor se inicia en un socket Unix temporal; los clientes envían los
+programas desde varios hilos a la vez y al final se muestran los percentiles
+de latencia que informa el propio servidor.
+
+Uso: python benchmarks/benchmark_servidor.py [programas] [clientes] [procesos]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from servidor_analisis import ClienteAnalisis
+from generador_programas import generar_programa, generar_programa_ciclos, generar_programa_funciones
+
+ANALISIS_EN_PROCESO = (
+    "import sys; from analizador_semantico import analizar_programa; "
+    "sys.exit(0 if analizar_programa(sys.stdin.read())['exito'] else 1)"
+)
+
+
+def programas(cantidad):
+    generadores = (lambda: generar_programa(60), lambda: generar_programa_ciclos(40, 4),
+                   lambda: generar_programa_funciones(15, 4))
+    return [generadores[i % len(generadores)]() for i in range(cantidad)]
+
+
+def en_procesos_nuevos(codigos):
+    for codigo in codigos:
+        subprocess.run([sys.executable, "-c", ANALISIS_EN_PROCESO], cwd=RAIZ, input=codigo, text=True,
+                       capture_output=True)
+
+
+def esperar_socket(ruta, proceso, limite=30.0):
+    inicio = time.perf_counter()
+    while not os.path.exists(ruta):
+        if proceso.poll() is not None or time.perf_counter() - inicio > limite:
+            raise RuntimeError("El servidor no se inició")
+        time.sleep(0.05)
+
+
+def main(cantidad=60, clientes=4, procesos=None):
+    codigos = programas(cantidad)
+    procesos = procesos or os.cpu_count() or 1
+
+    inicio = time.perf_counter()
+    en_procesos_nuevos(codigos)
+    t_procesos = time.perf_counter() - inicio
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "analisis.sock")
+        servidor = subprocess.Popen([sys.executable, os.path.join(RAIZ, "servidor_analisis.py"), "--socket", ruta,
+                                     "--procesos", str(procesos)], cwd=RAIZ, stderr=subprocess.DEVNULL)
+        try:
+            esperar_socket(ruta, servidor)
+
+            def enviar(parte):
+                with ClienteAnalisis(ruta_socket=ruta) as cliente:
+                    for codigo in parte:
+                        cliente.llamar("analizar", codigo=codigo)
+
+            inicio = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=clientes) as grupo:
+                list(grupo.map(enviar, [codigos[i::clientes] for i in range(clientes)]))
+            t_servidor = time.perf_counter() - inicio
+
+            with ClienteAnalisis(ruta_socket=ruta) as cliente:
+                latencias = cliente.llamar("estadisticas")["latencias"]["analizar"]
+        finally:
+            servidor.terminate()
+            servidor.wait()
+
+    print(f"{cantidad} programas, {clientes} clientes, servidor con {procesos} procesos")
+    print(f"{'modo':<18} {'tiempo (s)':>11} {'programas/s':>12}")
+    print(f"{'proceso nuevo':<18} {t_procesos:>11.3f} {cantidad / t_procesos:>12.1f}")
+    print(f"{'servidor':<18} {t_servidor:>11.3f} {cantidad / t_servidor:>12.1f}")
+    print(f"latencia en el servidor (ms): p50 {latencias['p50_ms']:.2f}  p90 {latencias['p90_ms']:.2f}  "
+          f"p99 {latencias['p99_ms']:.2f}  máx {latencias['max_ms']:.2f}")
+
+
+if __name__ == "__main__":
+    argumentos = [int(n) for n in sys.argv[1:]]
+    main(*argumentos)
@@ -0,0 +1,57 @@
+"""Compara lexico.analisis (listas de textos) con tokenizar_archivo (generador
+por bloques) en tiempo total, tiempo hasta el primer token y memoria máxima.
+
+Uso: python benchmarks/benchmark_tokenizador.py [bloques ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexico import analisis, tokenizar_archivo
+from generador_programas import generar_programa
+
+
+def medir(ejecutar):
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        resultado = ejecutar()
+        duracion = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracion, pico / (1024 * 1024), resultado
+
+
+def con_listas(ruta):
+    with open(ruta, encoding="utf-8") as archivo:
+        tokens, reservadas, _ = analisis(archivo.read())
+    return len(tokens) + len(reservadas)
+
+
+def con_generador(ruta):
+    return sum(1 for _ in tokenizar_archivo(ruta))
+
+
+def main(tamanos):
+    print(f"{'bloques':>8} {'listas (s)':>11} {'MB':>7} {'generador (s)':>14} {'MB':>7} {'primer token (s)':>17}")
+    for bloques in tamanos:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as archivo:
+            archivo.write(generar_programa(bloques))
+        try:
+            t_listas, m_listas, cantidad_listas = medir(lambda: con_listas(archivo.name))
+            t_generador, m_generador, cantidad_generador = medir(lambda: con_generador(archivo.name))
+            t_primero, _, _ = medir(lambda: next(tokenizar_archivo(archivo.name)))
+            assert cantidad_listas == cantidad_generador
+            print(f"{bloques:>8} {t_listas:>11.3f} {m_listas:>7.1f} {t_generador:>14.3f} {m_generador:>7.1f} {t_primero:>17.4f}")
+        finally:
+            os.remove(archivo.name)
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [1000, 5000, 20000])
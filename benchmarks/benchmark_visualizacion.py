@@ -0,0 +1,40 @@
+"""Mide la construcción, la distribución y la exportación a DOT y SVG del
+árbol de dibujo del AST, completo y limitado en profundidad.
+
+Uso: python benchmarks/benchmark_visualizacion.py [funciones ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analizador_semantico import analizar_programa
+from generador_programas import generar_programa_funciones
+from visualizacion_ast import construir_arbol, distribuir, escribir_arbol
+
+
+def medir(ejecutar):
+    inicio = time.perf_counter()
+    resultado = ejecutar()
+    return time.perf_counter() - inicio, resultado
+
+
+def main(tamanos):
+    print(f"{'funciones':>10} {'profundidad':>12} {'nodos':>8} {'árbol (s)':>10} {'posiciones (s)':>15} "
+          f"{'DOT (s)':>8} {'SVG (s)':>8}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for funciones in tamanos:
+            ast = analizar_programa(generar_programa_funciones(funciones))["ast"]
+            for profundidad in (None, 4):
+                t_arbol, arbol = medir(lambda: construir_arbol(ast, profundidad))
+                t_posiciones, _ = medir(lambda: distribuir(arbol))
+                t_dot, _ = medir(lambda: escribir_arbol(arbol, os.path.join(directorio, "ast.dot")))
+                t_svg, _ = medir(lambda: escribir_arbol(arbol, os.path.join(directorio, "ast.svg")))
+                print(f"{funciones:>10} {str(profundidad or '-'):>12} {len(arbol):>8} {t_arbol:>10.3f} "
+                      f"{t_posiciones:>15.3f} {t_dot:>8.3f} {t_svg:>8.3f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [10, 100, 400])
@@ -0,0 +1,233 @@
+"""Generador de programas sintéticos grandes para los benchmarks"""
+import random
+
+
+def generar_programa(bloques=1000):
+    """Genera una función init con `bloques` grupos de declaraciones, if/else y while"""
+    lineas = ["func init() {"]
+    for i in range(bloques):
+        lineas.append(f"    val a{i} = {i} * 4 + 2;")
+        lineas.append(f"    val b{i} = a{i} - 1;")
+        lineas.append(f"    if (a{i} > b{i}) {{")
+        lineas.append(f"        escribir(a{i});")
+        lineas.append("    } else {")
+        lineas.append("        escribir(\"menor\");")
+        lineas.append("    }")
+        lineas.append(f"    while (b{i} < a{i}) {{")
+        lineas.append(f"        b{i} = b{i} + 1;")
+        lineas.append("    }")
+    lineas.append("}")
+    return "\n".join(lineas) + "\n"
+
+
+def generar_programa_ciclos(iteraciones=1000, internas=20):
+    """Genera un programa dominado por ciclos while/for anidados y llamadas"""
+    return f"""func init() {{
+    val total = 0;
+    val i = 0;
+    while (i < {iteraciones}) {{
+        for (val j = 0; j < {internas}; j++) {{
+            total = total + i * j - j / 2;
+            if (total > 100000) {{
+                total = total - 100000;
+            }}
+        }}
+        i = i + 1;
+    }}
+    escribir(total);
+    auxiliar();
+}}
+
+func auxiliar() {{
+    val k = {iteraciones};
+    while (k > 0) {{
+        k = k - 1;
+    }}
+    escribir(k);
+}}
+"""
+
+
+def generar_programa_constantes(iteraciones=1000):
+    """Genera un ciclo que recalcula subexpresiones constantes en cada iteración"""
+    return f"""func init() {{
+    val factor = 3;
+    val limite = {iteraciones} * 2;
+    val total = 0;
+    val i = 0;
+    while (i < limite / 2) {{
+        total = (10 * 4 + 2) * factor + total;
+        if (factor > 2) {{
+            total = total - (factor * factor);
+        }}
+        i = i + 1;
+    }}
+    escribir(total);
+}}
+"""
+
+
+def generar_programa_funciones(funciones=100, bloques=10):
+    """Genera init más `funciones` funciones auxiliares, cada una con `bloques` grupos"""
+    lineas = ["func init() {"]
+    lineas.extend(f"    funcion{n}();" for n in range(funciones))
+    lineas.append("}")
+    for n in range(funciones):
+        cuerpo = generar_programa(bloques).splitlines()[1:]
+        lineas.append("")
+        lineas.append(f"func funcion{n}() {{")
+        lineas.extend(cuerpo)
+    return "\n".join(lineas) + "\n"
+
+
+class _GeneradorAleatorio:
+    """Estado de generar_programa_aleatorio: líneas emitidas y variables visibles.
+
+    Las variables son de tres clases: "estable" (se declara una vez y no se
+    reasigna), "acumulador" (solo se reasigna como a = a + expresion) y
+    "contador" (controla un ciclo). Las expresiones usan estables, contadores
+    y literales, así que sus valores están acotados aunque se repitan en
+    ciclos; la división siempre es entre un literal distinto de cero.
+    """
+    def __init__(self, semilla, profundidad, sentencias, iteraciones, tamano_expresion, dialecto):
+        self.azar = random.Random(semilla)
+        self.profundidad = profundidad
+        self.sentencias = sentencias
+        self.iteraciones = iteraciones
+        self.tamano_expresion = tamano_expresion
+        self.ply = dialecto == "ply"
+        self.lineas = []
+        self.prefijo = ""
+        self.numero = 0
+        self.ambitos = []
+
+    def nombre(self, letra):
+        self.numero += 1
+        return f"{letra}{self.prefijo}_{self.numero}"
+
+    def visibles(self, *clases):
+        return [nombre for ambito in self.ambitos for nombre, clase in ambito if clase in clases]
+
+    def termino(self):
+        operandos = self.visibles("estable", "contador")
+        if operandos and self.azar.random() < 0.6:
+            return self.azar.choice(operandos)
+        return str(self.azar.randint(0, 99))
+
+    def expresion(self, tamano=None):
+        tamano = tamano or self.azar.randint(1, self.tamano_expresion)
+        partes = [self.termino()]
+        for _ in range(tamano - 1):
+            operador = self.azar.choice("++--*/")
+            if operador == "/":
+                partes.append(f"/ {self.azar.randint(2, 9)}")
+            elif operador == "*" and self.azar.random() < 0.3 and tamano > 2:
+                partes.append(f"* ({self.termino()} + {self.termino()})")
+            else:
+                partes.append(f"{operador} {self.termino()}")
+        return " ".join(partes)
+
+    def condicion(self):
+        izquierda = self.azar.choice(self.visibles("estable", "contador", "acumulador") or ["0"])
+        return f"{izquierda} {self.azar.choice(['<', '>', '<=', '>=', '==', '!='])} {self.expresion(2)}"
+
+    def emitir(self, nivel, texto):
+        self.lineas.append("    " * nivel + texto)
+
+    def declarar(self, nombre, clase):
+        self.ambitos[-1].append((nombre, clase))
+
+    def bloque(self, nivel, restante, en_ciclo):
+        self.ambitos.append([])
+        # Los bloques anidados son cortos para que el tamaño no crezca exponencialmente con la profundidad
+        cantidad = self.sentencias if nivel == 1 else self.azar.randint(1, 4)
+        for _ in range(cantidad):
+            self.sentencia(nivel, restante, en_ciclo)
+        self.ambitos.pop()
+
+    def sentencia(self, nivel, restante, en_ciclo):
+        opciones = ["estable", "estable", "acumulador", "asignacion", "asignacion"]
+        if restante:
+            opciones += ["if", "if_else", "while"] + ([] if self.ply else ["for"])
+        if not en_ciclo:
+            opciones.append("escribir")
+        eleccion = self.azar.choice(opciones)
+        if eleccion == "estable":
+            nombre = self.nombre("s")
+            self.emitir(nivel, f"val {nombre} = {self.expresion()};")
+            self.declarar(nombre, "estable")
+        elif eleccion == "acumulador":
+            nombre = self.nombre("a")
+            self.emitir(nivel, f"val {nombre} = {self.azar.randint(0, 9)};")
+            self.declarar(nombre, "acumulador")
+        elif eleccion == "asignacion":
+            acumulador = self.azar.choice(self.visibles("acumulador"))
+            self.emitir(nivel, f"{acumulador} = {acumulador} {self.azar.choice('+-')} {self.expresion()};")
+        elif eleccion == "escribir":
+            if self.azar.random() < 0.2:
+                self.emitir(nivel, f'escribir("{self.nombre("texto")}");')
+            else:
+                self.emitir(nivel, f"escribir({self.azar.choice(self.visibles('acumulador'))});")
+        elif eleccion in ("if", "if_else"):
+            self.emitir(nivel, f"if ({self.condicion()}) {{")
+            self.bloque(nivel + 1, restante - 1, en_ciclo)
+            if eleccion == "if_else":
+                self.emitir(nivel, "} else {")
+                self.bloque(nivel + 1, restante - 1, en_ciclo)
+            self.emitir(nivel, "}")
+        else:
+            contador = self.nombre("c")
+            limite = self.azar.randint(1, self.iteraciones)
+            if eleccion == "for":
+                self.emitir(nivel, f"for (val {contador} = 0; {contador} < {limite}; {contador}++) {{")
+            else:
+                self.emitir(nivel, f"val {contador} = 0;")
+                self.emitir(nivel, f"while ({contador} < {limite}) {{")
+            self.ambitos.append([(contador, "contador")])
+            self.bloque(nivel + 1, restante - 1, True)
+            if eleccion == "while":
+                self.emitir(nivel + 1, f"{contador} = {contador} + 1;")
+            self.ambitos.pop()
+            self.emitir(nivel, "}")
+
+    def funcion(self, nombre, llamadas):
+        self.prefijo = nombre
+        self.numero = 0
+        self.emitir(0, "func init {" if self.ply else f"func {nombre}() {{")
+        # Un acumulador al inicio para que siempre haya a qué asignar y qué escribir
+        self.ambitos.append([])
+        acumulador = self.nombre("a")
+        self.emitir(1, f"val {acumulador} = 0;")
+        self.declarar(acumulador, "acumulador")
+        self.bloque(1, self.profundidad, False)
+        for llamada in llamadas:
+            self.emitir(1, f"{llamada}();")
+        self.emitir(1, f"escribir({acumulador});")
+        self.ambitos.pop()
+        self.emitir(0, "}")
+        self.lineas.append("")
+
+
+def generar_programa_aleatorio(semilla=0, funciones=4, profundidad=3, sentencias=8, iteraciones=10,
+                               tamano_expresion=4, dialecto="lark"):
+    """Programa válido que siempre termina, el mismo para la misma semilla y parámetros.
+
+    init llama una vez a cada una de las demás funciones (sin recursión), cada
+    función tiene `sentencias` instrucciones en su primer nivel, los if y
+    ciclos se anidan hasta `profundidad` niveles, cada ciclo da entre 1 e
+    `iteraciones` vueltas y las expresiones tienen hasta `tamano_expresion`
+    términos. Con dialecto="ply" se genera lo que acepta la gramática de
+    analizador_sintactico: solo "func init {", sin for ni llamadas, con las
+    sentencias de todas las funciones en init para que el tamaño sea parecido.
+    """
+    if dialecto == "ply":
+        sentencias *= funciones
+    generador = _GeneradorAleatorio(semilla, profundidad, sentencias, iteraciones, tamano_expresion, dialecto)
+    if dialecto == "ply":
+        generador.funcion("init", [])
+    else:
+        auxiliares = [f"funcion{n}" for n in range(1, funciones)]
+        generador.funcion("init", auxiliares)
+        for nombre in auxiliares:
+            generador.funcion(nombre, [])
+    return "\n".join(generador.lineas)
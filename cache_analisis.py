@@ -0,0 +1,154 @@
+"""Caché en disco de los resultados de analizar_programa.
+
+La clave es el hash del código fuente junto con la versión de la gramática y
+del formato de los nodos, así que un archivo sin cambios no vuelve a pasar
+por Lark ni por ASTBuilder. Cada entrada es el resultado completo (AST,
+tablas de símbolos y funciones, errores) serializado con pickle y
+comprimido con zlib. Cuando el directorio supera el tamaño máximo se
+eliminan las entradas usadas hace más tiempo (LRU).
+
+Las entradas se cargan con pickle: el directorio de caché debe ser de uso
+exclusivo del usuario, igual que cualquier otro archivo de configuración.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+
+from analizador_semantico import analizar_programa, grammar
+from tablas_parser import DIRECTORIO_CACHE
+
+
+# Cambiar este número cuando cambie la forma de los nodos o del resultado
+VERSION_FORMATO = 6
+VERSION_GRAMATICA = hashlib.sha256(f"{VERSION_FORMATO}\n{grammar}".encode("utf-8")).hexdigest()[:16]
+
+EXTENSION = ".analisis"
+DIRECTORIO_PREDETERMINADO = DIRECTORIO_CACHE
+TAMANO_MAXIMO_PREDETERMINADO = 64 * 1024 * 1024
+
+
+class CacheAnalisis:
+    """Caché LRU acotada por tamaño en disco, con contadores de aciertos y fallos"""
+    def __init__(self, directorio=DIRECTORIO_PREDETERMINADO, tamano_maximo=TAMANO_MAXIMO_PREDETERMINADO):
+        self.directorio = directorio
+        self.tamano_maximo = tamano_maximo
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        os.makedirs(directorio, exist_ok=True)
+
+    def clave(self, codigo, optimizar=False):
+        contenido = f"{VERSION_GRAMATICA}\n{int(optimizar)}\n{codigo}".encode("utf-8")
+        return hashlib.sha256(contenido).hexdigest()
+
+    def ruta(self, clave):
+        return os.path.join(self.directorio, clave + EXTENSION)
+
+    def analizar(self, codigo, optimizar=False, compilacion=None):
+        """Mismo resultado que analizar_programa, leyendo de la caché si es posible.
+
+        Con una Compilacion del mismo código, un fallo de la caché se analiza
+        con sus tokens (vista_semantica) en lugar de volver a tokenizar.
+        """
+        clave = self.clave(codigo, optimizar)
+        resultado = self.leer(clave)
+        if resultado is not None:
+            self.aciertos += 1
+            return resultado
+        self.fallos += 1
+        if compilacion is not None and not optimizar:
+            resultado = compilacion.vista_semantica()
+        else:
+            resultado = analizar_programa(codigo, optimizar=optimizar)
+        self.guardar(clave, resultado)
+        return resultado
+
+    def leer(self, clave):
+        ruta = self.ruta(clave)
+        try:
+            with open(ruta, "rb") as archivo:
+                datos = archivo.read()
+        except OSError:
+            return None
+        try:
+            resultado = pickle.loads(zlib.decompress(datos))
+        except Exception:
+            # Entrada dañada o de otra versión de Python: se descarta
+            self.eliminar(ruta)
+            return None
+        # Marcar la entrada como usada recientemente para el orden LRU
+        try:
+            os.utime(ruta)
+        except OSError:
+            pass
+        return resultado
+
+    def guardar(self, clave, resultado):
+        try:
+            datos = zlib.compress(pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            # Resultados con objetos que no se pueden serializar no se guardan
+            return
+        if len(datos) > self.tamano_maximo:
+            return
+        # Escritura atómica: un lector nunca ve una entrada a medio escribir
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as archivo:
+                archivo.write(datos)
+            os.replace(temporal, self.ruta(clave))
+        except OSError:
+            self.eliminar(temporal)
+            return
+        self.desalojar()
+
+    def entradas(self):
+        """(última vez usada, tamaño, ruta) de cada entrada en el directorio"""
+        entradas = []
+        with os.scandir(self.directorio) as iterador:
+            for entrada in iterador:
+                if entrada.name.endswith(EXTENSION):
+                    try:
+                        estado = entrada.stat()
+                    except OSError:
+                        continue
+                    entradas.append((estado.st_mtime, estado.st_size, entrada.path))
+        return entradas
+
+    def desalojar(self):
+        """Elimina las entradas menos usadas hasta volver al tamaño máximo"""
+        entradas = self.entradas()
+        total = sum(tamano for _, tamano, _ in entradas)
+        if total <= self.tamano_maximo:
+            return
+        for _, tamano, ruta in sorted(entradas):
+            if total <= self.tamano_maximo:
+                break
+            self.eliminar(ruta)
+            total -= tamano
+            self.desalojos += 1
+
+    def eliminar(self, ruta):
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+
+    def limpiar(self):
+        """Elimina todas las entradas de la caché"""
+        for _, _, ruta in self.entradas():
+            self.eliminar(ruta)
+
+    def estadisticas(self):
+        entradas = self.entradas()
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            "desalojos": self.desalojos,
+            "entradas": len(entradas),
+            "tamano": sum(tamano for _, tamano, _ in entradas),
+        }
@@ -1,13 +1,22 @@
+from nodos_ast import Nodo
+from optimizador_intermedio import optimizar_codigo
+from representacion_intermedia import (
+    ProgramaIntermedio, Constante, Temporal, OPERACIONES_BINARIAS, ASIGNAR, SALTAR, SALTAR_SI,
+    SALTAR_SI_FALSO, ESCRIBIR, LEER, LLAMAR, RETORNAR, ETIQUETA, FUNCION, COMENTARIO
+)
+
+
 class GeneradorCodigoIntermedio:
     def __init__(self):
-        self.codigo = []
+        self.codigo = ProgramaIntermedio()
         self.contador_temp = 0
         self.contador_etiqueta = 0
         self.tabla_simbolos = {}
+        self.reporte_optimizacion = None
     
     def nuevo_temporal(self):
-        """Genera un nuevo nombre de variable temporal"""
-        temp = f"t{self.contador_temp}"
+        """Genera una nueva variable temporal"""
+        temp = Temporal(self.contador_temp)
         self.contador_temp += 1
         return temp
     
@@ -17,167 +26,200 @@ class GeneradorCodigoIntermedio:
         self.contador_etiqueta += 1
         return etiqueta
     
-    def generar_codigo(self, ast):
-        """Genera código intermedio a partir del AST"""
-        if ast["tipo"] == "programa":
-            self.codigo.append("# Inicio del programa")
-            for instruccion in ast.get("instrucciones", []):
-                self.generar_codigo_instruccion(instruccion)
-            self.codigo.append("# Fin del programa")
+    def generar_codigo(self, ast, optimizar=False):
+        """Genera las cuádruplas del AST (optimizadas si optimizar=True)"""
+        if ast.tipo == "programa":
+            self.codigo.agregar(COMENTARIO, resultado="Inicio del programa")
+            for funcion in ast.funciones:
+                self.codigo.agregar(FUNCION, resultado=funcion.nombre)
+                for instruccion in funcion.instrucciones:
+                    self.generar_codigo_instruccion(instruccion)
+                self.codigo.agregar(RETORNAR)
+            self.codigo.agregar(COMENTARIO, resultado="Fin del programa")
+        if optimizar:
+            self.codigo, self.reporte_optimizacion = optimizar_codigo(self.codigo)
         return self.codigo
     
     def generar_codigo_instruccion(self, nodo):
         """Genera código para una instrucción"""
-        tipo_nodo = nodo.get("tipo")
+        tipo_nodo = nodo.tipo
         
         if tipo_nodo == "declaracion_variable":
-            nombre = nodo.get("nombre")
-            valor_expr = self.generar_codigo_expresion(nodo.get("valor"))
-            self.codigo.append(f"{nombre} = {valor_expr}")
+            nombre = nodo.nombre
+            # Sin valor inicial la variable vale 0, igual que en Interprete
+            valor_expr = self.generar_codigo_expresion(nodo.valor) if nodo.valor is not None else Constante(0)
+            self.codigo.agregar(ASIGNAR, valor_expr, resultado=nombre)
             self.tabla_simbolos[nombre] = True
         
+        elif tipo_nodo == "llamada_funcion":
+            self.codigo.agregar(LLAMAR, resultado=nodo.nombre)
+        
         elif tipo_nodo == "asignacion":
-            nombre = nodo.get("nombre")
-            valor_expr = self.generar_codigo_expresion(nodo.get("valor"))
-            self.codigo.append(f"{nombre} = {valor_expr}")
+            nombre = nodo.nombre
+            valor_expr = self.generar_codigo_expresion(nodo.valor)
+            self.codigo.agregar(ASIGNAR, valor_expr, resultado=nombre)
         
         elif tipo_nodo == "if":
             etiqueta_fin = self.nueva_etiqueta()
-            self.generar_codigo_condicion(nodo.get("condicion"), None, etiqueta_fin)
+            self.generar_codigo_condicion(nodo.condicion, None, etiqueta_fin)
             
             # Cuerpo del if
-            if isinstance(nodo.get("cuerpo"), list):
-                for instruccion in nodo.get("cuerpo"):
+            if isinstance(nodo.cuerpo, list):
+                for instruccion in nodo.cuerpo:
                     self.generar_codigo_instruccion(instruccion)
             else:
-                self.generar_codigo_instruccion(nodo.get("cuerpo"))
+                self.generar_codigo_instruccion(nodo.cuerpo)
             
-            self.codigo.append(f"{etiqueta_fin}:")
+            self.codigo.agregar(ETIQUETA, resultado=etiqueta_fin)
         
         elif tipo_nodo == "if_else":
             etiqueta_else = self.nueva_etiqueta()
             etiqueta_fin = self.nueva_etiqueta()
             
-            self.generar_codigo_condicion(nodo.get("condicion"), None, etiqueta_else)
+            self.generar_codigo_condicion(nodo.condicion, None, etiqueta_else)
             
             # Cuerpo del if
-            if isinstance(nodo.get("cuerpo_if"), list):
-                for instruccion in nodo.get("cuerpo_if"):
+            if isinstance(nodo.cuerpo_if, list):
+                for instruccion in nodo.cuerpo_if:
                     self.generar_codigo_instruccion(instruccion)
             else:
-                self.generar_codigo_instruccion(nodo.get("cuerpo_if"))
+                self.generar_codigo_instruccion(nodo.cuerpo_if)
             
-            self.codigo.append(f"goto {etiqueta_fin}")
-            self.codigo.append(f"{etiqueta_else}:")
+            self.codigo.agregar(SALTAR, resultado=etiqueta_fin)
+            self.codigo.agregar(ETIQUETA, resultado=etiqueta_else)
             
             # Cuerpo del else
-            if isinstance(nodo.get("cuerpo_else"), list):
-                for instruccion in nodo.get("cuerpo_else"):
+            if isinstance(nodo.cuerpo_else, list):
+                for instruccion in nodo.cuerpo_else:
                     self.generar_codigo_instruccion(instruccion)
             else:
-                self.generar_codigo_instruccion(nodo.get("cuerpo_else"))
+                self.generar_codigo_instruccion(nodo.cuerpo_else)
             
-            self.codigo.append(f"{etiqueta_fin}:")
+            self.codigo.agregar(ETIQUETA, resultado=etiqueta_fin)
         
         elif tipo_nodo == "while":
             etiqueta_inicio = self.nueva_etiqueta()
             etiqueta_fin = self.nueva_etiqueta()
             
-            self.codigo.append(f"{etiqueta_inicio}:")
-            self.generar_codigo_condicion(nodo.get("condicion"), None, etiqueta_fin)
+            self.codigo.agregar(ETIQUETA, resultado=etiqueta_inicio)
+            self.generar_codigo_condicion(nodo.condicion, None, etiqueta_fin)
             
             # Cuerpo del while
-            if isinstance(nodo.get("cuerpo"), list):
-                for instruccion in nodo.get("cuerpo"):
+            if isinstance(nodo.cuerpo, list):
+                for instruccion in nodo.cuerpo:
                     self.generar_codigo_instruccion(instruccion)
             else:
-                self.generar_codigo_instruccion(nodo.get("cuerpo"))
+                self.generar_codigo_instruccion(nodo.cuerpo)
             
-            self.codigo.append(f"goto {etiqueta_inicio}")
-            self.codigo.append(f"{etiqueta_fin}:")
+            self.codigo.agregar(SALTAR, resultado=etiqueta_inicio)
+            self.codigo.agregar(ETIQUETA, resultado=etiqueta_fin)
         
         elif tipo_nodo == "for":
             # Inicialización
-            self.generar_codigo_instruccion(nodo.get("inicializacion"))
+            self.generar_codigo_instruccion(nodo.inicializacion)
             
             etiqueta_inicio = self.nueva_etiqueta()
             etiqueta_fin = self.nueva_etiqueta()
             
-            self.codigo.append(f"{etiqueta_inicio}:")
-            self.generar_codigo_condicion(nodo.get("condicion"), None, etiqueta_fin)
+            self.codigo.agregar(ETIQUETA, resultado=etiqueta_inicio)
+            self.generar_codigo_condicion(nodo.condicion, None, etiqueta_fin)
             
             # Cuerpo del for
-            if isinstance(nodo.get("cuerpo"), list):
-                for instruccion in nodo.get("cuerpo"):
+            if isinstance(nodo.cuerpo, list):
+                for instruccion in nodo.cuerpo:
                     self.generar_codigo_instruccion(instruccion)
             else:
-                self.generar_codigo_instruccion(nodo.get("cuerpo"))
+                self.generar_codigo_instruccion(nodo.cuerpo)
             
             # Incremento
-            variable = nodo.get("variable")
-            operador = nodo.get("operador")
+            variable = nodo.variable
+            operador = nodo.operador
             
             if operador == "++":
-                self.codigo.append(f"{variable} = {variable} + 1")
+                self.codigo.agregar(OPERACIONES_BINARIAS["+"], variable, Constante(1), variable)
             elif operador == "--":
-                self.codigo.append(f"{variable} = {variable} - 1")
+                self.codigo.agregar(OPERACIONES_BINARIAS["-"], variable, Constante(1), variable)
             
-            self.codigo.append(f"goto {etiqueta_inicio}")
-            self.codigo.append(f"{etiqueta_fin}:")
+            self.codigo.agregar(SALTAR, resultado=etiqueta_inicio)
+            self.codigo.agregar(ETIQUETA, resultado=etiqueta_fin)
         
         elif tipo_nodo == "escribir":
-            valor_expr = self.generar_codigo_expresion(nodo.get("expresion"))
-            self.codigo.append(f"print {valor_expr}")
+            valor_expr = self.generar_codigo_expresion(nodo.expresion)
+            self.codigo.agregar(ESCRIBIR, valor_expr)
         
         elif tipo_nodo == "leer":
-            variable = nodo.get("variable")
-            self.codigo.append(f"read {variable}")
+            variable = nodo.variable
+            self.codigo.agregar(LEER, resultado=variable)
     
     def generar_codigo_expresion(self, expresion):
-        """Genera código para una expresión y devuelve el temporal o valor resultante"""
-        if not isinstance(expresion, dict):
+        """Genera código para una expresión y devuelve el operando resultante"""
+        if not isinstance(expresion, Nodo):
             return str(expresion)
         
-        tipo_expr = expresion.get("tipo")
+        tipo_expr = expresion.tipo
         
         if tipo_expr == "entero":
-            return str(expresion.get("valor"))
+            return Constante(int(expresion.valor))
         
         elif tipo_expr == "flotante":
-            return str(expresion.get("valor"))
+            return Constante(float(expresion.valor))
         
         elif tipo_expr == "cadena":
-            return f'"{expresion.get("valor")}"'
+            return Constante(str(expresion.valor))
+        
+        elif tipo_expr == "booleano":
+            return Constante(bool(expresion.valor))
         
         elif tipo_expr == "variable":
-            return expresion.get("nombre")
+            return expresion.nombre
         
         elif tipo_expr == "operacion":
-            izquierda = self.generar_codigo_expresion(expresion.get("izquierda"))
-            derecha = self.generar_codigo_expresion(expresion.get("derecha"))
-            operador = expresion.get("operador")
+            izquierda = self.generar_codigo_expresion(expresion.izquierda)
+            derecha = self.generar_codigo_expresion(expresion.derecha)
+            operador = expresion.operador
             
             temp = self.nuevo_temporal()
-            self.codigo.append(f"{temp} = {izquierda} {operador} {derecha}")
+            self.codigo.agregar(OPERACIONES_BINARIAS[operador], izquierda, derecha, temp)
             return temp
         
         elif tipo_expr == "comparacion":
-            izquierda = self.generar_codigo_expresion(expresion.get("izquierda"))
-            derecha = self.generar_codigo_expresion(expresion.get("derecha"))
-            operador = expresion.get("operador")
+            izquierda = self.generar_codigo_expresion(expresion.izquierda)
+            derecha = self.generar_codigo_expresion(expresion.derecha)
+            operador = expresion.operador
             
             temp = self.nuevo_temporal()
-            self.codigo.append(f"{temp} = {izquierda} {operador} {derecha}")
+            self.codigo.agregar(OPERACIONES_BINARIAS[operador], izquierda, derecha, temp)
             return temp
         
-        return "0"  # Valor por defecto
+        return Constante(0)  # Valor por defecto
     
     def generar_codigo_condicion(self, condicion, etiqueta_verdadero, etiqueta_falso):
-        """Genera código para una condición con saltos"""
+        """Genera código para una condición con saltos (una etiqueta None sigue en la siguiente instrucción).
+        
+        && y || se traducen a saltos en cortocircuito: el operando derecho no se
+        calcula cuando el izquierdo ya decide, y no se guardan temporales booleanos.
+        """
+        if isinstance(condicion, Nodo) and condicion.tipo == "logica":
+            if condicion.operador == "&&":
+                # Izquierda falsa: la condición completa es falsa
+                salida = etiqueta_falso or self.nueva_etiqueta()
+                self.generar_codigo_condicion(condicion.izquierda, None, salida)
+                self.generar_codigo_condicion(condicion.derecha, etiqueta_verdadero, etiqueta_falso)
+                if etiqueta_falso is None:
+                    self.codigo.agregar(ETIQUETA, resultado=salida)
+            else:
+                # Izquierda verdadera: la condición completa es verdadera
+                salida = etiqueta_verdadero or self.nueva_etiqueta()
+                self.generar_codigo_condicion(condicion.izquierda, salida, None)
+                self.generar_codigo_condicion(condicion.derecha, etiqueta_verdadero, etiqueta_falso)
+                if etiqueta_verdadero is None:
+                    self.codigo.agregar(ETIQUETA, resultado=salida)
+            return
+        
         resultado = self.generar_codigo_expresion(condicion)
         
         if etiqueta_verdadero:
-            self.codigo.append(f"if {resultado} goto {etiqueta_verdadero}")
+            self.codigo.agregar(SALTAR_SI, resultado, resultado=etiqueta_verdadero)
         
         if etiqueta_falso:
-            self.codigo.append(f"ifFalse {resultado} goto {etiqueta_falso}")
\ No newline at end of file
+            self.codigo.agregar(SALTAR_SI_FALSO, resultado, resultado=etiqueta_falso)
\ No newline at end of file
@@ -0,0 +1,251 @@
+import re
+
+from lark import Token
+from lark.lexer import PatternStr
+
+import lexico
+from lexico import palabras_reservadas
+from analizador_sintactico import analizar_sintaxis
+from analizador_semantico import analizar_programa, parser_tokens
+
+
+# Terminales literales de la gramática de Lark ("func", "{", "++", ...) por texto
+TERMINALES_LITERALES = {}
+# Expresiones regulares de los terminales con patrón (IDENTIFICADOR, NUMERO, ...)
+TERMINALES_REGEX = {}
+# Terminales que Lark ignora entre tokens (espacios y comentarios //)
+TERMINALES_IGNORADOS = []
+for _terminal in parser_tokens.terminals:
+    if _terminal.name in parser_tokens.lexer_conf.ignore:
+        TERMINALES_IGNORADOS.append(re.compile(_terminal.pattern.to_regexp()))
+    elif isinstance(_terminal.pattern, PatternStr):
+        TERMINALES_LITERALES[_terminal.pattern.value] = _terminal.name
+    else:
+        TERMINALES_REGEX[_terminal.name] = re.compile(_terminal.pattern.to_regexp())
+
+# Terminal con patrón de Lark que corresponde a cada tipo de token de PLY. Si el texto
+# también es un literal de la gramática ("if", "true", "+") decide el estado del parser.
+TERMINAL_DE_TIPO = {
+    "VARIABLE": "IDENTIFICADOR",
+    "ENTERO": "NUMERO",
+    "FLOTANTE": "NUMERO",
+    "COMILLAS": "CADENA",
+    "OPERADOR": "OPERADOR_ARITMETICO",
+    "LOGICO": "LOGICO",
+    **{tipo: "COMPARACION" for tipo in lexico.tokens if tipo.startswith("COMPARACION_")},
+    # Una palabra reservada de PLY es un identificador donde Lark no la espera ("init")
+    **{tipo: "IDENTIFICADOR" for tipo in palabras_reservadas.values()},
+}
+# Textos de token que pueden empezar un literal de varios tokens de PLY ("(" de "()", "+" de "++")
+PREFIJOS_LITERALES = {literal[:i] for literal in TERMINALES_LITERALES for i in range(1, len(literal))}
+
+TIPOS_RESERVADOS = set(palabras_reservadas.values())
+
+
+def terminales_de(texto, tipo):
+    """(literal, terminal con patrón) de Lark para un token de PLY; cualquiera puede ser None"""
+    con_patron = TERMINAL_DE_TIPO.get(tipo)
+    if con_patron is not None and not TERMINALES_REGEX[con_patron].fullmatch(texto):
+        # Por ejemplo "!", que PLY lee como LOGICO y la gramática de Lark no tiene
+        con_patron = None
+    return TERMINALES_LITERALES.get(texto), con_patron
+
+
+class LexerRepeticion:
+    """Lexer compatible con PLY que repite una lista de tokens ya generados"""
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.posicion = 0
+
+    def input(self, codigo):
+        self.posicion = 0
+
+    def token(self):
+        if self.posicion >= len(self.tokens):
+            return None
+        tok = self.tokens[self.posicion]
+        self.posicion += 1
+        return tok
+
+
+class Compilacion:
+    """Analiza un programa con una sola pasada léxica compartida por todas las vistas.
+
+    Los tokens de PLY se generan una vez y alimentan tanto al parser de PLY
+    (vista sintáctica) como al parser LALR de Lark (vista semántica / AST).
+    Lo compartido es la tokenización: cada parser sigue armando su propio
+    árbol (las tuplas de PLY y el AST de ASTBuilder), porque las gramáticas
+    de las dos vistas son distintas.
+
+    Los dos lexers no reconocen exactamente el mismo lenguaje (PLY acepta
+    comentarios /* */ y Lark cadenas de varias líneas, por ejemplo). Si PLY
+    reportó caracteres ilegales o entre dos tokens queda texto que Lark no
+    ignora, la vista semántica parsea el texto con el lexer de Lark. Lo mismo
+    ocurre ante un error de sintaxis (también el de un token sin terminal en
+    Lark), para reportar el mensaje exacto de analizar_programa.
+    """
+    def __init__(self, codigo, lexer=None, parser_sintactico=None):
+        self.codigo = codigo
+        # Lexer y parser de PLY propios (de una SesionAnalisis); si no, copias nuevas
+        self.lexer = lexer
+        self.parser_sintactico = parser_sintactico
+        self._tokens = None
+        self._textos = None
+        self._errores_lexicos = None
+        # False si la vista semántica tuvo que volver a leer el texto con el lexer de Lark
+        self.comparte_tokens = None
+        self._resultado_sintactico = None
+        self._resultado_semantico = None
+
+    def _error_lexico(self, t):
+        mensaje = f"Caracter ilegal '{t.value[0]}' en la línea {t.lexer.lineno}"
+        print(mensaje)
+        self._errores_lexicos.append(mensaje)
+        t.lexer.skip(1)
+
+    def _tokenizar(self):
+        analizador = self.lexer if self.lexer is not None else lexico.nuevo_lexer()
+        analizador.lineno = 1
+        analizador.lexerrorf = self._error_lexico
+        self._tokens = []
+        self._textos = []
+        self._errores_lexicos = []
+        analizador.input(self.codigo)
+        while True:
+            tok = analizador.token()
+            if not tok:
+                break
+            self._tokens.append(tok)
+            # Texto original del token (PLY convierte números y quita comillas)
+            self._textos.append(self.codigo[tok.lexpos:analizador.lexpos])
+
+    @property
+    def tokens(self):
+        """Tokens de PLY del programa, generados una única vez"""
+        if self._tokens is None:
+            self._tokenizar()
+        return self._tokens
+
+    @property
+    def errores_lexicos(self):
+        if self._errores_lexicos is None:
+            self._tokenizar()
+        return self._errores_lexicos
+
+    def lineas_tokens(self, reservadas=None):
+        """Texto LexToken(...) de cada token, generado a medida que se pide.
+
+        reservadas=True entrega solo palabras reservadas y reservadas=False
+        solo los demás tokens, igual que lexico.tokenizar.
+        """
+        for tok in self.tokens:
+            if reservadas is None or (tok.type in TIPOS_RESERVADOS) == reservadas:
+                yield f"LexToken({tok.type}, '{tok.value}', {tok.lineno}, {tok.lexpos})"
+
+    def vista_tokens(self):
+        """Mismo resultado que lexico.analisis, sin volver a tokenizar"""
+        return (list(self.lineas_tokens(reservadas=False)), list(self.lineas_tokens(reservadas=True)),
+                list(self.errores_lexicos))
+
+    def vista_sintactica(self):
+        """Mismo resultado que analizar_sintaxis, alimentando PLY con los tokens compartidos"""
+        if self._resultado_sintactico is None:
+            self._resultado_sintactico = analizar_sintaxis(self.codigo, lexer=LexerRepeticion(self.tokens),
+                                                           parser_propio=self.parser_sintactico)
+        return self._resultado_sintactico
+
+    def _lark_ignora_lo_mismo(self):
+        """True si Lark, leyendo el texto, ignoraría lo mismo que PLY entre sus tokens"""
+        if self.errores_lexicos:
+            return False
+        # Sin errores PLY solo salta espacios, tabuladores, saltos de línea y comentarios,
+        # que Lark también ignora salvo los /* */
+        if "/*" not in self.codigo:
+            return True
+        fin = 0
+        for tok, texto in zip(self.tokens, self._textos):
+            if not self._ignorado_por_lark(fin, tok.lexpos):
+                return False
+            fin = tok.lexpos + len(texto)
+        return self._ignorado_por_lark(fin, len(self.codigo))
+
+    def _ignorado_por_lark(self, inicio, fin):
+        """True si el texto entre inicio y fin son solo espacios y comentarios para Lark"""
+        codigo = self.codigo
+        while inicio < fin:
+            for regex in TERMINALES_IGNORADOS:
+                coincidencia = regex.match(codigo, inicio, fin)
+                if coincidencia and coincidencia.end() > inicio:
+                    inicio = coincidencia.end()
+                    break
+            else:
+                return False
+        return True
+
+    def siguiente_lark(self):
+        """Función siguiente(aceptados) para LexerTokens sobre los tokens compartidos.
+
+        Como el lexer contextual de Lark, prefiere el terminal más largo que
+        acepta el estado del parser: une dos tokens de PLY contiguos cuando
+        forman un literal aceptado ("()" de la cabecera de una función, "++"
+        y "--" del for) y usa IDENTIFICADOR para una palabra reservada que
+        el estado no acepta como tal.
+        """
+        tokens = self.tokens
+        textos = self._textos
+        codigo = self.codigo
+        total = len(tokens)
+        # (literal, terminal con patrón) de cada texto distinto
+        por_texto = {}
+        posicion = 0
+        linea = inicio_linea = 0
+
+        def siguiente(aceptados):
+            nonlocal posicion, linea, inicio_linea
+            if posicion >= total:
+                return None
+            tok = tokens[posicion]
+            texto = textos[posicion]
+            inicio = tok.lexpos
+            posicion += 1
+            tipo = None
+            if texto in PREFIJOS_LITERALES and posicion < total and tokens[posicion].lexpos == inicio + len(texto):
+                unido = TERMINALES_LITERALES.get(texto + textos[posicion])
+                if unido in aceptados:
+                    texto += textos[posicion]
+                    tipo = unido
+                    posicion += 1
+            if tipo is None:
+                terminales = por_texto.get(texto)
+                if terminales is None:
+                    terminales = por_texto[texto] = terminales_de(texto, tok.type)
+                literal, con_patron = terminales
+                if literal in aceptados:
+                    tipo = literal
+                elif con_patron in aceptados:
+                    tipo = con_patron
+                else:
+                    # Ningún terminal aceptado: el parser reporta el error con este token
+                    tipo = literal or con_patron or tok.type
+            if tok.lineno != linea:
+                linea = tok.lineno
+                inicio_linea = codigo.rfind("\n", 0, inicio) + 1
+            columna = inicio - inicio_linea + 1
+            return Token(tipo, texto, inicio, linea, columna, linea, columna + len(texto), inicio + len(texto))
+
+        return siguiente
+
+    def vista_semantica(self):
+        """Mismo resultado que analizar_programa, parseando los tokens compartidos cuando se puede"""
+        if self._resultado_semantico is None:
+            resultado = None
+            self.comparte_tokens = self._lark_ignora_lo_mismo()
+            if self.comparte_tokens:
+                resultado = analizar_programa(self.codigo, siguiente_token=self.siguiente_lark(), en_linea=True)
+                if "error_tipo" in resultado:
+                    resultado = None
+            if resultado is None:
+                self.comparte_tokens = False
+                resultado = analizar_programa(self.codigo)
+            self._resultado_semantico = resultado
+        return self._resultado_semantico
@@ -0,0 +1,193 @@
+"""Ejecuta directamente el código intermedio de GeneradorCodigoIntermedio.
+
+Cada función del ProgramaIntermedio se traduce una vez a cuatro listas
+paralelas (operación, argumento1, argumento2, resultado) con las etiquetas
+resueltas a índices y los operandos resueltos a posiciones del marco. Las
+constantes ocupan posiciones fijas del marco inicial, así que leer una
+variable, un temporal o una constante es el mismo acceso por índice.
+"""
+from representacion_intermedia import (
+    Constante, FUNCIONES_BINARIAS, ASIGNAR, SALTAR, SALTAR_SI, SALTAR_SI_FALSO, ESCRIBIR, LEER,
+    LLAMAR, RETORNAR, FUNCION, MARCAS
+)
+
+
+# Función binaria por código de operación (None si la operación no es binaria)
+BINARIAS_POR_CODIGO = [FUNCIONES_BINARIAS.get(codigo) for codigo in range(RETORNAR + 1)]
+
+# Máximo de llamadas anidadas, el mismo que en MaquinaVirtual
+LIMITE_LLAMADAS = 1000
+
+
+class FuncionIntermedia:
+    """Código de una función listo para ejecutar"""
+    __slots__ = ("nombre", "operaciones", "argumentos1", "argumentos2", "resultados", "plantilla", "variables")
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.operaciones = []
+        self.argumentos1 = []
+        self.argumentos2 = []
+        self.resultados = []
+        # Valores iniciales del marco: constantes en su posición, variables en 0
+        self.plantilla = []
+        self.variables = {}
+
+
+class EjecutorIntermedio:
+    """Ejecuta un ProgramaIntermedio con un ciclo de contador de programa"""
+    def __init__(self, mostrar_salidas=True):
+        self.memoria_global = {}
+        self.memoria_local = {}
+        self.entradas = []
+        self.salidas = []
+        self.mostrar_salidas = mostrar_salidas
+        self.funciones = []
+        self.indices_funciones = {}
+
+    def establecer_entradas(self, entradas):
+        self.entradas = entradas
+
+    def preparar(self, programa):
+        """Divide el programa en funciones y resuelve etiquetas y operandos"""
+        regiones = []
+        for cuadrupla in programa:
+            if cuadrupla.operacion == FUNCION:
+                regiones.append((cuadrupla.resultado, []))
+            elif regiones:
+                regiones[-1][1].append(cuadrupla)
+
+        self.funciones = [FuncionIntermedia(nombre) for nombre, _ in regiones]
+        self.indices_funciones = {funcion.nombre: indice for indice, funcion in enumerate(self.funciones)}
+        for funcion, (_, cuadruplas) in zip(self.funciones, regiones):
+            self.preparar_funcion(funcion, cuadruplas)
+
+    def preparar_funcion(self, funcion, cuadruplas):
+        # Índice de cada etiqueta en la lista de instrucciones sin marcas
+        etiquetas = {}
+        indice = 0
+        for cuadrupla in cuadruplas:
+            if cuadrupla.operacion in MARCAS:
+                etiquetas[cuadrupla.resultado] = indice
+            else:
+                indice += 1
+
+        def posicion(operando):
+            if operando is None:
+                return 0
+            if operando not in funcion.variables:
+                funcion.variables[operando] = len(funcion.plantilla)
+                # Las variables no asignadas valen 0, igual que en Interprete
+                funcion.plantilla.append(operando.valor if isinstance(operando, Constante) else 0)
+            return funcion.variables[operando]
+
+        for cuadrupla in cuadruplas:
+            operacion = cuadrupla.operacion
+            if operacion in MARCAS:
+                continue
+            if operacion in (SALTAR, SALTAR_SI, SALTAR_SI_FALSO):
+                resultado = etiquetas[cuadrupla.resultado]
+            elif operacion == LLAMAR:
+                resultado = self.indices_funciones.get(cuadrupla.resultado, -1)
+            else:
+                resultado = posicion(cuadrupla.resultado)
+            funcion.operaciones.append(operacion)
+            funcion.argumentos1.append(posicion(cuadrupla.argumento1))
+            funcion.argumentos2.append(posicion(cuadrupla.argumento2))
+            funcion.resultados.append(resultado)
+
+        # Retorno implícito al final de la función
+        funcion.operaciones.append(RETORNAR)
+        funcion.argumentos1.append(0)
+        funcion.argumentos2.append(0)
+        funcion.resultados.append(0)
+
+    def ejecutar(self, programa):
+        """Ejecuta la función init; mismo resultado que Interprete.ejecutar"""
+        try:
+            self.memoria_global = {}
+            self.memoria_local = {}
+            self.salidas = []
+            self.preparar(programa)
+
+            if "init" not in self.indices_funciones:
+                return {
+                    "exito": False,
+                    "error": "No se encontró la función 'init'"
+                }
+            self.correr(self.indices_funciones["init"])
+
+            return {
+                "exito": True,
+                "memoria_global": self.memoria_global,
+                "memoria_local": self.memoria_local,
+                "salidas": self.salidas
+            }
+        except Exception as e:
+            return {
+                "exito": False,
+                "error": f"Error en ejecución: {str(e)}"
+            }
+
+    def correr(self, indice_funcion):
+        funciones = self.funciones
+        salidas = self.salidas
+        entradas = self.entradas
+        mostrar = self.mostrar_salidas
+        binarias = BINARIAS_POR_CODIGO
+        llamadas = []
+
+        funcion = funciones[indice_funcion]
+        operaciones = funcion.operaciones
+        argumentos1 = funcion.argumentos1
+        argumentos2 = funcion.argumentos2
+        resultados = funcion.resultados
+        valores = funcion.plantilla[:]
+        pc = 0
+
+        while True:
+            operacion = operaciones[pc]
+            binaria = binarias[operacion]
+
+            if binaria is not None:
+                valores[resultados[pc]] = binaria(valores[argumentos1[pc]], valores[argumentos2[pc]])
+            elif operacion == SALTAR_SI_FALSO:
+                if not valores[argumentos1[pc]]:
+                    pc = resultados[pc]
+                    continue
+            elif operacion == ASIGNAR:
+                valores[resultados[pc]] = valores[argumentos1[pc]]
+            elif operacion == SALTAR:
+                pc = resultados[pc]
+                continue
+            elif operacion == SALTAR_SI:
+                if valores[argumentos1[pc]]:
+                    pc = resultados[pc]
+                    continue
+            elif operacion == ESCRIBIR:
+                valor = valores[argumentos1[pc]]
+                salidas.append(str(valor))
+                if mostrar:
+                    print(f">>> {valor}")
+            elif operacion == LEER:
+                valores[resultados[pc]] = entradas.pop(0) if entradas else 0
+            elif operacion == LLAMAR:
+                destino = resultados[pc]
+                if destino >= 0:
+                    if len(llamadas) >= LIMITE_LLAMADAS:
+                        raise RecursionError("maximum recursion depth exceeded")
+                    llamadas.append((operaciones, argumentos1, argumentos2, resultados, valores, pc + 1))
+                    funcion = funciones[destino]
+                    operaciones = funcion.operaciones
+                    argumentos1 = funcion.argumentos1
+                    argumentos2 = funcion.argumentos2
+                    resultados = funcion.resultados
+                    valores = funcion.plantilla[:]
+                    pc = 0
+                    continue
+            elif operacion == RETORNAR:
+                if not llamadas:
+                    return
+                operaciones, argumentos1, argumentos2, resultados, valores, pc = llamadas.pop()
+                continue
+            pc += 1
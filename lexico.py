@@ -1,3 +1,6 @@
+import codecs
+import mmap
+
 import ply.lex as lex
 import ply.yacc as yacc
 
@@ -46,7 +49,7 @@ t_ASIGNACION = r'='
 t_SEPARADOR = r';'
 t_DELIMITADOR_L = r'\{'
 t_DELIMITADOR_R = r'\}'
-t_LOGICO = r'&&|\|\||!'
+t_LOGICO = r'&&|\|\||!(?!=)'
 t_DOS_PUNTOS = r'\:'
 t_T_PARENTESIS_L = r'\('
 t_T_PARENTESIS_R = r'\)'
@@ -87,21 +90,120 @@ def t_error(t):
     t.lexer.skip(1)
 
 
+# Lexer plantilla: cada análisis trabaja con un clon propio (ver nuevo_lexer)
 analizador = lex.lex()
 
 
+def nuevo_lexer():
+    """Clon del lexer con su propia posición y número de línea (comparte las reglas compiladas)"""
+    lexer = analizador.clone()
+    lexer.lineno = 1
+    return lexer
+
+
+TIPOS_RESERVADOS = frozenset(palabras_reservadas.values())
+
+# Tamaño de los bloques leídos del archivo al tokenizar por partes
+TAMANO_BLOQUE = 1 << 20
+
+
+class RegistroToken:
+    """Token liviano (tipo, valor, línea, posición); el texto LexToken(...) se arma con str()"""
+    __slots__ = ("tipo", "valor", "linea", "posicion")
+
+    def __init__(self, tipo, valor, linea, posicion):
+        self.tipo = tipo
+        self.valor = valor
+        self.linea = linea
+        self.posicion = posicion
+
+    @property
+    def reservada(self):
+        return self.tipo in TIPOS_RESERVADOS
+
+    def __repr__(self):
+        return f"RegistroToken({self.tipo!r}, {self.valor!r}, {self.linea}, {self.posicion})"
+
+    def __str__(self):
+        return f"LexToken({self.tipo}, '{self.valor}', {self.linea}, {self.posicion})"
+
+
+def tokenizar_bloques(bloques, reservadas=None, errores=None):
+    """Genera los tokens de un texto que llega en bloques (str) de cualquier tamaño.
+
+    Cada bloque se tokeniza hasta su último salto de línea, así ningún token
+    queda partido; un comentario /* ... */ abierto se completa con los
+    bloques siguientes. reservadas=True entrega solo palabras reservadas y
+    reservadas=False solo los demás tokens. Los caracteres ilegales se
+    agregan a errores si se pasa una lista, o se imprimen como en analisis.
+    """
+    lexer = nuevo_lexer()
+    if errores is not None:
+        def error(t):
+            errores.append(f"Caracter ilegal '{t.value[0]}' en la línea {t.lexer.lineno}")
+            t.lexer.skip(1)
+        lexer.lexerrorf = error
+
+    base = 0
+    pendiente = ""
+    bloques = iter(bloques)
+    final = False
+    while not final:
+        bloque = next(bloques, None)
+        if bloque is None:
+            final = True
+            corte = len(pendiente)
+        else:
+            pendiente += bloque
+            corte = pendiente.rfind("\n") + 1
+            if corte == 0:
+                continue
+        segmento = pendiente[:corte]
+        lexer.input(segmento)
+        while True:
+            tok = lexer.token()
+            if not tok:
+                break
+            if not final and tok.type == 'OPERADOR' and tok.value == '/' and segmento.startswith('*', tok.lexpos + 1):
+                # El comentario puede cerrarse en un bloque posterior: se retoma desde aquí
+                corte = tok.lexpos
+                break
+            if reservadas is None or (tok.type in TIPOS_RESERVADOS) == reservadas:
+                yield RegistroToken(tok.type, tok.value, tok.lineno, base + tok.lexpos)
+        base += corte
+        pendiente = pendiente[corte:]
+
+
+def tokenizar(codigo, reservadas=None, errores=None):
+    """Genera los tokens de un texto ya cargado en memoria"""
+    return tokenizar_bloques((codigo,), reservadas, errores)
+
+
+def bloques_archivo(ruta, tamano_bloque=TAMANO_BLOQUE):
+    """Lee un archivo UTF-8 en bloques de texto a través de un mapeo en memoria"""
+    with open(ruta, "rb") as archivo:
+        if archivo.seek(0, 2) == 0:
+            return
+        with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            # El decodificador incremental no parte caracteres de varios bytes
+            decodificador = codecs.getincrementaldecoder("utf-8")()
+            for inicio in range(0, len(datos), tamano_bloque):
+                yield decodificador.decode(datos[inicio:inicio + tamano_bloque])
+            yield decodificador.decode(b"", final=True)
+
+
+def tokenizar_archivo(ruta, reservadas=None, errores=None, tamano_bloque=TAMANO_BLOQUE):
+    """Genera los tokens de un archivo sin cargarlo completo en memoria"""
+    return tokenizar_bloques(bloques_archivo(ruta, tamano_bloque), reservadas, errores)
+
+
 def analisis(input_code):
     errores = []
-    analizador.input(input_code)
     tokens_generados = []
     palabras_reservadas_detectadas = []
-    while True:
-        tok = analizador.token()
-        if not tok:
-            break
-        tokens_str = f"LexToken({tok.type}, '{tok.value}', {tok.lineno}, {tok.lexpos})"
-        if tok.type in palabras_reservadas.values():
-            palabras_reservadas_detectadas.append(tokens_str)
+    for registro in tokenizar(input_code):
+        if registro.reservada:
+            palabras_reservadas_detectadas.append(str(registro))
         else:
-            tokens_generados.append(tokens_str)
-    return tokens_generados, palabras_reservadas_detectadas, errores
\ No newline at end of file
+            tokens_generados.append(str(registro))
+    return tokens_generados, palabras_reservadas_detectadas, errores
@@ -1,242 +1,543 @@
+import itertools
+import os
+import queue
+import threading
+import time
+import traceback
 import tkinter as tk
 from tkinter import filedialog, scrolledtext, ttk
-from lexico import analisis
-from analizador_sintactico import analizar_sintaxis
-from analizador_semantico import analizar_programa
+from compilacion import Compilacion
+from analisis_incremental import AnalizadorIncremental
+from analizador_semantico import Interprete, EjecucionCancelada
+from nodos_ast import Nodo
+from tabla_simbolos import TablaSimbolos
+from visualizacion_ast import construir_arbol, distribuir, escribir_arbol
 import matplotlib.pyplot as plt
 import networkx as nx
-import uuid
 
-def formatear_ast(ast, nivel=0):
-    resultado = ""
-    if isinstance(ast, dict):
-        indent = "  " * nivel
-        resultado += f"{indent}{ast.get('tipo', 'nodo')}\n"
-        for clave, valor in ast.items():
-            if clave != "tipo":
-                resultado += f"{indent}  {clave}:\n"
-                resultado += formatear_ast(valor, nivel + 2)
-    elif isinstance(ast, list):
-        for elemento in ast:
-            resultado += formatear_ast(elemento, nivel)
-    else:
+def lineas_ast(ast, nivel=0):
+    """Genera el texto del AST línea por línea, sin recursión ni concatenaciones"""
+    pendientes = [(ast, nivel)]
+    while pendientes:
+        elemento = pendientes.pop()
+        if isinstance(elemento, str):
+            yield elemento
+            continue
+        valor, nivel = elemento
         indent = "  " * nivel
-        resultado += f"{indent}{ast}\n"
-    return resultado
+        if isinstance(valor, Nodo):
+            yield f"{indent}{valor.tipo}\n"
+            hijos = []
+            for clave, hijo in valor.items():
+                if clave != "tipo":
+                    hijos.append(f"{indent}  {clave}:\n")
+                    hijos.append((hijo, nivel + 2))
+            pendientes.extend(reversed(hijos))
+        elif isinstance(valor, list):
+            pendientes.extend((hijo, nivel) for hijo in reversed(valor))
+        else:
+            yield f"{indent}{valor}\n"
 
 
-def ast_to_graph(ast, graph=None, parent=None):
-    if graph is None:
-        graph = nx.DiGraph()
+def formatear_ast(ast, nivel=0):
+    return "".join(lineas_ast(ast, nivel))
+
+
+class SalidaPaginada:
+    """Muestra un flujo de líneas en un ScrolledText por partes.
+
+    Solo se inserta la primera parte; las siguientes se generan y se insertan
+    cuando la vista se acerca al final, así el texto de un archivo enorme no
+    se arma completo ni llena el widget de una sola vez.
+    """
+    def __init__(self, texto, lineas_por_parte=500):
+        self.texto = texto
+        self.lineas_por_parte = lineas_por_parte
+        self.pendientes = None
+        self.carga_programada = False
+        texto.configure(yscrollcommand=self.desplazado)
+
+    def desplazado(self, primero, ultimo):
+        self.texto.vbar.set(primero, ultimo)
+        if self.pendientes is not None and float(ultimo) >= 0.95 and not self.carga_programada:
+            self.carga_programada = True
+            self.texto.after_idle(self.cargar_parte)
+
+    def limpiar(self):
+        self.pendientes = None
+        self.texto.delete("1.0", tk.END)
+
+    def agregar(self, lineas):
+        """Agrega líneas (con su salto de línea) después de las que quedan por mostrar"""
+        lineas = iter(lineas)
+        if self.pendientes is None:
+            self.pendientes = lineas
+            self.cargar_parte()
+        else:
+            self.pendientes = itertools.chain(self.pendientes, lineas)
+
+    def cargar_parte(self):
+        self.carga_programada = False
+        if self.pendientes is None:
+            return
+        parte = list(itertools.islice(self.pendientes, self.lineas_por_parte))
+        if len(parte) < self.lineas_por_parte:
+            self.pendientes = None
+        if parte:
+            self.texto.insert(tk.END, "".join(parte))
 
-    node_id = str(uuid.uuid4())
-    label = ast.get("tipo", "nodo") if isinstance(ast, dict) else str(ast)
-    graph.add_node(node_id, label=label)
 
-    if parent:
-        graph.add_edge(parent, node_id)
+def ast_to_graph(ast, profundidad_maxima=None, colapsados=()):
+    """Grafo de networkx del AST con identificadores enteros (ver visualizacion_ast)"""
+    return grafo_de_arbol(construir_arbol(ast, profundidad_maxima, colapsados))
 
-    if isinstance(ast, dict):
-        for key, value in ast.items():
-            if key != "tipo":
-                ast_to_graph(value, graph, node_id)
-    elif isinstance(ast, list):
-        for item in ast:
-            ast_to_graph(item, graph, node_id)
 
+def grafo_de_arbol(arbol):
+    graph = nx.DiGraph()
+    graph.add_nodes_from((identificador, {"label": etiqueta}) for identificador, etiqueta in enumerate(arbol.etiquetas))
+    graph.add_edges_from(arbol.aristas())
     return graph
 
-def draw_ast(ast):
-    graph = ast_to_graph(ast)
-    pos = hierarchy_pos(graph, vert_gap=0.5) 
 
+# Con más nodos que este límite el AST se exporta a SVG en lugar de dibujarse con matplotlib
+LIMITE_NODOS_MATPLOTLIB = 300
+FORMATOS_TEXTO = (".svg", ".dot")
 
+
+def draw_ast(ast, ruta="ast.png", profundidad_maxima=None, colapsados=()):
+    """Dibuja el AST en ruta y devuelve la ruta escrita (SVG si el árbol es grande)"""
+    arbol = construir_arbol(ast, profundidad_maxima, colapsados)
+    if len(arbol) > LIMITE_NODOS_MATPLOTLIB or ruta.lower().endswith(FORMATOS_TEXTO):
+        if not ruta.lower().endswith(FORMATOS_TEXTO):
+            ruta = os.path.splitext(ruta)[0] + ".svg"
+        escribir_arbol(arbol, ruta)
+        return ruta
+
+    graph = grafo_de_arbol(arbol)
+    pos = dict(enumerate(distribuir(arbol)))
     labels = nx.get_node_attributes(graph, 'label')
 
-    plt.figure(figsize=(18, 12))
+    # El tamaño de la figura crece con las hojas y la profundidad del árbol
+    ancho = max(8, (max(x for x, _ in pos.values()) + 0.5) * 1.2)
+    alto = max(6, max(-y for _, y in pos.values()) + 1)
+    plt.figure(figsize=(ancho, alto))
     nx.draw(graph, pos, with_labels=True, labels=labels, node_size=3000, node_color="#a6cee3", font_size=9, font_family="monospace", font_weight="bold", arrows=False)
     plt.title("Árbol de Sintaxis Abstracta (AST)", fontsize=14)
     plt.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
-    plt.savefig("ast.png")
+    plt.savefig(ruta)
     plt.close()
+    return ruta
+
+
+# Filas de la tabla de símbolos que se insertan de una vez al expandir o al desplazarse
+FILAS_POR_PARTE = 200
+# Espera tras cada tecla antes de filtrar la tabla de símbolos, en milisegundos
+ESPERA_BUSQUEDA = 150
+NOMBRES_AMBITO = {"global": "Global", "funcion": "Local", "bloque": "Bloque"}
+
+
+class VistaSimbolos:
+    """Treeview de una TablaSimbolos que inserta las filas cuando se necesitan.
+
+    Cada ámbito se inserta cerrado; sus símbolos y ámbitos hijos se agregan al
+    expandirlo, de a FILAS_POR_PARTE, y una fila "… más" trae la parte
+    siguiente al seleccionarla o al llegar a ella con el scroll. La búsqueda
+    recorre el índice de nombres de la tabla en lugar de las filas.
+    """
+    def __init__(self, arbol, barra, tabla):
+        self.arbol = arbol
+        self.barra = barra
+        self.tabla = tabla
+        # Fila "… más" -> (fila padre, filas que faltan insertar)
+        self.pendientes = {}
+        # Fila de un ámbito todavía sin expandir -> ámbito
+        self.ambitos = {}
+        self.carga_programada = False
+        arbol.configure(yscrollcommand=self.desplazado)
+        arbol.bind("<<TreeviewOpen>>", self.expandido)
+        arbol.bind("<<TreeviewSelect>>", self.seleccionado)
+        self.mostrar_ambitos()
+
+    def limpiar(self):
+        self.arbol.delete(*self.arbol.get_children())
+        self.pendientes.clear()
+        self.ambitos.clear()
+
+    def mostrar_ambitos(self):
+        self.limpiar()
+        self.insertar_parte("", self.filas_ambito(self.tabla.global_))
+
+    def buscar(self, texto):
+        texto = texto.strip()
+        if not texto:
+            self.mostrar_ambitos()
+            return
+        self.limpiar()
+        self.insertar_parte("", (self.fila_simbolo(simbolo) for simbolo in self.tabla.buscar(texto)))
+
+    def fila_simbolo(self, simbolo):
+        valores = (NOMBRES_AMBITO[simbolo.ambito.clase], simbolo.tipo, str(simbolo.valor),
+                   simbolo.funcion or "-", simbolo.linea or "-", len(simbolo.usos))
+        return simbolo.nombre, valores, None
+
+    def filas_ambito(self, ambito):
+        """(texto, valores, ámbito a expandir) de los símbolos y los ámbitos hijos de ambito"""
+        if ambito.clase != "global":
+            for simbolo in ambito.simbolos.values():
+                yield self.fila_simbolo(simbolo)
+        for hijo in ambito.hijos:
+            if hijo.clase == "funcion":
+                funcion = self.tabla.global_.simbolos.get(hijo.nombre)
+                usos = len(funcion.usos) if funcion is not None else 0
+                yield hijo.nombre, ("Función", "funcion", "-", "-", hijo.linea or "-", usos), hijo
+            else:
+                yield f"[{hijo.nombre}]", ("Bloque", "", "", hijo.funcion, hijo.linea or "", ""), hijo
+
+    def insertar_parte(self, padre, filas):
+        filas = iter(filas)
+        parte = list(itertools.islice(filas, FILAS_POR_PARTE + 1))
+        for texto, valores, ambito in parte[:FILAS_POR_PARTE]:
+            fila = self.arbol.insert(padre, tk.END, text=texto, values=valores)
+            if ambito is not None and (ambito.simbolos or ambito.hijos):
+                # Fila vacía para que el ámbito se pueda expandir antes de insertar su contenido
+                self.arbol.insert(fila, tk.END, text="")
+                self.ambitos[fila] = ambito
+        if len(parte) > FILAS_POR_PARTE:
+            mas = self.arbol.insert(padre, tk.END, text="… más")
+            self.pendientes[mas] = (padre, itertools.chain(parte[FILAS_POR_PARTE:], filas))
+        self.barra.set(*self.arbol.yview())
+
+    def cargar_mas(self, fila):
+        padre, filas = self.pendientes.pop(fila)
+        self.arbol.delete(fila)
+        self.insertar_parte(padre, filas)
+
+    def expandido(self, evento=None):
+        fila = self.arbol.focus()
+        ambito = self.ambitos.pop(fila, None)
+        if ambito is not None:
+            self.arbol.delete(*self.arbol.get_children(fila))
+            self.insertar_parte(fila, self.filas_ambito(ambito))
+
+    def seleccionado(self, evento=None):
+        for fila in self.arbol.selection():
+            if fila in self.pendientes:
+                self.cargar_mas(fila)
+
+    def desplazado(self, primero, ultimo):
+        self.barra.set(primero, ultimo)
+        if self.pendientes and float(ultimo) >= 0.95 and not self.carga_programada:
+            self.carga_programada = True
+            self.arbol.after_idle(self.cargar_visibles)
+
+    def cargar_visibles(self):
+        self.carga_programada = False
+        for fila in list(self.pendientes):
+            # bbox está vacío para las filas fuera de la vista o dentro de un ámbito cerrado
+            if fila in self.pendientes and self.arbol.bbox(fila):
+                self.cargar_mas(fila)
 
 
 def mostrar_tabla_simbolos(resultado_semantico):
+    tabla_ambitos = resultado_semantico.get("tabla_ambitos")
+    if tabla_ambitos is None:
+        # Los resultados con error de sintaxis no traen tabla
+        tabla_ambitos = TablaSimbolos()
+
     # Crear una nueva ventana para la tabla
     ventana_tabla = tk.Toplevel(root)
     ventana_tabla.title("Tabla de Símbolos Completa")
     ventana_tabla.geometry("1000x600")
-    
+
+    # Búsqueda por nombre
+    frame_busqueda = ttk.Frame(ventana_tabla)
+    frame_busqueda.pack(fill=tk.X, padx=10, pady=(10, 0))
+    ttk.Label(frame_busqueda, text="Buscar:").pack(side=tk.LEFT)
+    texto_busqueda = tk.StringVar()
+    entrada_busqueda = ttk.Entry(frame_busqueda, textvariable=texto_busqueda, width=30)
+    entrada_busqueda.pack(side=tk.LEFT, padx=5)
+    ttk.Label(frame_busqueda, text=f"{len(tabla_ambitos)} símbolos").pack(side=tk.LEFT, padx=10)
+
     # Crear un Frame para la tabla
     frame_tabla = ttk.Frame(ventana_tabla)
     frame_tabla.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-    
 
     tabla = ttk.Treeview(frame_tabla)
-    tabla["columns"] = ("ambito", "tipo", "valor", "funcion")
-    tabla.column("#0", width=150, minwidth=120)
-    tabla.column("ambito", width=100, minwidth=80)
-    tabla.column("tipo", width=100, minwidth=80)
+    tabla["columns"] = ("ambito", "tipo", "valor", "funcion", "linea", "usos")
+    tabla.column("#0", width=180, minwidth=120)
+    tabla.column("ambito", width=90, minwidth=70)
+    tabla.column("tipo", width=90, minwidth=70)
     tabla.column("valor", width=200, minwidth=120)
     tabla.column("funcion", width=150, minwidth=100)
-    
-    tabla.heading("#0", text="Variable", anchor=tk.W)
+    tabla.column("linea", width=60, minwidth=50)
+    tabla.column("usos", width=60, minwidth=50)
+
+    tabla.heading("#0", text="Nombre", anchor=tk.W)
     tabla.heading("ambito", text="Ámbito", anchor=tk.W)
     tabla.heading("tipo", text="Tipo", anchor=tk.W)
     tabla.heading("valor", text="Valor", anchor=tk.W)
     tabla.heading("funcion", text="Función", anchor=tk.W)
-    
+    tabla.heading("linea", text="Línea", anchor=tk.W)
+    tabla.heading("usos", text="Usos", anchor=tk.W)
+
     # Añadir scrollbars
     vsb = ttk.Scrollbar(frame_tabla, orient="vertical", command=tabla.yview)
     hsb = ttk.Scrollbar(frame_tabla, orient="horizontal", command=tabla.xview)
-    tabla.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-    
+    tabla.configure(xscrollcommand=hsb.set)
+
     # Posicionamiento del grid
     tabla.grid(column=0, row=0, sticky='nsew')
     vsb.grid(column=1, row=0, sticky='ns')
     hsb.grid(column=0, row=1, sticky='ew')
-    
+
     frame_tabla.grid_columnconfigure(0, weight=1)
     frame_tabla.grid_rowconfigure(0, weight=1)
-    
-
-    def agregar_variables(variables, ambito, funcion="", linea=0):
-        if variables:
-            for var, info in variables.items():
-                tipo = info.get("tipo", "desconocido")
-                valor = str(info.get("valor", "No inicializado"))
-                tabla.insert("", tk.END, text=var, 
-                            values=(ambito, tipo, valor, funcion, linea))
-
-
-    if "ast" in resultado_semantico and "funciones" in resultado_semantico["ast"]:
-        for funcion in resultado_semantico["ast"]["funciones"]:
-            nombre_func = funcion.get("nombre", "")
-            
-           
-            tabla.insert("", tk.END, text=nombre_func, 
-                        values=("Función", "function", "-", "-", "-"))
-            
-           
-            variables_locales = {}
-            for inst in funcion.get("instrucciones", []):
-                if isinstance(inst, dict) and inst.get("tipo") == "declaracion_variable":
-                    nombre_var = inst.get("nombre", "")
-                    tipo = "any"  
-                    valor = "No inicializado"
-                    
-                   
-                    if inst.get("valor") is not None:
-                        if isinstance(inst["valor"], dict):
-                            tipo = inst["valor"].get("tipo", "any")
-                            valor = inst["valor"].get("valor", "No inicializado")
-                    
-                    variables_locales[nombre_var] = {"tipo": tipo, "valor": valor}
-            
-            # Añadir las variables encontradas
-            if variables_locales:
-                agregar_variables(variables_locales, "Local", nombre_func)
-    
+
+    vista = VistaSimbolos(tabla, vsb, tabla_ambitos)
+
+    # El filtro se aplica cuando se deja de escribir
+    busqueda_programada = [None]
+
+    def busqueda_cambiada(*_):
+        if busqueda_programada[0] is not None:
+            ventana_tabla.after_cancel(busqueda_programada[0])
+        busqueda_programada[0] = ventana_tabla.after(
+            ESPERA_BUSQUEDA, lambda: vista.buscar(texto_busqueda.get()))
+
+    texto_busqueda.trace_add("write", busqueda_cambiada)
+
     # Añadir botones adicionales
     frame_botones = ttk.Frame(ventana_tabla)
     frame_botones.pack(pady=10)
-    
+
     btn_cerrar = ttk.Button(frame_botones, text="Cerrar", command=ventana_tabla.destroy)
     btn_cerrar.pack(side=tk.LEFT, padx=5)
+    return vista
 
 
-def hierarchy_pos(G, root=None, width=1.0, vert_gap=0.2, vert_loc=0, xcenter=0.5):
-    if not nx.is_tree(G):
-        raise TypeError('cannot use hierarchy_pos on a graph that is not a tree')
+tabla_simbolos_btn = None
+ultimo_resultado_semantico = None
+# Reutiliza el análisis de las funciones que no cambiaron entre clics de "Analizar"
+analizador_incremental = AnalizadorIncremental()
+# El análisis incremental guarda estado entre llamadas: un solo hilo a la vez
+bloqueo_incremental = threading.Lock()
+
+# Tarea en segundo plano actual y mensajes que deja para la interfaz
+tarea_actual = None
+cola_mensajes = queue.Queue()
+INTERVALO_MENSAJES = 50
+
+
+class TareaAnalisis(threading.Thread):
+    """Analiza (y opcionalmente ejecuta) el código fuera del hilo de Tkinter.
+
+    La tarea no toca los widgets: deja cada resultado en cola_mensajes y
+    revisar_mensajes lo aplica desde el hilo principal con root.after. La
+    cancelación se revisa entre fases y en cada ciclo de Interprete; los
+    mensajes de una tarea cancelada se descartan.
+    """
+    def __init__(self, codigo, ejecutar=False):
+        super().__init__(daemon=True)
+        self.codigo = codigo
+        self.ejecutar = ejecutar
+        self.cancelada = threading.Event()
+        self.interprete = None
+        self.compilacion = None
+        self.tiempos = {}
+
+    def cancelar(self):
+        self.cancelada.set()
+        if self.interprete is not None:
+            self.interprete.cancelar()
+
+    def publicar(self, *mensaje):
+        cola_mensajes.put((self,) + mensaje)
+
+    def fase(self, nombre, funcion):
+        """Ejecuta una fase midiendo su duración, salvo que la tarea esté cancelada"""
+        if self.cancelada.is_set():
+            raise EjecucionCancelada("Análisis cancelado")
+        self.publicar("fase", nombre)
+        inicio = time.perf_counter()
+        try:
+            return funcion()
+        finally:
+            self.tiempos[nombre] = time.perf_counter() - inicio
+
+    def run(self):
+        try:
+            # Una sola tokenización compartida por las vistas léxica y sintáctica
+            compilacion = self.compilacion = Compilacion(self.codigo)
+            self.fase("léxico", lambda: compilacion.tokens)
+            self.publicar("tokens", compilacion)
+
+            try:
+                self.publicar("sintactico", self.fase("sintáctico", compilacion.vista_sintactica))
+            except EjecucionCancelada:
+                raise
+            except Exception as e:
+                self.publicar("error_sintactico", str(e))
+
+            try:
+                resultado_semantico = self.fase("semántico", self.analizar_semantica)
+                self.publicar("semantico", resultado_semantico)
+            except EjecucionCancelada:
+                raise
+            except Exception as e:
+                self.publicar("error_semantico", str(e), traceback.format_exc())
+                resultado_semantico = None
+
+            if self.ejecutar and resultado_semantico is not None and resultado_semantico["exito"]:
+                self.interprete = Interprete(debug=False)
+                if self.cancelada.is_set():
+                    self.interprete.cancelar()
+                ejecucion = self.fase("ejecución", lambda: self.interprete.ejecutar_analisis(resultado_semantico))
+                self.publicar("ejecucion", ejecucion)
+        except EjecucionCancelada:
+            return
+        self.publicar("fin")
+
+    def analizar_semantica(self):
+        with bloqueo_incremental:
+            # Las funciones que cambiaron (o el programa entero) se parsean con los tokens compartidos
+            return analizador_incremental.analizar(self.codigo, self.compilacion)
+
+
+def texto_tiempos(tiempos):
+    return " | ".join(f"{fase}: {duracion:.3f} s" for fase, duracion in tiempos.items())
+
+
+def mostrar_estado(texto, tiempos):
+    if tiempos:
+        texto = f"{texto} — {texto_tiempos(tiempos)}"
+    barra_estado.config(text=texto)
+
+
+def mostrar_tokens(compilacion):
+    # El texto de cada token se genera a medida que se muestra
+    pagina_tokens.agregar(f"{linea}\n" for linea in compilacion.lineas_tokens(reservadas=False))
+    pagina_palabras.agregar(f"{linea}\n" for linea in compilacion.lineas_tokens(reservadas=True))
+    pagina_errores.agregar(f"{error}\n" for error in compilacion.errores_lexicos)
+
+
+def mostrar_sintactico(resultado_sintactico, errores_sintacticos):
+    if errores_sintacticos:
+        pagina_sintactico.agregar(f"Error: {error}\n" for error in errores_sintacticos)
+    else:
+        pagina_sintactico.agregar(f"Regla aplicada: {regla}\n" for regla in resultado_sintactico)
 
-    if root is None:
-        root = list(G.nodes)[0]
 
-    def _hierarchy_pos(G, root, left, right, vert_loc, xcenter, pos=None, parent=None):
-        if pos is None:
-            pos = {}
-        pos[root] = (xcenter, vert_loc)
-        neighbors = list(G.successors(root))
-        if neighbors:
-            dx = (right - left) / len(neighbors)
-            next_x = left + dx / 2
-            for neighbor in neighbors:
-                pos = _hierarchy_pos(G, neighbor, next_x - dx / 2, next_x + dx / 2, vert_loc - vert_gap, next_x, pos, root)
-                next_x += dx
-        return pos
+def mostrar_semantico(resultado_semantico):
+    global tabla_simbolos_btn, ultimo_resultado_semantico
+    ultimo_resultado_semantico = resultado_semantico
 
-    return _hierarchy_pos(G, root, 0, width, vert_loc, xcenter)
+    if not resultado_semantico["exito"]:
+        pagina_semantico.agregar(["=== ERRORES SEMÁNTICOS ===\n"])
+        if "errores" in resultado_semantico and resultado_semantico["errores"]:
+            pagina_semantico.agregar(f"• {error}\n" for error in resultado_semantico["errores"])
+        else:
+            mensaje_error = resultado_semantico.get('mensaje', 'Error desconocido')
+            error_tipo = resultado_semantico.get('error_tipo', 'desconocido')
+            pagina_semantico.agregar([f"Error {error_tipo}: {mensaje_error}\n"])
+    else:
+        pagina_semantico.agregar(["=== ANÁLISIS SEMÁNTICO CORRECTO ===\n"])
 
+        if tabla_simbolos_btn is None:
+            tabla_simbolos_btn = ttk.Button(frame_semantico, text="Ver Tabla de Símbolos",
+                                           command=lambda: mostrar_tabla_simbolos(resultado_semantico))
+        else:
+            tabla_simbolos_btn.config(command=lambda: mostrar_tabla_simbolos(resultado_semantico))
+
+        tabla_simbolos_btn.pack(pady=5)
+
+        pagina_semantico.agregar(["\n=== ÁRBOL DE SINTAXIS ===\n"])
+        pagina_semantico.agregar(lineas_ast(resultado_semantico["ast"]))
+
+
+def mostrar_ejecucion(resultado_ejecucion):
+    # Pestaña propia: el AST de la pestaña semántica se sigue cargando por partes al desplazarse
+    pagina_ejecucion.agregar(["=== EJECUCIÓN ===\n"])
+    pagina_ejecucion.agregar(f">>> {salida}\n" for salida in resultado_ejecucion.get("salidas", []))
+    if not resultado_ejecucion["exito"]:
+        pagina_ejecucion.agregar([f"{resultado_ejecucion['error']}\n"])
+    notebook.select(frame_ejecucion)
+
+
+def aplicar_mensaje(tarea, tipo, datos):
+    """Actualiza los widgets con un mensaje de la tarea (hilo principal)"""
+    global tarea_actual
+    if tipo == "fase":
+        mostrar_estado(f"Análisis {datos[0]}...", tarea.tiempos)
+    elif tipo == "tokens":
+        mostrar_tokens(datos[0])
+    elif tipo == "sintactico":
+        mostrar_sintactico(*datos[0])
+    elif tipo == "error_sintactico":
+        pagina_sintactico.agregar([f"Error: {datos[0]}\n"])
+    elif tipo == "semantico":
+        mostrar_semantico(datos[0])
+    elif tipo == "error_semantico":
+        pagina_semantico.agregar([f"Error en análisis semántico: {datos[0]}\n", f"\nDetalles:\n{datos[1]}"])
+    elif tipo == "ejecucion":
+        mostrar_ejecucion(datos[0])
+    elif tipo == "fin":
+        tarea_actual = None
+        btn_cancelar.config(state=tk.DISABLED)
+        mostrar_estado("Listo", tarea.tiempos)
+
+
+def revisar_mensajes():
+    """Aplica los mensajes pendientes de la tarea actual y se vuelve a programar"""
+    try:
+        while True:
+            tarea, tipo, *datos = cola_mensajes.get_nowait()
+            if tarea is tarea_actual:
+                aplicar_mensaje(tarea, tipo, datos)
+    except queue.Empty:
+        pass
+    root.after(INTERVALO_MENSAJES, revisar_mensajes)
 
-tabla_simbolos_btn = None
-ultimo_resultado_semantico = None
 
-# === Análisis principal ===
-def analizar_codigo():
-    global tabla_simbolos_btn, ultimo_resultado_semantico
-    
-    codigo = entrada_texto.get("1.0", tk.END).strip()
+def limpiar_salidas():
+    for pagina in (pagina_tokens, pagina_palabras, pagina_errores, pagina_sintactico, pagina_semantico,
+                   pagina_ejecucion):
+        pagina.limpiar()
 
-    salida_tokens.delete("1.0", tk.END)
-    salida_palabras.delete("1.0", tk.END)
-    salida_errores.delete("1.0", tk.END)
-    salida_sintactico.delete("1.0", tk.END)
-    salida_semantico.delete("1.0", tk.END)
-    
-   
+    # Ocultar el botón si existe
     if tabla_simbolos_btn is not None:
         tabla_simbolos_btn.pack_forget()
 
-    tokens_detectados, palabras_reservadas_detectadas, errores_detectados = analisis(codigo)
 
-    salida_tokens.insert(tk.END, "\n".join(tokens_detectados))
-    salida_palabras.insert(tk.END, "\n".join(palabras_reservadas_detectadas))
-    salida_errores.insert(tk.END, "\n".join(errores_detectados))
+# === Análisis principal ===
+def analizar_codigo(ejecutar=False):
+    global tarea_actual
 
-    try:
-        resultado_sintactico, errores_sintacticos = analizar_sintaxis(codigo)
+    codigo = entrada_texto.get("1.0", tk.END).strip()
 
-        if errores_sintacticos:
-            for error in errores_sintacticos:
-                salida_sintactico.insert(tk.END, f"Error: {error}\n")
-        else:
-            for regla in resultado_sintactico:
-                salida_sintactico.insert(tk.END, f"Regla aplicada: {regla}\n")
-    except Exception as e:
-        salida_sintactico.insert(tk.END, f"Error: {str(e)}\n")
+    # Un nuevo análisis reemplaza al que esté en curso
+    if tarea_actual is not None:
+        tarea_actual.cancelar()
+    limpiar_salidas()
 
-    try:
-        resultado_semantico = analizar_programa(codigo)
-        ultimo_resultado_semantico = resultado_semantico 
-
-        if not resultado_semantico["exito"]:
-            salida_semantico.insert(tk.END, "=== ERRORES SEMÁNTICOS ===\n")
-            if "errores" in resultado_semantico and resultado_semantico["errores"]:
-                for error in resultado_semantico["errores"]:
-                    salida_semantico.insert(tk.END, f"• {error}\n")
-            else:
-                mensaje_error = resultado_semantico.get('mensaje', 'Error desconocido')
-                error_tipo = resultado_semantico.get('error_tipo', 'desconocido')
-                salida_semantico.insert(tk.END, f"Error {error_tipo}: {mensaje_error}\n")
-        else:
-            salida_semantico.insert(tk.END, "=== ANÁLISIS SEMÁNTICO CORRECTO ===\n")
+    tarea_actual = TareaAnalisis(codigo, ejecutar)
+    btn_cancelar.config(state=tk.NORMAL)
+    barra_estado.config(text="Analizando...")
+    tarea_actual.start()
 
-           
-            if tabla_simbolos_btn is None:
-                tabla_simbolos_btn = ttk.Button(frame_semantico, text="Ver Tabla de Símbolos", 
-                                               command=lambda: mostrar_tabla_simbolos(resultado_semantico))
-            else:
-                tabla_simbolos_btn.config(command=lambda: mostrar_tabla_simbolos(resultado_semantico))
-            
-            tabla_simbolos_btn.pack(pady=5)
-
-            salida_semantico.insert(tk.END, "\n=== ÁRBOL DE SINTAXIS ===\n")
-            ast_formateado = formatear_ast(resultado_semantico["ast"])
-            salida_semantico.insert(tk.END, ast_formateado)
-    except Exception as e:
-        salida_semantico.insert(tk.END, f"Error en análisis semántico: {str(e)}\n")
-        import traceback
-        salida_semantico.insert(tk.END, f"\nDetalles:\n{traceback.format_exc()}")
+
+def ejecutar_codigo():
+    analizar_codigo(ejecutar=True)
+
+
+def cancelar_analisis():
+    global tarea_actual
+    if tarea_actual is None:
+        return
+    tarea = tarea_actual
+    tarea.cancelar()
+    tarea_actual = None
+    btn_cancelar.config(state=tk.DISABLED)
+    mostrar_estado("Cancelado", tarea.tiempos)
 
 def cargar_archivo():
     archivo = filedialog.askopenfilename(filetypes=[("Archivos de texto", "*.txt")])
@@ -249,18 +550,10 @@ def limpiar_entrada():
     entrada_texto.delete("1.0", tk.END)
 
 def limpiar_todo():
-    global tabla_simbolos_btn
-    
+    cancelar_analisis()
     entrada_texto.delete("1.0", tk.END)
-    salida_tokens.delete("1.0", tk.END)
-    salida_palabras.delete("1.0", tk.END)
-    salida_errores.delete("1.0", tk.END)
-    salida_sintactico.delete("1.0", tk.END)
-    salida_semantico.delete("1.0", tk.END)
-    
-    # Ocultar el botón si existe
-    if tabla_simbolos_btn is not None:
-        tabla_simbolos_btn.pack_forget()
+    limpiar_salidas()
+    barra_estado.config(text="Listo")
 
 # ==== Interfaz Tkinter ====
 root = tk.Tk()
@@ -282,6 +575,12 @@ btn_limpiar_todo.pack(side=tk.LEFT, padx=5)
 btn_analizar = tk.Button(frame_botones, text="Analizar", command=analizar_codigo, bg="#4CAF50", fg="white")
 btn_analizar.pack(side=tk.LEFT, padx=5)
 
+btn_ejecutar = tk.Button(frame_botones, text="Ejecutar", command=ejecutar_codigo)
+btn_ejecutar.pack(side=tk.LEFT, padx=5)
+
+btn_cancelar = tk.Button(frame_botones, text="Cancelar", command=cancelar_analisis, state=tk.DISABLED)
+btn_cancelar.pack(side=tk.LEFT, padx=5)
+
 frame_principal = tk.Frame(root)
 frame_principal.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
@@ -302,12 +601,14 @@ frame_palabras = tk.Frame(notebook)
 frame_errores = tk.Frame(notebook)
 frame_sintactico = tk.Frame(notebook)
 frame_semantico = tk.Frame(notebook)
+frame_ejecucion = tk.Frame(notebook)
 
 notebook.add(frame_tokens, text="Tokens")
 notebook.add(frame_palabras, text="Palabras Reservadas")
 notebook.add(frame_errores, text="Errores Léxicos")
 notebook.add(frame_sintactico, text="Análisis Sintáctico")
 notebook.add(frame_semantico, text="Análisis Semántico")
+notebook.add(frame_ejecucion, text="Ejecución")
 
 salida_tokens = scrolledtext.ScrolledText(frame_tokens, height=10, wrap=tk.WORD)
 salida_tokens.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
@@ -324,7 +625,19 @@ salida_sintactico.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
 salida_semantico = scrolledtext.ScrolledText(frame_semantico, height=10, wrap=tk.WORD, font=("Courier", 10))
 salida_semantico.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
 
+salida_ejecucion = scrolledtext.ScrolledText(frame_ejecucion, height=10, wrap=tk.WORD, font=("Courier", 10))
+salida_ejecucion.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
+
+# Las salidas se muestran por partes a medida que se desplazan
+pagina_tokens = SalidaPaginada(salida_tokens)
+pagina_palabras = SalidaPaginada(salida_palabras)
+pagina_errores = SalidaPaginada(salida_errores)
+pagina_sintactico = SalidaPaginada(salida_sintactico)
+pagina_semantico = SalidaPaginada(salida_semantico)
+pagina_ejecucion = SalidaPaginada(salida_ejecucion)
+
 barra_estado = tk.Label(root, text="Listo", bd=1, relief=tk.SUNKEN, anchor=tk.W)
 barra_estado.pack(side=tk.BOTTOM, fill=tk.X)
 
+root.after(INTERVALO_MENSAJES, revisar_mensajes)
 root.mainloop()
\ No newline at end of file
@@ -0,0 +1,407 @@
+import operator
+from array import array
+
+from analizador_semantico import analizar_programa
+from nodos_ast import Nodo
+
+
+# Códigos de operación. Cada instrucción ocupa tres enteros: operación y dos argumentos
+CONSTANTE = 0
+CARGAR = 1
+GUARDAR = 2
+SALTAR = 3
+SALTAR_SI_FALSO = 4
+BINARIA = 5
+BINARIA_VARIABLE = 6
+BINARIA_CONSTANTE = 7
+INCREMENTAR = 8
+DECREMENTAR = 9
+ESCRIBIR = 10
+LEER = 11
+LLAMAR = 12
+RETORNAR = 13
+SALTAR_SI = 14
+
+ANCHO_INSTRUCCION = 3
+
+NOMBRES_OPERACIONES = {
+    valor: nombre for nombre, valor in list(globals().items())
+    if nombre.isupper() and isinstance(valor, int) and nombre != "ANCHO_INSTRUCCION"
+}
+
+
+def _dividir(izq, der):
+    return izq / der if der != 0 else 0
+
+
+# Operadores binarios: el índice en FUNCIONES_BINARIAS es el argumento de BINARIA*
+OPERADORES_BINARIOS = ["+", "-", "*", "/", "<", ">", "<=", ">=", "==", "!="]
+FUNCIONES_BINARIAS = [
+    operator.add, operator.sub, operator.mul, _dividir,
+    operator.lt, operator.gt, operator.le, operator.ge, operator.eq, operator.ne,
+]
+INDICES_BINARIOS = {simbolo: indice for indice, simbolo in enumerate(OPERADORES_BINARIOS)}
+
+# Máximo de llamadas anidadas antes de abortar (recursión infinita)
+LIMITE_LLAMADAS = 1000
+
+
+class FuncionBytecode:
+    """Código compilado de una función: instrucciones, constantes y variables locales"""
+    __slots__ = ("nombre", "codigo", "constantes", "variables")
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.codigo = array("i")
+        self.constantes = []
+        self.variables = {}
+
+
+class CompiladorBytecode:
+    """Traduce el AST de ASTBuilder a bytecode de pila"""
+    def __init__(self):
+        self.funciones = []
+        self.indices_funciones = {}
+        self.actual = None
+
+    def compilar(self, ast):
+        """Compila todas las funciones del programa y devuelve la lista de FuncionBytecode"""
+        funciones = ast.funciones if isinstance(ast, Nodo) else []
+        for funcion in funciones:
+            nombre = funcion.nombre
+            if nombre not in self.indices_funciones:
+                self.indices_funciones[nombre] = len(self.funciones)
+                self.funciones.append(FuncionBytecode(nombre))
+        for funcion in funciones:
+            self.actual = self.funciones[self.indices_funciones[funcion.nombre]]
+            for instruccion in funcion.instrucciones:
+                self.compilar_instruccion(instruccion)
+            self.emitir(RETORNAR)
+        return self.funciones
+
+    def emitir(self, operacion, argumento=0, argumento2=0):
+        """Agrega una instrucción y devuelve la posición de su primer argumento"""
+        codigo = self.actual.codigo
+        codigo.append(operacion)
+        codigo.append(argumento)
+        codigo.append(argumento2)
+        return len(codigo) - 2
+
+    def parchear(self, posicion_argumento):
+        """Hace que el salto en posicion_argumento apunte a la instrucción siguiente"""
+        self.actual.codigo[posicion_argumento] = len(self.actual.codigo)
+
+    def parchear_todos(self, posiciones):
+        for posicion in posiciones:
+            self.parchear(posicion)
+
+    def compilar_salto_falso(self, condicion):
+        """Compila condicion con saltos para cuando es falsa; devuelve sus posiciones para parchear.
+
+        Si es verdadera la ejecución sigue en la instrucción siguiente. && y ||
+        se compilan en cortocircuito: el operando derecho no se evalúa cuando
+        el izquierdo ya decide.
+        """
+        if isinstance(condicion, Nodo) and condicion.tipo == "logica":
+            if condicion.operador == "&&":
+                return self.compilar_salto_falso(condicion.izquierda) + self.compilar_salto_falso(condicion.derecha)
+            verdaderos = self.compilar_salto_verdadero(condicion.izquierda)
+            falsos = self.compilar_salto_falso(condicion.derecha)
+            self.parchear_todos(verdaderos)
+            return falsos
+        self.compilar_expresion(condicion)
+        return [self.emitir(SALTAR_SI_FALSO)]
+
+    def compilar_salto_verdadero(self, condicion):
+        """Como compilar_salto_falso, con los saltos para cuando condicion es verdadera"""
+        if isinstance(condicion, Nodo) and condicion.tipo == "logica":
+            if condicion.operador == "||":
+                return self.compilar_salto_verdadero(condicion.izquierda) + self.compilar_salto_verdadero(condicion.derecha)
+            falsos = self.compilar_salto_falso(condicion.izquierda)
+            verdaderos = self.compilar_salto_verdadero(condicion.derecha)
+            self.parchear_todos(falsos)
+            return verdaderos
+        self.compilar_expresion(condicion)
+        return [self.emitir(SALTAR_SI)]
+
+    def constante(self, valor):
+        self.actual.constantes.append(valor)
+        return len(self.actual.constantes) - 1
+
+    def variable(self, nombre):
+        variables = self.actual.variables
+        if nombre not in variables:
+            variables[nombre] = len(variables)
+        return variables[nombre]
+
+    def compilar_bloque(self, instrucciones):
+        if isinstance(instrucciones, list):
+            for instruccion in instrucciones:
+                self.compilar_instruccion(instruccion)
+        else:
+            self.compilar_instruccion(instrucciones)
+
+    def compilar_instruccion(self, nodo):
+        if not isinstance(nodo, Nodo):
+            return
+        tipo_nodo = nodo.tipo
+
+        if tipo_nodo == "declaracion_variable":
+            if nodo.valor is not None:
+                self.compilar_expresion(nodo.valor)
+            else:
+                self.emitir(CONSTANTE, self.constante(0))
+            self.emitir(GUARDAR, self.variable(nodo.nombre))
+
+        elif tipo_nodo == "asignacion":
+            self.compilar_expresion(nodo.valor)
+            self.emitir(GUARDAR, self.variable(nodo.nombre))
+
+        elif tipo_nodo == "llamada_funcion":
+            indice = self.indices_funciones.get(nodo.nombre, -1)
+            self.emitir(LLAMAR, indice)
+
+        elif tipo_nodo == "if":
+            saltos_fin = self.compilar_salto_falso(nodo.condicion)
+            self.compilar_bloque(nodo.cuerpo)
+            self.parchear_todos(saltos_fin)
+
+        elif tipo_nodo == "if_else":
+            saltos_else = self.compilar_salto_falso(nodo.condicion)
+            self.compilar_bloque(nodo.cuerpo_if)
+            salto_fin = self.emitir(SALTAR)
+            self.parchear_todos(saltos_else)
+            self.compilar_bloque(nodo.cuerpo_else)
+            self.parchear(salto_fin)
+
+        elif tipo_nodo == "while":
+            inicio = len(self.actual.codigo)
+            saltos_fin = self.compilar_salto_falso(nodo.condicion)
+            self.compilar_bloque(nodo.cuerpo)
+            self.emitir(SALTAR, inicio)
+            self.parchear_todos(saltos_fin)
+
+        elif tipo_nodo == "for":
+            self.compilar_instruccion(nodo.inicializacion)
+            inicio = len(self.actual.codigo)
+            saltos_fin = self.compilar_salto_falso(nodo.condicion)
+            self.compilar_bloque(nodo.cuerpo)
+            operador = nodo.operador
+            if operador == "++":
+                self.emitir(INCREMENTAR, self.variable(nodo.variable))
+            elif operador == "--":
+                self.emitir(DECREMENTAR, self.variable(nodo.variable))
+            self.emitir(SALTAR, inicio)
+            self.parchear_todos(saltos_fin)
+
+        elif tipo_nodo == "escribir":
+            self.compilar_expresion(nodo.expresion)
+            self.emitir(ESCRIBIR)
+
+        elif tipo_nodo == "leer":
+            self.emitir(LEER, self.variable(nodo.variable))
+
+    def valor_literal(self, expresion):
+        tipo_expr = expresion.tipo
+        if tipo_expr == "entero":
+            return int(expresion.valor)
+        elif tipo_expr == "flotante":
+            return float(expresion.valor)
+        elif tipo_expr == "cadena":
+            return str(expresion.valor)
+        return bool(expresion.valor)
+
+    def compilar_expresion(self, expresion):
+        if not isinstance(expresion, Nodo):
+            self.emitir(CONSTANTE, self.constante(expresion))
+            return
+        tipo_expr = expresion.tipo
+
+        if tipo_expr in ("entero", "flotante", "cadena", "booleano"):
+            self.emitir(CONSTANTE, self.constante(self.valor_literal(expresion)))
+        elif tipo_expr == "variable":
+            self.emitir(CARGAR, self.variable(expresion.nombre))
+        elif tipo_expr in ("operacion", "comparacion"):
+            indice = INDICES_BINARIOS.get(expresion.operador)
+            if indice is None:
+                raise ValueError(f"Operador desconocido: {expresion.operador}")
+            self.compilar_expresion(expresion.izquierda)
+            derecha = expresion.derecha
+            tipo_der = derecha.tipo if isinstance(derecha, Nodo) else None
+            # El operando derecho simple se codifica en la misma instrucción
+            if tipo_der == "variable":
+                self.emitir(BINARIA_VARIABLE, indice, self.variable(derecha.nombre))
+            elif tipo_der in ("entero", "flotante", "cadena", "booleano"):
+                self.emitir(BINARIA_CONSTANTE, indice, self.constante(self.valor_literal(derecha)))
+            else:
+                self.compilar_expresion(derecha)
+                self.emitir(BINARIA, indice)
+        elif tipo_expr == "logica":
+            # Como valor: True o False según los saltos de la condición
+            saltos_falso = self.compilar_salto_falso(expresion)
+            self.emitir(CONSTANTE, self.constante(True))
+            salto_fin = self.emitir(SALTAR)
+            self.parchear_todos(saltos_falso)
+            self.emitir(CONSTANTE, self.constante(False))
+            self.parchear(salto_fin)
+        else:
+            self.emitir(CONSTANTE, self.constante(0))
+
+
+def desensamblar(funcion):
+    """Devuelve el bytecode de una función en forma de texto legible"""
+    lineas = [f"{funcion.nombre}:"]
+    nombres_variables = {indice: nombre for nombre, indice in funcion.variables.items()}
+    codigo = funcion.codigo
+    for pc in range(0, len(codigo), ANCHO_INSTRUCCION):
+        operacion, argumento, argumento2 = codigo[pc], codigo[pc + 1], codigo[pc + 2]
+        nombre = NOMBRES_OPERACIONES[operacion]
+        if operacion == CONSTANTE:
+            detalle = repr(funcion.constantes[argumento])
+        elif operacion in (CARGAR, GUARDAR, INCREMENTAR, DECREMENTAR, LEER):
+            detalle = nombres_variables[argumento]
+        elif operacion in (SALTAR, SALTAR_SI_FALSO, SALTAR_SI, LLAMAR):
+            detalle = str(argumento)
+        elif operacion == BINARIA:
+            detalle = OPERADORES_BINARIOS[argumento]
+        elif operacion == BINARIA_VARIABLE:
+            detalle = f"{OPERADORES_BINARIOS[argumento]} {nombres_variables[argumento2]}"
+        elif operacion == BINARIA_CONSTANTE:
+            detalle = f"{OPERADORES_BINARIOS[argumento]} {funcion.constantes[argumento2]!r}"
+        else:
+            detalle = ""
+        lineas.append(f"  {pc:5d} {nombre} {detalle}".rstrip())
+    return "\n".join(lineas)
+
+
+class MaquinaVirtual:
+    """Ejecuta el bytecode de CompiladorBytecode con un ciclo de despacho sobre enteros"""
+    def __init__(self, mostrar_salidas=True, optimizar=False):
+        self.memoria_global = {}
+        self.memoria_local = {}
+        self.entradas = []
+        self.salidas = []
+        self.mostrar_salidas = mostrar_salidas
+        self.funciones = []
+        # Optimiza el AST (constantes y ramas muertas) antes de compilarlo
+        self.optimizar = optimizar
+
+    def establecer_entradas(self, entradas):
+        self.entradas = entradas
+
+    def ejecutar(self, codigo):
+        """Analiza, compila y ejecuta un programa; mismo resultado que Interprete.ejecutar"""
+        resultado_analisis = analizar_programa(codigo, optimizar=self.optimizar)
+
+        if not resultado_analisis["exito"]:
+            return {
+                "exito": False,
+                "error": resultado_analisis.get("mensaje", "Error semántico"),
+                "errores": resultado_analisis.get("errores", [])
+            }
+
+        return self.ejecutar_ast(resultado_analisis["ast"])
+
+    def ejecutar_ast(self, ast):
+        try:
+            self.memoria_global = {}
+            self.memoria_local = {}
+            self.salidas = []
+            compilador = CompiladorBytecode()
+            self.funciones = compilador.compilar(ast)
+
+            if "init" not in compilador.indices_funciones:
+                return {
+                    "exito": False,
+                    "error": "No se encontró la función 'init'"
+                }
+            self.correr(compilador.indices_funciones["init"])
+
+            return {
+                "exito": True,
+                "memoria_global": self.memoria_global,
+                "memoria_local": self.memoria_local,
+                "salidas": self.salidas
+            }
+        except Exception as e:
+            return {
+                "exito": False,
+                "error": f"Error en ejecución: {str(e)}"
+            }
+
+    def correr(self, indice_funcion):
+        funciones = self.funciones
+        salidas = self.salidas
+        entradas = self.entradas
+        mostrar = self.mostrar_salidas
+        binarias = FUNCIONES_BINARIAS
+        llamadas = []
+        pila = []
+        apilar = pila.append
+        desapilar = pila.pop
+
+        funcion = funciones[indice_funcion]
+        codigo = funcion.codigo
+        constantes = funcion.constantes
+        # Las variables no asignadas valen 0, igual que en Interprete.obtener_variable
+        variables = [0] * len(funcion.variables)
+        pc = 0
+
+        while True:
+            operacion = codigo[pc]
+
+            if operacion == CARGAR:
+                apilar(variables[codigo[pc + 1]])
+            elif operacion == BINARIA_CONSTANTE:
+                pila[-1] = binarias[codigo[pc + 1]](pila[-1], constantes[codigo[pc + 2]])
+            elif operacion == BINARIA_VARIABLE:
+                pila[-1] = binarias[codigo[pc + 1]](pila[-1], variables[codigo[pc + 2]])
+            elif operacion == GUARDAR:
+                variables[codigo[pc + 1]] = desapilar()
+            elif operacion == SALTAR_SI_FALSO:
+                if not desapilar():
+                    pc = codigo[pc + 1]
+                    continue
+            elif operacion == SALTAR_SI:
+                if desapilar():
+                    pc = codigo[pc + 1]
+                    continue
+            elif operacion == SALTAR:
+                pc = codigo[pc + 1]
+                continue
+            elif operacion == CONSTANTE:
+                apilar(constantes[codigo[pc + 1]])
+            elif operacion == BINARIA:
+                der = desapilar()
+                pila[-1] = binarias[codigo[pc + 1]](pila[-1], der)
+            elif operacion == INCREMENTAR:
+                argumento = codigo[pc + 1]
+                variables[argumento] = variables[argumento] + 1
+            elif operacion == DECREMENTAR:
+                argumento = codigo[pc + 1]
+                variables[argumento] = variables[argumento] - 1
+            elif operacion == ESCRIBIR:
+                valor = desapilar()
+                salidas.append(str(valor))
+                if mostrar:
+                    print(f">>> {valor}")
+            elif operacion == LEER:
+                variables[codigo[pc + 1]] = entradas.pop(0) if entradas else 0
+            elif operacion == LLAMAR:
+                argumento = codigo[pc + 1]
+                if argumento >= 0:
+                    if len(llamadas) >= LIMITE_LLAMADAS:
+                        raise RecursionError("maximum recursion depth exceeded")
+                    llamadas.append((codigo, constantes, variables, pc + ANCHO_INSTRUCCION))
+                    funcion = funciones[argumento]
+                    codigo = funcion.codigo
+                    constantes = funcion.constantes
+                    variables = [0] * len(funcion.variables)
+                    pc = 0
+                    continue
+            else:
+                if not llamadas:
+                    return
+                codigo, constantes, variables, pc = llamadas.pop()
+                continue
+            pc += ANCHO_INSTRUCCION
@@ -0,0 +1,261 @@
+"""Nodos del árbol de sintaxis abstracta construido por ASTBuilder.
+
+Cada tipo de nodo es una clase con __slots__: los campos se guardan como
+atributos fijos en lugar de un diccionario por nodo. Para no romper el
+código que recorría los nodos como diccionarios, Nodo también acepta
+nodo["campo"], nodo.get("campo") y nodo.items().
+"""
+
+
+class Nodo:
+    __slots__ = ()
+    tipo = "nodo"
+    # Campos visibles del nodo, en orden (slot y linea son internos y no se muestran)
+    campos = ()
+
+    def __getitem__(self, clave):
+        if clave == "tipo":
+            return self.tipo
+        if clave in self.campos or clave == "slot":
+            try:
+                return getattr(self, clave)
+            except AttributeError:
+                pass
+        raise KeyError(clave)
+
+    def __setitem__(self, clave, valor):
+        if clave in self.campos or clave == "slot":
+            try:
+                setattr(self, clave, valor)
+                return
+            except AttributeError:
+                pass
+        raise KeyError(clave)
+
+    def __contains__(self, clave):
+        return clave == "tipo" or clave in self.campos
+
+    def get(self, clave, defecto=None):
+        try:
+            return self[clave]
+        except KeyError:
+            return defecto
+
+    def items(self):
+        yield "tipo", self.tipo
+        for campo in self.campos:
+            yield campo, getattr(self, campo)
+
+    def a_diccionario(self):
+        """Convierte el nodo y sus hijos al formato de diccionarios anterior"""
+        return {clave: _a_diccionario(valor) for clave, valor in self.items()}
+
+    def __repr__(self):
+        campos = ", ".join(f"{campo}={getattr(self, campo)!r}" for campo in self.campos)
+        return f"{type(self).__name__}({campos})"
+
+
+def _a_diccionario(valor):
+    if isinstance(valor, Nodo):
+        return valor.a_diccionario()
+    if isinstance(valor, list):
+        return [_a_diccionario(elemento) for elemento in valor]
+    return valor
+
+
+class Programa(Nodo):
+    __slots__ = ("funciones",)
+    tipo = "programa"
+    campos = __slots__
+
+    def __init__(self, funciones):
+        self.funciones = funciones
+
+
+class Funcion(Nodo):
+    __slots__ = ("nombre", "instrucciones", "linea")
+    tipo = "funcion"
+    campos = ("nombre", "instrucciones")
+
+    def __init__(self, nombre, instrucciones, linea=None):
+        self.nombre = nombre
+        self.instrucciones = instrucciones
+        self.linea = linea
+
+
+class LlamadaFuncion(Nodo):
+    __slots__ = ("nombre", "linea")
+    tipo = "llamada_funcion"
+    campos = ("nombre",)
+
+    def __init__(self, nombre, linea=None):
+        self.nombre = nombre
+        self.linea = linea
+
+
+class DeclaracionVariable(Nodo):
+    __slots__ = ("nombre", "valor", "slot", "linea")
+    tipo = "declaracion_variable"
+    campos = ("nombre", "valor")
+
+    def __init__(self, nombre, valor, linea=None):
+        self.nombre = nombre
+        self.valor = valor
+        self.slot = None
+        self.linea = linea
+
+
+class Asignacion(Nodo):
+    __slots__ = ("nombre", "valor", "slot", "linea")
+    tipo = "asignacion"
+    campos = ("nombre", "valor")
+
+    def __init__(self, nombre, valor, linea=None):
+        self.nombre = nombre
+        self.valor = valor
+        self.slot = None
+        self.linea = linea
+
+
+class If(Nodo):
+    __slots__ = ("condicion", "cuerpo", "linea")
+    tipo = "if"
+    campos = ("condicion", "cuerpo")
+
+    def __init__(self, condicion, cuerpo, linea=None):
+        self.condicion = condicion
+        self.cuerpo = cuerpo
+        self.linea = linea
+
+
+class IfElse(Nodo):
+    __slots__ = ("condicion", "cuerpo_if", "cuerpo_else", "linea")
+    tipo = "if_else"
+    campos = ("condicion", "cuerpo_if", "cuerpo_else")
+
+    def __init__(self, condicion, cuerpo_if, cuerpo_else, linea=None):
+        self.condicion = condicion
+        self.cuerpo_if = cuerpo_if
+        self.cuerpo_else = cuerpo_else
+        self.linea = linea
+
+
+class While(Nodo):
+    __slots__ = ("condicion", "cuerpo", "linea")
+    tipo = "while"
+    campos = ("condicion", "cuerpo")
+
+    def __init__(self, condicion, cuerpo, linea=None):
+        self.condicion = condicion
+        self.cuerpo = cuerpo
+        self.linea = linea
+
+
+class For(Nodo):
+    __slots__ = ("inicializacion", "condicion", "variable", "operador", "cuerpo", "slot", "linea")
+    tipo = "for"
+    campos = ("inicializacion", "condicion", "variable", "operador", "cuerpo")
+
+    def __init__(self, inicializacion, condicion, variable, operador, cuerpo, linea=None):
+        self.inicializacion = inicializacion
+        self.condicion = condicion
+        self.variable = variable
+        self.operador = operador
+        self.cuerpo = cuerpo
+        self.slot = None
+        self.linea = linea
+
+
+class Escribir(Nodo):
+    __slots__ = ("expresion", "linea")
+    tipo = "escribir"
+    campos = ("expresion",)
+
+    def __init__(self, expresion, linea=None):
+        self.expresion = expresion
+        self.linea = linea
+
+
+class Leer(Nodo):
+    __slots__ = ("variable", "slot", "linea")
+    tipo = "leer"
+    campos = ("variable",)
+
+    def __init__(self, variable, linea=None):
+        self.variable = variable
+        self.slot = None
+        self.linea = linea
+
+
+class Operacion(Nodo):
+    __slots__ = ("operador", "izquierda", "derecha")
+    tipo = "operacion"
+    campos = __slots__
+
+    def __init__(self, operador, izquierda, derecha):
+        self.operador = operador
+        self.izquierda = izquierda
+        self.derecha = derecha
+
+
+class Comparacion(Nodo):
+    __slots__ = ("operador", "izquierda", "derecha")
+    tipo = "comparacion"
+    campos = __slots__
+
+    def __init__(self, operador, izquierda, derecha):
+        self.operador = operador
+        self.izquierda = izquierda
+        self.derecha = derecha
+
+
+class Logica(Nodo):
+    """a && b o a || b; las cadenas se agrupan de izquierda a derecha, sin precedencia"""
+    __slots__ = ("operador", "izquierda", "derecha")
+    tipo = "logica"
+    campos = __slots__
+
+    def __init__(self, operador, izquierda, derecha):
+        self.operador = operador
+        self.izquierda = izquierda
+        self.derecha = derecha
+
+
+class Literal(Nodo):
+    """Base de los valores constantes: entero, flotante, cadena y booleano"""
+    __slots__ = ("valor",)
+    campos = __slots__
+
+    def __init__(self, valor):
+        self.valor = valor
+
+
+class Entero(Literal):
+    __slots__ = ()
+    tipo = "entero"
+
+
+class Flotante(Literal):
+    __slots__ = ()
+    tipo = "flotante"
+
+
+class Cadena(Literal):
+    __slots__ = ()
+    tipo = "cadena"
+
+
+class Booleano(Literal):
+    __slots__ = ()
+    tipo = "booleano"
+
+
+class Variable(Nodo):
+    __slots__ = ("nombre", "slot", "linea")
+    tipo = "variable"
+    campos = ("nombre",)
+
+    def __init__(self, nombre, linea=None):
+        self.nombre = nombre
+        self.slot = None
+        self.linea = linea
@@ -0,0 +1,231 @@
+"""Optimización del AST entre analizar_programa y la ejecución o generación de código.
+
+Pliega operaciones y comparaciones entre constantes (y && / || cuyo operando
+izquierdo ya decide el resultado), propaga las constantes de declaraciones
+"val" que nunca se reasignan y elimina los if/else cuya condición queda
+constante.
+"""
+import operator
+
+from nodos_ast import (
+    Nodo, Literal, Entero, Flotante, Cadena, Booleano, Variable, Operacion, Comparacion, Logica,
+    DeclaracionVariable, Asignacion, If, IfElse, While, For, Escribir, Leer
+)
+
+
+def _dividir(izq, der):
+    return izq / der if der != 0 else 0
+
+
+# Semántica de los operadores binarios del lenguaje (la misma que usa Interprete)
+OPERADORES = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": _dividir,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge,
+}
+
+# Cadenas más largas no se pliegan para no inflar el AST ("a" * 100000)
+LONGITUD_MAXIMA_CADENA = 1000
+
+NO_CONSTANTE = object()
+
+
+def valor_constante(expresion):
+    """Valor de una expresión formada solo por literales, o NO_CONSTANTE"""
+    if isinstance(expresion, Literal):
+        return expresion.valor
+    if isinstance(expresion, (Operacion, Comparacion)):
+        funcion = OPERADORES.get(expresion.operador)
+        if funcion is None:
+            return NO_CONSTANTE
+        izq = valor_constante(expresion.izquierda)
+        if izq is NO_CONSTANTE:
+            return NO_CONSTANTE
+        der = valor_constante(expresion.derecha)
+        if der is NO_CONSTANTE:
+            return NO_CONSTANTE
+        try:
+            return funcion(izq, der)
+        except (TypeError, ValueError, OverflowError):
+            # Se deja el error para la ejecución, igual que sin optimizar
+            return NO_CONSTANTE
+    if isinstance(expresion, Logica):
+        izq = valor_constante(expresion.izquierda)
+        if izq is NO_CONSTANTE:
+            return NO_CONSTANTE
+        # false && x y true || x no evalúan x
+        if bool(izq) == (expresion.operador == "||"):
+            return bool(izq)
+        der = valor_constante(expresion.derecha)
+        return NO_CONSTANTE if der is NO_CONSTANTE else bool(der)
+    return NO_CONSTANTE
+
+
+def crear_literal(valor):
+    """Nodo literal para un valor de Python, o None si no tiene representación"""
+    if isinstance(valor, bool):
+        return Booleano(valor)
+    if isinstance(valor, int):
+        return Entero(valor)
+    if isinstance(valor, float):
+        return Flotante(valor)
+    if isinstance(valor, str) and len(valor) <= LONGITUD_MAXIMA_CADENA:
+        return Cadena(valor)
+    return None
+
+
+def contar_nodos(valor):
+    """Cantidad de nodos del árbol que cuelga de valor"""
+    total = 0
+    pendientes = [valor]
+    while pendientes:
+        actual = pendientes.pop()
+        if isinstance(actual, Nodo):
+            total += 1
+            pendientes.extend(getattr(actual, campo) for campo in actual.campos)
+        elif isinstance(actual, list):
+            pendientes.extend(actual)
+    return total
+
+
+def contar_escrituras(instrucciones, escrituras):
+    """Cuenta cuántas instrucciones escriben cada variable (declarar, asignar, leer, for)"""
+    if not isinstance(instrucciones, list):
+        instrucciones = [instrucciones]
+    for nodo in instrucciones:
+        if isinstance(nodo, (DeclaracionVariable, Asignacion)):
+            escrituras[nodo.nombre] = escrituras.get(nodo.nombre, 0) + 1
+        elif isinstance(nodo, Leer):
+            escrituras[nodo.variable] = escrituras.get(nodo.variable, 0) + 1
+        elif isinstance(nodo, (If, While)):
+            contar_escrituras(nodo.cuerpo, escrituras)
+        elif isinstance(nodo, IfElse):
+            contar_escrituras(nodo.cuerpo_if, escrituras)
+            contar_escrituras(nodo.cuerpo_else, escrituras)
+        elif isinstance(nodo, For):
+            contar_escrituras(nodo.inicializacion, escrituras)
+            contar_escrituras(nodo.cuerpo, escrituras)
+            escrituras[nodo.variable] = escrituras.get(nodo.variable, 0) + 1
+    return escrituras
+
+
+class Optimizador:
+    """Aplica el plegado de constantes y la eliminación de ramas sobre un programa"""
+    def __init__(self):
+        self.expresiones_plegadas = 0
+        self.constantes_propagadas = 0
+        self.ramas_eliminadas = 0
+
+    def optimizar(self, ast):
+        """Optimiza el programa en el lugar y devuelve el reporte de la pasada"""
+        nodos_antes = contar_nodos(ast)
+        for funcion in ast.funciones:
+            self.optimizar_funcion(funcion)
+        nodos_despues = contar_nodos(ast)
+        return {
+            "nodos_antes": nodos_antes,
+            "nodos_despues": nodos_despues,
+            "nodos_eliminados": nodos_antes - nodos_despues,
+            "expresiones_plegadas": self.expresiones_plegadas,
+            "constantes_propagadas": self.constantes_propagadas,
+            "ramas_eliminadas": self.ramas_eliminadas,
+        }
+
+    def optimizar_funcion(self, funcion):
+        escrituras = contar_escrituras(funcion.instrucciones, {})
+        constantes = {}
+        instrucciones = []
+        for nodo in funcion.instrucciones:
+            for resultado in self.optimizar_nodo(nodo, constantes):
+                instrucciones.append(resultado)
+                # Solo las declaraciones del nivel superior se ejecutan una vez y
+                # antes de todo lo que sigue; las variables sin asignar valen 0,
+                # así que los usos anteriores a la declaración no se tocan
+                if isinstance(resultado, DeclaracionVariable) and escrituras.get(resultado.nombre) == 1 \
+                        and isinstance(resultado.valor, Literal):
+                    constantes[resultado.nombre] = resultado.valor.valor
+        funcion.instrucciones = instrucciones
+
+    def optimizar_bloque(self, instrucciones, constantes):
+        if not isinstance(instrucciones, list):
+            instrucciones = [instrucciones]
+        resultado = []
+        for nodo in instrucciones:
+            resultado.extend(self.optimizar_nodo(nodo, constantes))
+        return resultado
+
+    def optimizar_nodo(self, nodo, constantes):
+        """Optimiza una instrucción y devuelve la lista de instrucciones que la reemplazan"""
+        if isinstance(nodo, (DeclaracionVariable, Asignacion)):
+            if nodo.valor is not None:
+                nodo.valor = self.plegar(nodo.valor, constantes)
+        elif isinstance(nodo, If):
+            nodo.condicion = self.plegar(nodo.condicion, constantes)
+            if isinstance(nodo.condicion, Literal):
+                self.ramas_eliminadas += 1
+                return self.optimizar_bloque(nodo.cuerpo, constantes) if nodo.condicion.valor else []
+            nodo.cuerpo = self.optimizar_bloque(nodo.cuerpo, constantes)
+        elif isinstance(nodo, IfElse):
+            nodo.condicion = self.plegar(nodo.condicion, constantes)
+            if isinstance(nodo.condicion, Literal):
+                self.ramas_eliminadas += 1
+                cuerpo = nodo.cuerpo_if if nodo.condicion.valor else nodo.cuerpo_else
+                return self.optimizar_bloque(cuerpo, constantes)
+            nodo.cuerpo_if = self.optimizar_bloque(nodo.cuerpo_if, constantes)
+            nodo.cuerpo_else = self.optimizar_bloque(nodo.cuerpo_else, constantes)
+        elif isinstance(nodo, While):
+            nodo.condicion = self.plegar(nodo.condicion, constantes)
+            if isinstance(nodo.condicion, Literal) and not nodo.condicion.valor:
+                self.ramas_eliminadas += 1
+                return []
+            nodo.cuerpo = self.optimizar_bloque(nodo.cuerpo, constantes)
+        elif isinstance(nodo, For):
+            self.optimizar_nodo(nodo.inicializacion, constantes)
+            nodo.condicion = self.plegar(nodo.condicion, constantes)
+            nodo.cuerpo = self.optimizar_bloque(nodo.cuerpo, constantes)
+        elif isinstance(nodo, Escribir):
+            nodo.expresion = self.plegar(nodo.expresion, constantes)
+        return [nodo]
+
+    def plegar(self, expresion, constantes):
+        """Reemplaza las subexpresiones constantes de expresion por literales"""
+        if isinstance(expresion, Variable):
+            valor = constantes.get(expresion.nombre, NO_CONSTANTE)
+            literal = crear_literal(valor)
+            if literal is None:
+                return expresion
+            self.constantes_propagadas += 1
+            return literal
+        if isinstance(expresion, (Operacion, Comparacion)):
+            expresion.izquierda = self.plegar(expresion.izquierda, constantes)
+            expresion.derecha = self.plegar(expresion.derecha, constantes)
+            literal = crear_literal(valor_constante(expresion))
+            if literal is None:
+                return expresion
+            self.expresiones_plegadas += 1
+            return literal
+        if isinstance(expresion, Logica):
+            expresion.izquierda = self.plegar(expresion.izquierda, constantes)
+            expresion.derecha = self.plegar(expresion.derecha, constantes)
+            literal = crear_literal(valor_constante(expresion))
+            if literal is None and isinstance(expresion.izquierda, Literal):
+                # true && x y false || x valen x (los operandos de && y || ya son booleanos)
+                self.expresiones_plegadas += 1
+                return expresion.derecha
+            if literal is None:
+                return expresion
+            self.expresiones_plegadas += 1
+            return literal
+        return expresion
+
+
+def optimizar_programa(ast):
+    """Optimiza el AST de analizar_programa en el lugar y devuelve el reporte"""
+    return Optimizador().optimizar(ast)
@@ -0,0 +1,238 @@
+"""Optimización de las cuádruplas de GeneradorCodigoIntermedio.
+
+Por bloque básico se aplica propagación de copias, plegado de constantes y
+eliminación de subexpresiones comunes; luego se quitan los temporales
+muertos y se encadenan los saltos a saltos.
+"""
+from optimizador import LONGITUD_MAXIMA_CADENA
+from representacion_intermedia import (
+    ProgramaIntermedio, Cuadrupla, Constante, Temporal, FUNCIONES_BINARIAS, ASIGNAR, SALTAR,
+    SALTAR_SI, SALTOS, SALTOS_CONDICIONALES, ESCRIBIR, LEER, RETORNAR, ETIQUETA, FUNCION, COMENTARIO
+)
+
+
+def termina_bloque(cuadrupla):
+    """Los saltos y las instrucciones desconocidas cierran el bloque básico"""
+    operacion = cuadrupla.operacion
+    if operacion in SALTOS:
+        return True
+    return cuadrupla.definicion() is None and operacion != ESCRIBIR and operacion != COMENTARIO
+
+
+def plegar(operacion, izquierda, derecha):
+    """Constante con el resultado de la operación, o None si no se puede plegar"""
+    try:
+        valor = FUNCIONES_BINARIAS[operacion](izquierda.valor, derecha.valor)
+    except (TypeError, ValueError, OverflowError):
+        # Se deja el error para la ejecución, igual que sin optimizar
+        return None
+    if isinstance(valor, str) and len(valor) > LONGITUD_MAXIMA_CADENA:
+        return None
+    return Constante(valor)
+
+
+class OptimizadorIntermedio:
+    """Optimiza una lista de cuádruplas y cuenta cada transformación aplicada"""
+    def __init__(self):
+        self.subexpresiones_comunes = 0
+        self.copias_propagadas = 0
+        self.expresiones_plegadas = 0
+        self.temporales_eliminados = 0
+        self.saltos_encadenados = 0
+        self.instrucciones_inalcanzables = 0
+
+    def optimizar(self, cuadruplas):
+        """Devuelve las cuádruplas optimizadas (la lista original no se modifica)"""
+        cuadruplas = [Cuadrupla(c.operacion, c.argumento1, c.argumento2, c.resultado) for c in cuadruplas]
+        while True:
+            cantidad = len(cuadruplas)
+            cuadruplas = self.encadenar_saltos(cuadruplas)
+            # Antes de propagar copias, para que "x = t" no reparta t por el bloque
+            cuadruplas = self.fusionar_temporales(cuadruplas)
+            for inicio, fin in self.bloques_basicos(cuadruplas):
+                self.optimizar_bloque(cuadruplas, inicio, fin)
+            # Los saltos condicionales que nunca saltan quedan sin operación
+            cuadruplas = [c for c in cuadruplas if c.operacion is not None]
+            cuadruplas = self.fusionar_temporales(cuadruplas)
+            cuadruplas = self.eliminar_temporales_muertos(cuadruplas)
+            if len(cuadruplas) == cantidad:
+                return cuadruplas
+
+    def bloques_basicos(self, cuadruplas):
+        """Rangos [inicio, fin) de los bloques básicos"""
+        inicio = 0
+        for i, cuadrupla in enumerate(cuadruplas):
+            if cuadrupla.operacion == ETIQUETA or cuadrupla.operacion == FUNCION:
+                if inicio < i:
+                    yield inicio, i
+                inicio = i + 1
+            elif termina_bloque(cuadrupla):
+                yield inicio, i + 1
+                inicio = i + 1
+        if inicio < len(cuadruplas):
+            yield inicio, len(cuadruplas)
+
+    def optimizar_bloque(self, cuadruplas, inicio, fin):
+        """Propagación de copias, plegado y subexpresiones comunes dentro de un bloque"""
+        copias = {}
+        expresiones = {}
+        for i in range(inicio, fin):
+            cuadrupla = cuadruplas[i]
+            operacion = cuadrupla.operacion
+
+            # Reemplazar los usos por la copia original
+            if cuadrupla.usos():
+                if cuadrupla.argumento1 in copias:
+                    cuadrupla.argumento1 = copias[cuadrupla.argumento1]
+                    self.copias_propagadas += 1
+                if operacion in FUNCIONES_BINARIAS and cuadrupla.argumento2 in copias:
+                    cuadrupla.argumento2 = copias[cuadrupla.argumento2]
+                    self.copias_propagadas += 1
+
+            if operacion in FUNCIONES_BINARIAS:
+                izquierda, derecha = cuadrupla.argumento1, cuadrupla.argumento2
+                constante = None
+                if isinstance(izquierda, Constante) and isinstance(derecha, Constante):
+                    constante = plegar(operacion, izquierda, derecha)
+                if constante is not None:
+                    cuadrupla.operacion, cuadrupla.argumento1, cuadrupla.argumento2 = ASIGNAR, constante, None
+                    self.expresiones_plegadas += 1
+                elif (operacion, izquierda, derecha) in expresiones:
+                    cuadrupla.operacion = ASIGNAR
+                    cuadrupla.argumento1 = expresiones[(operacion, izquierda, derecha)]
+                    cuadrupla.argumento2 = None
+                    self.subexpresiones_comunes += 1
+            elif operacion in SALTOS_CONDICIONALES and isinstance(cuadrupla.argumento1, Constante):
+                # Salto con condición constante: siempre salta o se elimina
+                if bool(cuadrupla.argumento1.valor) == (operacion == SALTAR_SI):
+                    cuadrupla.operacion, cuadrupla.argumento1 = SALTAR, None
+                else:
+                    cuadrupla.operacion = None
+                self.saltos_encadenados += 1
+
+            definida = cuadrupla.definicion()
+            if definida is None:
+                continue
+
+            # La variable cambia: se invalidan las copias y expresiones que la usan
+            for nombre in [nombre for nombre, origen in copias.items() if definida == nombre or definida == origen]:
+                del copias[nombre]
+            for clave in [clave for clave, nombre in expresiones.items()
+                          if definida == clave[1] or definida == clave[2] or definida == nombre]:
+                del expresiones[clave]
+
+            if cuadrupla.operacion == ASIGNAR and cuadrupla.argumento1 != definida:
+                copias[definida] = cuadrupla.argumento1
+            elif cuadrupla.operacion in FUNCIONES_BINARIAS and definida not in cuadrupla.usos():
+                expresiones[(cuadrupla.operacion, cuadrupla.argumento1, cuadrupla.argumento2)] = definida
+
+    def contar_usos(self, cuadruplas):
+        usos = {}
+        for cuadrupla in cuadruplas:
+            for operando in cuadrupla.usos():
+                usos[operando] = usos.get(operando, 0) + 1
+        return usos
+
+    def fusionar_temporales(self, cuadruplas):
+        """Convierte "t = a + b; x = t" en "x = a + b" si t no se usa en otro lugar"""
+        usos = self.contar_usos(cuadruplas)
+        resultado = []
+        i = 0
+        while i < len(cuadruplas):
+            cuadrupla = cuadruplas[i]
+            siguiente = cuadruplas[i + 1] if i + 1 < len(cuadruplas) else None
+            if siguiente is not None and cuadrupla.operacion in FUNCIONES_BINARIAS \
+                    and isinstance(cuadrupla.resultado, Temporal) and usos.get(cuadrupla.resultado) == 1 \
+                    and siguiente.operacion == ASIGNAR and siguiente.argumento1 == cuadrupla.resultado:
+                cuadrupla.resultado = siguiente.resultado
+                self.temporales_eliminados += 1
+                i += 1
+            resultado.append(cuadrupla)
+            i += 1
+        return resultado
+
+    def eliminar_temporales_muertos(self, cuadruplas):
+        """Quita las asignaciones a temporales que nunca se leen"""
+        usos = self.contar_usos(cuadruplas)
+        resultado = []
+        for cuadrupla in cuadruplas:
+            definida = cuadrupla.definicion()
+            if cuadrupla.operacion != LEER and isinstance(definida, Temporal) and not usos.get(definida):
+                self.temporales_eliminados += 1
+                continue
+            resultado.append(cuadrupla)
+        return resultado
+
+    def encadenar_saltos(self, cuadruplas):
+        """Redirige los saltos a saltos, quita saltos a la instrucción siguiente,
+        código inalcanzable y etiquetas sin referencias"""
+        posiciones = {c.resultado: i for i, c in enumerate(cuadruplas) if c.operacion == ETIQUETA}
+
+        def destino_final(etiqueta):
+            vistas = {etiqueta}
+            while etiqueta in posiciones:
+                i = posiciones[etiqueta] + 1
+                while i < len(cuadruplas) and cuadruplas[i].operacion in (ETIQUETA, COMENTARIO):
+                    i += 1
+                if i >= len(cuadruplas) or cuadruplas[i].operacion != SALTAR or cuadruplas[i].resultado in vistas:
+                    break
+                etiqueta = cuadruplas[i].resultado
+                vistas.add(etiqueta)
+            return etiqueta
+
+        for cuadrupla in cuadruplas:
+            if cuadrupla.operacion in SALTOS:
+                destino = destino_final(cuadrupla.resultado)
+                if destino != cuadrupla.resultado:
+                    cuadrupla.resultado = destino
+                    self.saltos_encadenados += 1
+
+        # Saltos cuyo destino es la instrucción siguiente (solo etiquetas en medio)
+        resultado = []
+        for i, cuadrupla in enumerate(cuadruplas):
+            if cuadrupla.operacion in SALTOS:
+                j = i + 1
+                while j < len(cuadruplas) and cuadruplas[j].operacion == ETIQUETA \
+                        and cuadruplas[j].resultado != cuadrupla.resultado:
+                    j += 1
+                if j < len(cuadruplas) and cuadruplas[j].operacion == ETIQUETA:
+                    self.saltos_encadenados += 1
+                    continue
+            resultado.append(cuadrupla)
+
+        referenciadas = {c.resultado for c in resultado if c.operacion in SALTOS}
+        cuadruplas, resultado = resultado, []
+        inalcanzable = False
+        for cuadrupla in cuadruplas:
+            if cuadrupla.operacion == ETIQUETA:
+                if cuadrupla.resultado not in referenciadas:
+                    continue
+                inalcanzable = False
+            elif cuadrupla.operacion == FUNCION:
+                inalcanzable = False
+            elif inalcanzable and cuadrupla.operacion != COMENTARIO:
+                self.instrucciones_inalcanzables += 1
+                continue
+            resultado.append(cuadrupla)
+            if cuadrupla.operacion == SALTAR or cuadrupla.operacion == RETORNAR:
+                inalcanzable = True
+        return resultado
+
+    def reporte(self, antes, despues):
+        return {
+            "instrucciones_antes": antes,
+            "instrucciones_despues": despues,
+            "subexpresiones_comunes": self.subexpresiones_comunes,
+            "copias_propagadas": self.copias_propagadas,
+            "expresiones_plegadas": self.expresiones_plegadas,
+            "temporales_eliminados": self.temporales_eliminados,
+            "saltos_encadenados": self.saltos_encadenados,
+            "instrucciones_inalcanzables": self.instrucciones_inalcanzables,
+        }
+
+
+def optimizar_codigo(programa):
+    """Optimiza un ProgramaIntermedio; devuelve (programa optimizado, reporte)"""
+    optimizador = OptimizadorIntermedio()
+    optimizado = ProgramaIntermedio(optimizador.optimizar(programa.cuadruplas))
+    return optimizado, optimizador.reporte(programa.instrucciones(), optimizado.instrucciones())
@@ -1,66 +0,0 @@
-
-# parsetab.py
-# This file is automatically generated. Do not edit.
-# pylint: disable=W,C,R
-_tabversion = '3.10'
-
-_lr_method = 'LALR'
-
-_lr_signature = 'leftLOGICOleftCOMPARACION_EQCOMPARACION_NEQCOMPARACION_LESSCOMPARACION_GREATERCOMPARACION_LESS_EQCOMPARACION_GREATER_EQleftOPERADORASIGNACION COMILLAS COMPARACION_EQ COMPARACION_GREATER COMPARACION_GREATER_EQ COMPARACION_LESS COMPARACION_LESS_EQ COMPARACION_NEQ DECREMENTO DELIMITADOR_L DELIMITADOR_R DOS_PUNTOS ELSE ENTERO ESCRIBIR FLOTANTE FOR FUNC IF INCREMENTO INIT LEER LOGICO OPERADOR SEPARADOR T_PARENTESIS_L T_PARENTESIS_R VAL VARIABLE WHILEprograma : FUNC INIT DELIMITADOR_L instrucciones DELIMITADOR_Rinstrucciones : instruccion instrucciones\n                     | instruccioninstruccion : declaracion_variable\n                   | asignacion\n                   | estructura_if\n                   | estructura_else\n                   | estructura_while\n                   | estructura_for\n                   | print_statement\n                   | input_statement\n                   | SEPARADORdeclaracion_variable : VAL VARIABLE ASIGNACION expresion SEPARADORasignacion : VARIABLE ASIGNACION expresion SEPARADORestructura_if : IF T_PARENTESIS_L expresion_logica T_PARENTESIS_R DELIMITADOR_L instrucciones DELIMITADOR_Restructura_else : estructura_if ELSE DELIMITADOR_L instrucciones DELIMITADOR_Restructura_while : WHILE T_PARENTESIS_L expresion_logica T_PARENTESIS_R DELIMITADOR_L instrucciones DELIMITADOR_Restructura_for : FOR T_PARENTESIS_L declaracion_variable expresion_logica SEPARADOR VARIABLE OPERADOR OPERADOR T_PARENTESIS_R DELIMITADOR_L instrucciones DELIMITADOR_Rprint_statement : ESCRIBIR T_PARENTESIS_L expresion T_PARENTESIS_R SEPARADORinput_statement : LEER T_PARENTESIS_L VARIABLE T_PARENTESIS_R SEPARADORexpresion_logica : expresion_relacional\n                        | expresion_logica LOGICO expresion_relacionalexpresion_relacional : expresion COMPARACION_EQ expresion\n                           | expresion COMPARACION_NEQ expresion\n                           | expresion COMPARACION_LESS expresion\n                           | expresion COMPARACION_GREATER expresion\n                           | expresion COMPARACION_LESS_EQ expresion\n                           | expresion COMPARACION_GREATER_EQ expresion\n                           | T_PARENTESIS_L expresion_logica T_PARENTESIS_Rexpresion : termino\n                 | expresion OPERADOR terminotermino : ENTERO\n               | FLOTANTE\n               | VARIABLE\n               | COMILLAS\n               | T_PARENTESIS_L expresion T_PARENTESIS_R'
-    
-_lr_action_items = {'FUNC':([0,],[2,]),'$end':([1,23,],[0,-1,]),'INIT':([2,],[3,]),'DELIMITADOR_L':([3,25,57,65,93,],[4,33,74,82,94,]),'SEPARADOR':([4,6,7,8,9,10,11,12,13,14,15,33,35,36,37,38,39,40,44,51,52,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,84,85,89,90,94,96,],[15,15,-4,-5,-6,-7,-8,-9,-10,-11,-12,15,-34,52,-30,-32,-33,-35,-21,70,-14,83,84,85,-16,-13,-31,-36,-29,15,-22,-23,-24,-25,-26,-27,-28,15,-19,-20,-15,-17,15,-18,]),'VAL':([4,6,7,8,9,10,11,12,13,14,15,30,33,52,69,70,74,82,84,85,89,90,94,96,],[16,16,-4,-5,-6,-7,-8,-9,-10,-11,-12,16,16,-14,-16,-13,16,16,-19,-20,-15,-17,16,-18,]),'VARIABLE':([4,6,7,8,9,10,11,12,13,14,15,16,27,28,29,31,32,33,34,41,42,47,52,53,58,59,60,61,62,63,64,69,70,74,82,83,84,85,89,90,94,96,],[17,17,-4,-5,-6,-7,-8,-9,-10,-11,-12,26,35,35,35,35,49,17,35,35,35,35,-14,35,35,35,35,35,35,35,35,-16,-13,17,17,88,-19,-20,-15,-17,17,-18,]),'IF':([4,6,7,8,9,10,11,12,13,14,15,33,52,69,70,74,82,84,85,89,90,94,96,],[18,18,-4,-5,-6,-7,-8,-9,-10,-11,-12,18,-14,-16,-13,18,18,-19,-20,-15,-17,18,-18,]),'WHILE':([4,6,7,8,9,10,11,12,13,14,15,33,52,69,70,74,82,84,85,89,90,94,96,],[19,19,-4,-5,-6,-7,-8,-9,-10,-11,-12,19,-14,-16,-13,19,19,-19,-20,-15,-17,19,-18,]),'FOR':([4,6,7,8,9,10,11,12,13,14,15,33,52,69,70,74,82,84,85,89,90,94,96,],[20,20,-4,-5,-6,-7,-8,-9,-10,-11,-12,20,-14,-16,-13,20,20,-19,-20,-15,-17,20,-18,]),'ESCRIBIR':([4,6,7,8,9,10,11,12,13,14,15,33,52,69,70,74,82,84,85,89,90,94,96,],[21,21,-4,-5,-6,-7,-8,-9,-10,-11,-12,21,-14,-16,-13,21,21,-19,-20,-15,-17,21,-18,]),'LEER':([4,6,7,8,9,10,11,12,13,14,15,33,52,69,70,74,82,84,85,89,90,94,96,],[22,22,-4,-5,-6,-7,-8,-9,-10,-11,-12,22,-14,-16,-13,22,22,-19,-20,-15,-17,22,-18,]),'DELIMITADOR_R':([5,6,7,8,9,10,11,12,13,14,15,24,50,52,69,70,84,85,86,87,89,90,95,96,],[23,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-2,69,-14,-16,-13,-19,-20,89,90,-15,-17,96,-18,]),'ELSE':([9,89,],[25,-15,]),'ASIGNACION':([17,26,],[27,34,]),'T_PARENTESIS_L':([18,19,20,21,22,27,28,29,31,34,41,42,47,53,58,59,60,61,62,63,64,70,],[28,29,30,31,32,41,42,42,41,41,41,42,42,41,42,41,41,41,41,41,41,-13,]),'ENTERO':([27,28,29,31,34,41,42,47,53,58,59,60,61,62,63,64,70,],[38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,-13,]),'FLOTANTE':([27,28,29,31,34,41,42,47,53,58,59,60,61,62,63,64,70,],[39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,-13,]),'COMILLAS':([27,28,29,31,34,41,42,47,53,58,59,60,61,62,63,64,70,],[40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,-13,]),'OPERADOR':([35,36,37,38,39,40,45,48,51,54,56,71,72,76,77,78,79,80,81,88,91,],[-34,53,-30,-32,-33,-35,53,53,53,53,53,-31,-36,53,53,53,53,53,53,91,92,]),'COMPARACION_EQ':([35,37,38,39,40,45,56,71,72,],[-34,-30,-32,-33,-35,59,59,-31,-36,]),'COMPARACION_NEQ':([35,37,38,39,40,45,56,71,72,],[-34,-30,-32,-33,-35,60,60,-31,-36,]),'COMPARACION_LESS':([35,37,38,39,40,45,56,71,72,],[-34,-30,-32,-33,-35,61,61,-31,-36,]),'COMPARACION_GREATER':([35,37,38,39,40,45,56,71,72,],[-34,-30,-32,-33,-35,62,62,-31,-36,]),'COMPARACION_LESS_EQ':([35,37,38,39,40,45,56,71,72,],[-34,-30,-32,-33,-35,63,63,-31,-36,]),'COMPARACION_GREATER_EQ':([35,37,38,39,40,45,56,71,72,],[-34,-30,-32,-33,-35,64,64,-31,-36,]),'T_PARENTESIS_R':([35,37,38,39,40,43,44,46,48,49,54,55,56,71,72,73,75,76,77,78,79,80,81,92,],[-34,-30,-32,-33,-35,57,-21,65,67,68,72,73,72,-31,-36,-29,-22,-23,-24,-25,-26,-27,-28,93,]),'LOGICO':([35,37,38,39,40,43,44,46,55,66,71,72,73,75,76,77,78,79,80,81,],[-34,-30,-32,-33,-35,58,-21,58,58,58,-31,-36,-29,-22,-23,-24,-25,-26,-27,-28,]),}
-
-_lr_action = {}
-for _k, _v in _lr_action_items.items():
-   for _x,_y in zip(_v[0],_v[1]):
-      if not _x in _lr_action:  _lr_action[_x] = {}
-      _lr_action[_x][_k] = _y
-del _lr_action_items
-
-_lr_goto_items = {'programa':([0,],[1,]),'instrucciones':([4,6,33,74,82,94,],[5,24,50,86,87,95,]),'instruccion':([4,6,33,74,82,94,],[6,6,6,6,6,6,]),'declaracion_variable':([4,6,30,33,74,82,94,],[7,7,47,7,7,7,7,]),'asignacion':([4,6,33,74,82,94,],[8,8,8,8,8,8,]),'estructura_if':([4,6,33,74,82,94,],[9,9,9,9,9,9,]),'estructura_else':([4,6,33,74,82,94,],[10,10,10,10,10,10,]),'estructura_while':([4,6,33,74,82,94,],[11,11,11,11,11,11,]),'estructura_for':([4,6,33,74,82,94,],[12,12,12,12,12,12,]),'print_statement':([4,6,33,74,82,94,],[13,13,13,13,13,13,]),'input_statement':([4,6,33,74,82,94,],[14,14,14,14,14,14,]),'expresion':([27,28,29,31,34,41,42,47,58,59,60,61,62,63,64,],[36,45,45,48,51,54,56,45,45,76,77,78,79,80,81,]),'termino':([27,28,29,31,34,41,42,47,53,58,59,60,61,62,63,64,],[37,37,37,37,37,37,37,37,71,37,37,37,37,37,37,37,]),'expresion_logica':([28,29,42,47,],[43,46,55,66,]),'expresion_relacional':([28,29,42,47,58,],[44,44,44,44,75,]),}
-
-_lr_goto = {}
-for _k, _v in _lr_goto_items.items():
-   for _x, _y in zip(_v[0], _v[1]):
-       if not _x in _lr_goto: _lr_goto[_x] = {}
-       _lr_goto[_x][_k] = _y
-del _lr_goto_items
-_lr_productions = [
-  ("S' -> programa","S'",1,None,None,None),
-  ('programa -> FUNC INIT DELIMITADOR_L instrucciones DELIMITADOR_R','programa',5,'p_programa','analizador_sintactico.py',11),
-  ('instrucciones -> instruccion instrucciones','instrucciones',2,'p_instrucciones','analizador_sintactico.py',15),
-  ('instrucciones -> instruccion','instrucciones',1,'p_instrucciones','analizador_sintactico.py',16),
-  ('instruccion -> declaracion_variable','instruccion',1,'p_instruccion','analizador_sintactico.py',23),
-  ('instruccion -> asignacion','instruccion',1,'p_instruccion','analizador_sintactico.py',24),
-  ('instruccion -> estructura_if','instruccion',1,'p_instruccion','analizador_sintactico.py',25),
-  ('instruccion -> estructura_else','instruccion',1,'p_instruccion','analizador_sintactico.py',26),
-  ('instruccion -> estructura_while','instruccion',1,'p_instruccion','analizador_sintactico.py',27),
-  ('instruccion -> estructura_for','instruccion',1,'p_instruccion','analizador_sintactico.py',28),
-  ('instruccion -> print_statement','instruccion',1,'p_instruccion','analizador_sintactico.py',29),
-  ('instruccion -> input_statement','instruccion',1,'p_instruccion','analizador_sintactico.py',30),
-  ('instruccion -> SEPARADOR','instruccion',1,'p_instruccion','analizador_sintactico.py',31),
-  ('declaracion_variable -> VAL VARIABLE ASIGNACION expresion SEPARADOR','declaracion_variable',5,'p_declaracion_variable','analizador_sintactico.py',36),
-  ('asignacion -> VARIABLE ASIGNACION expresion SEPARADOR','asignacion',4,'p_asignacion','analizador_sintactico.py',40),
-  ('estructura_if -> IF T_PARENTESIS_L expresion_logica T_PARENTESIS_R DELIMITADOR_L instrucciones DELIMITADOR_R','estructura_if',7,'p_estructura_if','analizador_sintactico.py',44),
-  ('estructura_else -> estructura_if ELSE DELIMITADOR_L instrucciones DELIMITADOR_R','estructura_else',5,'p_estructura_else','analizador_sintactico.py',48),
-  ('estructura_while -> WHILE T_PARENTESIS_L expresion_logica T_PARENTESIS_R DELIMITADOR_L instrucciones DELIMITADOR_R','estructura_while',7,'p_estructura_while','analizador_sintactico.py',52),
-  ('estructura_for -> FOR T_PARENTESIS_L declaracion_variable expresion_logica SEPARADOR VARIABLE OPERADOR OPERADOR T_PARENTESIS_R DELIMITADOR_L instrucciones DELIMITADOR_R','estructura_for',12,'p_estructura_for','analizador_sintactico.py',56),
-  ('print_statement -> ESCRIBIR T_PARENTESIS_L expresion T_PARENTESIS_R SEPARADOR','print_statement',5,'p_print_statement','analizador_sintactico.py',60),
-  ('input_statement -> LEER T_PARENTESIS_L VARIABLE T_PARENTESIS_R SEPARADOR','input_statement',5,'p_input_statement','analizador_sintactico.py',64),
-  ('expresion_logica -> expresion_relacional','expresion_logica',1,'p_expresion_logica','analizador_sintactico.py',68),
-  ('expresion_logica -> expresion_logica LOGICO expresion_relacional','expresion_logica',3,'p_expresion_logica','analizador_sintactico.py',69),
-  ('expresion_relacional -> expresion COMPARACION_EQ expresion','expresion_relacional',3,'p_expresion_relacional','analizador_sintactico.py',76),
-  ('expresion_relacional -> expresion COMPARACION_NEQ expresion','expresion_relacional',3,'p_expresion_relacional','analizador_sintactico.py',77),
-  ('expresion_relacional -> expresion COMPARACION_LESS expresion','expresion_relacional',3,'p_expresion_relacional','analizador_sintactico.py',78),
-  ('expresion_relacional -> expresion COMPARACION_GREATER expresion','expresion_relacional',3,'p_expresion_relacional','analizador_sintactico.py',79),
-  ('expresion_relacional -> expresion COMPARACION_LESS_EQ expresion','expresion_relacional',3,'p_expresion_relacional','analizador_sintactico.py',80),
-  ('expresion_relacional -> expresion COMPARACION_GREATER_EQ expresion','expresion_relacional',3,'p_expresion_relacional','analizador_sintactico.py',81),
-  ('expresion_relacional -> T_PARENTESIS_L expresion_logica T_PARENTESIS_R','expresion_relacional',3,'p_expresion_relacional','analizador_sintactico.py',82),
-  ('expresion -> termino','expresion',1,'p_expresion','analizador_sintactico.py',89),
-  ('expresion -> expresion OPERADOR termino','expresion',3,'p_expresion','analizador_sintactico.py',90),
-  ('termino -> ENTERO','termino',1,'p_termino','analizador_sintactico.py',97),
-  ('termino -> FLOTANTE','termino',1,'p_termino','analizador_sintactico.py',98),
-  ('termino -> VARIABLE','termino',1,'p_termino','analizador_sintactico.py',99),
-  ('termino -> COMILLAS','termino',1,'p_termino','analizador_sintactico.py',100),
-  ('termino -> T_PARENTESIS_L expresion T_PARENTESIS_R','termino',3,'p_termino','analizador_sintactico.py',101),
-]
@@ -0,0 +1,153 @@
+"""Contadores y tiempos de ejecución del Interprete.
+
+Un PerfilEjecucion se pasa al Interprete con Interprete(perfil=...). Cuenta
+las ejecuciones de cada nodo por tipo y por línea, las entradas e
+iteraciones de cada while y for, y el tiempo de cada llamada a función
+(inclusivo, con las funciones que llama, y exclusivo, sin ellas). Sin perfil
+el Interprete no envuelve nada: solo revisa un atributo al terminar cada
+ciclo del recorrido del árbol.
+
+Los resultados se exportan como perfil plano (texto o diccionario) y como
+pilas colapsadas ("init;gato 1234" por línea, en microsegundos), el formato
+que leen flamegraph.pl, speedscope e inferno.
+
+Uso: python perfil_ejecucion.py PROGRAMA [--compilado] [--entradas 1 2 ...]
+                                [--colapsado perfil.folded]
+"""
+import argparse
+import contextlib
+import io
+import sys
+import time
+from collections import Counter
+
+
+class PerfilEjecucion:
+    def __init__(self):
+        # Ejecuciones por tipo de nodo y por línea del código
+        self.nodos = Counter()
+        self.lineas = Counter()
+        # (tipo, línea) de cada ciclo -> [veces que se entró, iteraciones]
+        self.ciclos = {}
+        # Nombre -> [llamadas, tiempo inclusivo, tiempo exclusivo] en segundos
+        self.funciones = {}
+        # "init;gato" -> tiempo exclusivo en segundos de esa pila de llamadas
+        self.pilas = Counter()
+        # [nombre, pila, inicio, tiempo de las llamadas internas] de cada llamada en curso
+        self._llamadas = []
+
+    def nodo(self, nodo):
+        self.nodos[nodo.tipo] += 1
+        linea = getattr(nodo, "linea", None)
+        if linea is not None:
+            self.lineas[linea] += 1
+
+    def ciclo(self, nodo, iteraciones):
+        clave = (nodo.tipo, getattr(nodo, "linea", None))
+        conteo = self.ciclos.get(clave)
+        if conteo is None:
+            conteo = self.ciclos[clave] = [0, 0]
+        conteo[0] += 1
+        conteo[1] += iteraciones
+
+    def entrar(self, nombre):
+        pila = f"{self._llamadas[-1][1]};{nombre}" if self._llamadas else nombre
+        self._llamadas.append([nombre, pila, time.perf_counter(), 0.0])
+
+    def salir(self):
+        nombre, pila, inicio, internas = self._llamadas.pop()
+        inclusivo = time.perf_counter() - inicio
+        exclusivo = inclusivo - internas
+        if self._llamadas:
+            self._llamadas[-1][3] += inclusivo
+        datos = self.funciones.get(nombre)
+        if datos is None:
+            datos = self.funciones[nombre] = [0, 0.0, 0.0]
+        datos[0] += 1
+        # Una llamada recursiva ya está contada en la inclusiva de la llamada que la contiene
+        if not any(llamada[0] == nombre for llamada in self._llamadas):
+            datos[1] += inclusivo
+        datos[2] += exclusivo
+        self.pilas[pila] += exclusivo
+
+    def plano(self):
+        """Filas (función, llamadas, inclusivo, exclusivo) ordenadas por tiempo exclusivo"""
+        filas = [(nombre, llamadas, inclusivo, exclusivo)
+                 for nombre, (llamadas, inclusivo, exclusivo) in self.funciones.items()]
+        filas.sort(key=lambda fila: fila[3], reverse=True)
+        return filas
+
+    def lineas_reporte(self, limite=20):
+        """Perfil plano en texto, línea por línea"""
+        yield f"{'función':<24}{'llamadas':>10}{'inclusivo (s)':>16}{'exclusivo (s)':>16}\n"
+        for nombre, llamadas, inclusivo, exclusivo in self.plano()[:limite]:
+            yield f"{nombre:<24}{llamadas:>10}{inclusivo:>16.6f}{exclusivo:>16.6f}\n"
+        yield "\n"
+        yield f"{'nodo':<24}{'ejecuciones':>12}\n"
+        for tipo, cantidad in self.nodos.most_common(limite):
+            yield f"{tipo:<24}{cantidad:>12}\n"
+        yield "\n"
+        yield f"{'línea':<8}{'ejecuciones':>12}\n"
+        for linea, cantidad in self.lineas.most_common(limite):
+            yield f"{linea:<8}{cantidad:>12}\n"
+        if self.ciclos:
+            yield "\n"
+            yield f"{'ciclo':<16}{'entradas':>10}{'iteraciones':>14}\n"
+            for (tipo, linea), (entradas, iteraciones) in sorted(
+                    self.ciclos.items(), key=lambda item: item[1][1], reverse=True)[:limite]:
+                yield f"{f'{tipo} (línea {linea})':<16}{entradas:>10}{iteraciones:>14}\n"
+
+    def reporte(self, limite=20):
+        return "".join(self.lineas_reporte(limite))
+
+    def lineas_colapsadas(self):
+        """Pilas colapsadas para herramientas de flamegraph (microsegundos exclusivos)"""
+        for pila, segundos in sorted(self.pilas.items()):
+            microsegundos = round(segundos * 1e6)
+            if microsegundos:
+                yield f"{pila} {microsegundos}\n"
+
+    def escribir_colapsado(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.writelines(self.lineas_colapsadas())
+
+    def a_diccionario(self):
+        return {
+            "funciones": {nombre: {"llamadas": llamadas, "inclusivo": inclusivo, "exclusivo": exclusivo}
+                          for nombre, llamadas, inclusivo, exclusivo in self.plano()},
+            "nodos": dict(self.nodos),
+            "lineas": dict(self.lineas),
+            "ciclos": [{"tipo": tipo, "linea": linea, "entradas": entradas, "iteraciones": iteraciones}
+                       for (tipo, linea), (entradas, iteraciones) in self.ciclos.items()],
+        }
+
+
+def main(argumentos=None):
+    from analizador_semantico import Interprete
+
+    lector = argparse.ArgumentParser(description="Ejecuta un programa y muestra su perfil de ejecución")
+    lector.add_argument("programa", help="archivo con el código fuente")
+    lector.add_argument("--compilado", action="store_true", help="ejecuta en modo compilado (closures)")
+    lector.add_argument("--entradas", nargs="*", type=int, default=[], help="valores para leer()")
+    lector.add_argument("--colapsado", help="archivo de pilas colapsadas para un flamegraph")
+    opciones = lector.parse_args(argumentos)
+
+    with open(opciones.programa, encoding="utf-8") as archivo:
+        codigo = archivo.read()
+    perfil = PerfilEjecucion()
+    interprete = Interprete(debug=False, compilado=opciones.compilado, perfil=perfil)
+    interprete.establecer_entradas(list(opciones.entradas))
+    # Las salidas del programa no se mezclan con el reporte
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultado = interprete.ejecutar(codigo)
+    if not resultado["exito"]:
+        print(resultado.get("error"), file=sys.stderr)
+        return 1
+    sys.stdout.writelines(perfil.lineas_reporte())
+    if opciones.colapsado:
+        perfil.escribir_colapsado(opciones.colapsado)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Representación intermedia de GeneradorCodigoIntermedio: cuádruplas tipadas.
+
+Cada instrucción es una Cuadrupla (operación, argumento1, argumento2,
+resultado) con un código de operación entero. Los operandos son nombres de
+variables (str), Temporal o Constante, así que no hace falta volver a leer
+texto para distinguirlos. El texto de tres direcciones solo se genera al
+imprimir el programa.
+"""
+from optimizador import OPERADORES
+
+
+# Códigos de operación
+ASIGNAR = 0
+SUMA = 1
+RESTA = 2
+MULTIPLICACION = 3
+DIVISION = 4
+IGUAL = 5
+DISTINTO = 6
+MENOR = 7
+MAYOR = 8
+MENOR_IGUAL = 9
+MAYOR_IGUAL = 10
+SALTAR = 11
+SALTAR_SI = 12
+SALTAR_SI_FALSO = 13
+ESCRIBIR = 14
+LEER = 15
+ETIQUETA = 16
+FUNCION = 17
+COMENTARIO = 18
+LLAMAR = 19
+RETORNAR = 20
+
+SIMBOLOS_BINARIOS = {
+    SUMA: "+", RESTA: "-", MULTIPLICACION: "*", DIVISION: "/",
+    IGUAL: "==", DISTINTO: "!=", MENOR: "<", MAYOR: ">", MENOR_IGUAL: "<=", MAYOR_IGUAL: ">=",
+}
+OPERACIONES_BINARIAS = {simbolo: codigo for codigo, simbolo in SIMBOLOS_BINARIOS.items()}
+FUNCIONES_BINARIAS = {codigo: OPERADORES[simbolo] for codigo, simbolo in SIMBOLOS_BINARIOS.items()}
+
+SALTOS_CONDICIONALES = (SALTAR_SI, SALTAR_SI_FALSO)
+SALTOS = (SALTAR,) + SALTOS_CONDICIONALES
+# Marcas que ordenan el código pero no se ejecutan
+MARCAS = (ETIQUETA, FUNCION, COMENTARIO)
+
+
+class Constante:
+    """Operando constante; dos constantes son iguales si tienen el mismo tipo y valor"""
+    __slots__ = ("valor",)
+
+    def __init__(self, valor):
+        self.valor = valor
+
+    def __eq__(self, otro):
+        return isinstance(otro, Constante) and type(self.valor) is type(otro.valor) and self.valor == otro.valor
+
+    def __hash__(self):
+        return hash((type(self.valor), self.valor))
+
+    def __repr__(self):
+        return f"Constante({self.valor!r})"
+
+    def __str__(self):
+        if isinstance(self.valor, str):
+            return f'"{self.valor}"'
+        if isinstance(self.valor, bool):
+            return "true" if self.valor else "false"
+        return str(self.valor)
+
+
+class Temporal:
+    """Variable temporal creada por el generador (t0, t1, ...)"""
+    __slots__ = ("numero",)
+
+    def __init__(self, numero):
+        self.numero = numero
+
+    def __eq__(self, otro):
+        return isinstance(otro, Temporal) and self.numero == otro.numero
+
+    def __hash__(self):
+        return hash(("t", self.numero))
+
+    def __repr__(self):
+        return f"Temporal({self.numero})"
+
+    def __str__(self):
+        return f"t{self.numero}"
+
+
+class Cuadrupla:
+    """Instrucción de tres direcciones.
+
+    Los saltos y las llamadas guardan el nombre de la etiqueta o función
+    destino en resultado; las marcas (ETIQUETA, FUNCION, COMENTARIO) guardan
+    ahí su nombre o texto.
+    """
+    __slots__ = ("operacion", "argumento1", "argumento2", "resultado")
+
+    def __init__(self, operacion, argumento1=None, argumento2=None, resultado=None):
+        self.operacion = operacion
+        self.argumento1 = argumento1
+        self.argumento2 = argumento2
+        self.resultado = resultado
+
+    def __repr__(self):
+        return f"Cuadrupla({self.operacion}, {self.argumento1!r}, {self.argumento2!r}, {self.resultado!r})"
+
+    def __str__(self):
+        operacion = self.operacion
+        if operacion == ASIGNAR:
+            return f"{self.resultado} = {self.argumento1}"
+        if operacion in SIMBOLOS_BINARIOS:
+            return f"{self.resultado} = {self.argumento1} {SIMBOLOS_BINARIOS[operacion]} {self.argumento2}"
+        if operacion == SALTAR:
+            return f"goto {self.resultado}"
+        if operacion == SALTAR_SI:
+            return f"if {self.argumento1} goto {self.resultado}"
+        if operacion == SALTAR_SI_FALSO:
+            return f"ifFalse {self.argumento1} goto {self.resultado}"
+        if operacion == ESCRIBIR:
+            return f"print {self.argumento1}"
+        if operacion == LEER:
+            return f"read {self.resultado}"
+        if operacion in (ETIQUETA, FUNCION):
+            return f"{self.resultado}:"
+        if operacion == COMENTARIO:
+            return f"# {self.resultado}"
+        if operacion == LLAMAR:
+            return f"call {self.resultado}"
+        if operacion == RETORNAR:
+            return "return"
+        return f"<operación {operacion}>"
+
+    def usos(self):
+        """Operandos que la instrucción lee"""
+        operacion = self.operacion
+        if operacion in SIMBOLOS_BINARIOS:
+            return (self.argumento1, self.argumento2)
+        if operacion == ASIGNAR or operacion == ESCRIBIR or operacion in SALTOS_CONDICIONALES:
+            return (self.argumento1,)
+        return ()
+
+    def definicion(self):
+        """Variable o temporal que la instrucción escribe, o None"""
+        operacion = self.operacion
+        if operacion == ASIGNAR or operacion == LEER or operacion in SIMBOLOS_BINARIOS:
+            return self.resultado
+        return None
+
+
+class ProgramaIntermedio:
+    """Lista de cuádruplas con sus etiquetas resueltas a índices"""
+    def __init__(self, cuadruplas=None):
+        self.cuadruplas = cuadruplas if cuadruplas is not None else []
+        self._etiquetas = None
+
+    def agregar(self, operacion, argumento1=None, argumento2=None, resultado=None):
+        self.cuadruplas.append(Cuadrupla(operacion, argumento1, argumento2, resultado))
+        self._etiquetas = None
+
+    @property
+    def etiquetas(self):
+        """Índice de cada etiqueta y función, calculado una vez por versión del código"""
+        if self._etiquetas is None:
+            self._etiquetas = {
+                cuadrupla.resultado: indice for indice, cuadrupla in enumerate(self.cuadruplas)
+                if cuadrupla.operacion == ETIQUETA or cuadrupla.operacion == FUNCION
+            }
+        return self._etiquetas
+
+    def instrucciones(self):
+        """Cantidad de instrucciones ejecutables (sin marcas)"""
+        return sum(1 for cuadrupla in self.cuadruplas if cuadrupla.operacion not in MARCAS)
+
+    def lineas(self):
+        """Texto de tres direcciones, una línea por cuádrupla, generado bajo demanda"""
+        for cuadrupla in self.cuadruplas:
+            yield str(cuadrupla)
+
+    def __iter__(self):
+        return iter(self.cuadruplas)
+
+    def __len__(self):
+        return len(self.cuadruplas)
+
+    def __getitem__(self, indice):
+        return self.cuadruplas[indice]
+
+    def __str__(self):
+        return "\n".join(self.lineas())
@@ -0,0 +1,490 @@
+"""Servidor local de análisis sobre asyncio con procesos que mantienen los parsers cargados.
+
+Protocolo: JSON-RPC 2.0, un objeto JSON por línea, por TCP en localhost o por
+un socket Unix. Métodos:
+
+    analizar      {"codigo": str, "optimizar": bool, "ast": bool}
+    ejecutar      {"codigo": str, "entradas": [int], "compilado": bool}
+    estadisticas  {}
+
+Cada proceso del grupo importa los analizadores una sola vez (las tablas de
+Lark y PLY quedan en memoria), así que una petición no paga el arranque de
+Python ni la construcción de los parsers. Con todos los procesos ocupados
+el servidor deja de leer de la conexión hasta que se libera un cupo, y
+cuando hay demasiadas peticiones esperando responde "servidor ocupado" en
+lugar de encolarlas. estadisticas informa los percentiles de latencia de
+cada método.
+
+Cada petición tiene un límite de tiempo. En el proceso, un hilo vigila la
+ejecución y llama a Interprete.cancelar() al vencer el límite o cuando la
+conexión del cliente falla; la respuesta es un error "tiempo agotado" con las
+salidas producidas hasta entonces. Si un trabajo sigue corriendo pasado el
+límite más un margen (por ejemplo, un análisis que no revisa la
+cancelación), el servidor responde el mismo error, termina los procesos del
+grupo y crea uno nuevo.
+
+Uso: python servidor_analisis.py [--puerto 8765 | --socket RUTA] [--procesos N]
+                                 [--pendientes N] [--espera N] [--limite SEGUNDOS]
+"""
+import argparse
+import asyncio
+import collections
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from analizador_semantico import Interprete, analizar_programa
+
+
+PUERTO_PREDETERMINADO = 8765
+# Latencias guardadas por método para calcular los percentiles
+MUESTRAS_LATENCIA = 10000
+PERCENTILES = (50, 90, 99)
+# Segundos que puede durar un trabajo en el proceso
+LIMITE_PREDETERMINADO = 10.0
+# Segundos de más que espera el servidor antes de reciclar el grupo de procesos
+MARGEN_LIMITE = 5.0
+# Cada cuánto revisa el hilo vigilante el límite y la marca de cancelación
+INTERVALO_VIGILANCIA = 0.05
+
+# Códigos de error de JSON-RPC 2.0 (-32001 y -32002 son propios: servidor ocupado y tiempo agotado)
+ERROR_JSON = -32700
+ERROR_PETICION = -32600
+ERROR_METODO = -32601
+ERROR_PARAMETROS = -32602
+ERROR_INTERNO = -32603
+ERROR_OCUPADO = -32001
+ERROR_TIEMPO = -32002
+
+# Los procesos se crean desde un proceso limpio: con fork, los que reemplazan a un grupo
+# reciclado heredarían las conexiones abiertas y el manejador de SIGTERM del servidor
+CONTEXTO = multiprocessing.get_context("forkserver")
+CONTEXTO.set_forkserver_preload(["analizador_semantico"])
+
+# Marcas de cancelación compartidas con el servidor, una por petición en curso (ver iniciar_proceso)
+_cancelaciones = None
+
+
+def resumen_analisis(resultado, incluir_ast=False):
+    """Resultado de analizar_programa convertible a JSON"""
+    resumen = {"exito": resultado["exito"]}
+    if "mensaje" in resultado:
+        resumen.update(error_tipo=resultado["error_tipo"], mensaje=resultado["mensaje"])
+        return resumen
+    resumen.update(
+        errores=list(resultado["errores"]),
+        tabla_simbolos=resultado["tabla_simbolos"],
+        funciones=list(resultado["tabla_funciones"]),
+        simbolos=len(resultado["tabla_ambitos"]),
+    )
+    if incluir_ast:
+        resumen["ast"] = resultado["ast"].a_diccionario()
+    return resumen
+
+
+def trabajo_analizar(codigo, optimizar=False, ast=False):
+    return resumen_analisis(analizar_programa(codigo, optimizar=optimizar), ast)
+
+
+def trabajo_ejecutar(codigo, entradas=(), compilado=False, limite=None, marca=None):
+    interprete = Interprete(debug=False, compilado=compilado)
+    interprete.establecer_entradas(list(entradas))
+    vence = time.monotonic() + limite if limite is not None else None
+    terminado = threading.Event()
+    vigilante = threading.Thread(target=vigilar, args=(interprete, vence, marca, terminado), daemon=True)
+    vigilante.start()
+    try:
+        # El intérprete imprime el progreso; la respuesta ya lleva las salidas
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado = interprete.ejecutar(codigo)
+    finally:
+        terminado.set()
+        vigilante.join()
+    if resultado.get("cancelado") and vence is not None and time.monotonic() >= vence:
+        raise ErrorPeticion(ERROR_TIEMPO, f"Tiempo agotado ({limite:g} s)", {"salidas": resultado["salidas"]})
+    return resultado
+
+
+def vigilar(interprete, vence, marca, terminado):
+    """Cancela el intérprete al llegar a vence o cuando el servidor activa la marca de la petición"""
+    while not terminado.wait(INTERVALO_VIGILANCIA):
+        if (vence is not None and time.monotonic() >= vence) or (marca is not None and _cancelaciones[marca]):
+            interprete.cancelar()
+            return
+
+
+def iniciar_proceso(cancelaciones):
+    global _cancelaciones
+    _cancelaciones = cancelaciones
+
+
+def calentar():
+    """Tarea vacía para crear los procesos del grupo antes de la primera petición"""
+    return os.getpid()
+
+
+# Método -> (función que corre en el grupo de procesos, parámetros que acepta, si se puede cancelar)
+TRABAJOS = {
+    "analizar": (trabajo_analizar, {"codigo", "optimizar", "ast"}, False),
+    "ejecutar": (trabajo_ejecutar, {"codigo", "entradas", "compilado"}, True),
+}
+
+
+def _llamar(trabajo, parametros):
+    return trabajo(**parametros)
+
+
+def terminar_grupo(grupo):
+    """Cierra un ProcessPoolExecutor sin esperar sus trabajos: termina sus procesos"""
+    # Antes de Python 3.14 (terminate_workers) el grupo no expone sus procesos
+    procesos = list((grupo._processes or {}).values())
+    grupo.shutdown(wait=False, cancel_futures=True)
+    for proceso in procesos:
+        proceso.terminate()
+    for proceso in procesos:
+        proceso.join()
+
+
+def percentil(ordenados, porcentaje):
+    """Percentil por rango más cercano de una lista ordenada"""
+    indice = max(0, -(-len(ordenados) * porcentaje // 100) - 1)
+    return ordenados[min(indice, len(ordenados) - 1)]
+
+
+class ErrorPeticion(Exception):
+    def __init__(self, codigo, mensaje, datos=None):
+        super().__init__(mensaje)
+        self.codigo = codigo
+        self.datos = datos
+
+    def __reduce__(self):
+        # Los trabajos la lanzan en otro proceso
+        return type(self), (self.codigo, str(self), self.datos)
+
+    def respuesta(self, identificador):
+        error = {"code": self.codigo, "message": str(self)}
+        if self.datos is not None:
+            error["data"] = self.datos
+        return {"jsonrpc": "2.0", "id": identificador, "error": error}
+
+
+class ServidorAnalisis:
+    """Atiende conexiones JSON-RPC y reparte los trabajos en un ProcessPoolExecutor"""
+    def __init__(self, procesos=None, pendientes=None, espera=None, limite=LIMITE_PREDETERMINADO):
+        self.procesos = procesos or os.cpu_count() or 1
+        # Peticiones en los procesos a la vez y peticiones que pueden esperar un cupo
+        self.pendientes = pendientes or self.procesos * 2
+        self.limite_espera = espera if espera is not None else self.pendientes * 8
+        self.limite = limite
+        self.cupos = asyncio.Semaphore(self.pendientes)
+        self.en_espera = 0
+        self.en_curso = 0
+        self.grupo = None
+        # Una marca por petición en el grupo; una cancelada sigue ocupando la suya hasta que su proceso la suelta
+        self.cancelaciones = CONTEXTO.RawArray("b", self.pendientes + self.procesos)
+        self.marcas_libres = collections.deque(range(len(self.cancelaciones)))
+        self.atendidas = 0
+        self.rechazadas = 0
+        self.vencidas = 0
+        self.reciclados = 0
+        self.latencias = {}
+
+    def crear_grupo(self):
+        return ProcessPoolExecutor(max_workers=self.procesos, mp_context=CONTEXTO, initializer=iniciar_proceso,
+                                   initargs=(self.cancelaciones,))
+
+    async def iniciar(self):
+        self.grupo = self.crear_grupo()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.grupo, calentar) for _ in range(self.procesos)))
+
+    def reciclar(self, grupo):
+        """Reemplaza el grupo por uno nuevo y termina sus procesos (uno puede estar trabado)"""
+        if grupo is not self.grupo:
+            return
+        self.reciclados += 1
+        self.grupo = self.crear_grupo()
+        for _ in range(self.procesos):
+            self.grupo.submit(calentar)
+        terminar_grupo(grupo)
+
+    def cerrar(self):
+        if self.grupo is not None:
+            # Sin esperar a los trabajos en curso: alguno podría no terminar nunca
+            terminar_grupo(self.grupo)
+            self.grupo = None
+
+    def registrar_latencia(self, metodo, segundos):
+        muestras = self.latencias.get(metodo)
+        if muestras is None:
+            muestras = self.latencias[metodo] = collections.deque(maxlen=MUESTRAS_LATENCIA)
+        muestras.append(segundos)
+
+    def estadisticas(self):
+        latencias = {}
+        for metodo, muestras in self.latencias.items():
+            ordenados = sorted(muestras)
+            latencias[metodo] = {"cantidad": len(ordenados), "max_ms": ordenados[-1] * 1000}
+            for porcentaje in PERCENTILES:
+                latencias[metodo][f"p{porcentaje}_ms"] = percentil(ordenados, porcentaje) * 1000
+        return {
+            "procesos": self.procesos,
+            "atendidas": self.atendidas,
+            "rechazadas": self.rechazadas,
+            "vencidas": self.vencidas,
+            "reciclados": self.reciclados,
+            "en_curso": self.en_curso,
+            "en_espera": self.en_espera,
+            "latencias": latencias,
+        }
+
+    def leer_peticion(self, linea):
+        """(id, método, parámetros) de una línea JSON-RPC; lanza ErrorPeticion si no es válida"""
+        try:
+            peticion = json.loads(linea)
+        except ValueError:
+            raise ErrorPeticion(ERROR_JSON, "JSON inválido")
+        if not isinstance(peticion, dict) or not isinstance(peticion.get("method"), str):
+            raise ErrorPeticion(ERROR_PETICION, "Petición inválida")
+        parametros = peticion.get("params", {})
+        if not isinstance(parametros, dict):
+            raise ErrorPeticion(ERROR_PARAMETROS, "Los parámetros deben ser un objeto")
+        return peticion.get("id"), peticion["method"], parametros
+
+    async def ejecutar_trabajo(self, metodo, parametros):
+        if metodo not in TRABAJOS:
+            raise ErrorPeticion(ERROR_METODO, f"Método '{metodo}' no encontrado")
+        trabajo, aceptados, cancelable = TRABAJOS[metodo]
+        desconocidos = set(parametros) - aceptados
+        if desconocidos:
+            raise ErrorPeticion(ERROR_PARAMETROS, f"Parámetros desconocidos: {', '.join(sorted(desconocidos))}")
+        if not isinstance(parametros.get("codigo"), str):
+            raise ErrorPeticion(ERROR_PARAMETROS, "Falta el parámetro 'codigo'")
+
+        marca = None
+        if cancelable:
+            parametros = dict(parametros, limite=self.limite)
+            if self.marcas_libres:
+                marca = parametros["marca"] = self.marcas_libres.popleft()
+                self.cancelaciones[marca] = 0
+        grupo = self.grupo
+        futuro = grupo.submit(_llamar, trabajo, parametros)
+        if marca is not None:
+            # La marca se libera cuando el proceso suelta el trabajo, no cuando se responde
+            loop = asyncio.get_running_loop()
+            futuro.add_done_callback(lambda _: loop.call_soon_threadsafe(self.marcas_libres.append, marca))
+        limite = None if self.limite is None else self.limite + MARGEN_LIMITE
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(futuro), limite)
+        except asyncio.TimeoutError:
+            # El trabajo no respetó el límite: su proceso no se puede recuperar
+            self.reciclar(grupo)
+            raise ErrorPeticion(ERROR_TIEMPO, f"Tiempo agotado ({self.limite:g} s)")
+        except BrokenProcessPool:
+            # Un proceso murió (o se terminó al reciclar por otra petición)
+            self.reciclar(grupo)
+            raise ErrorPeticion(ERROR_INTERNO, "El proceso de trabajo terminó antes de responder")
+        except asyncio.CancelledError:
+            # Conexión caída o servidor cerrándose: el vigilante del proceso detiene la ejecución
+            if marca is not None:
+                self.cancelaciones[marca] = 1
+            raise
+
+    def reservar_cupo(self):
+        """Cuenta una petición en curso; devuelve la función que la descuenta y libera su cupo una sola vez"""
+        self.en_curso += 1
+        pendiente = True
+
+        def liberar(*_):
+            nonlocal pendiente
+            if pendiente:
+                pendiente = False
+                self.en_curso -= 1
+                self.cupos.release()
+
+        return liberar
+
+    async def responder(self, inicio, identificador, metodo, parametros, escribir, liberar):
+        try:
+            try:
+                resultado = await self.ejecutar_trabajo(metodo, parametros)
+                respuesta = {"jsonrpc": "2.0", "id": identificador, "result": resultado}
+            except ErrorPeticion as e:
+                if e.codigo == ERROR_TIEMPO:
+                    self.vencidas += 1
+                respuesta = e.respuesta(identificador)
+            except Exception as e:
+                respuesta = {"jsonrpc": "2.0", "id": identificador,
+                             "error": {"code": ERROR_INTERNO, "message": f"Error interno: {e}"}}
+        finally:
+            liberar()
+        try:
+            await escribir(respuesta)
+        except ConnectionError:
+            return
+        self.atendidas += 1
+        # Los métodos inexistentes se agrupan para no crear una entrada por nombre
+        self.registrar_latencia(metodo if metodo in TRABAJOS else "desconocido", time.perf_counter() - inicio)
+
+    async def atender(self, lector, escritor):
+        """Lee peticiones de una conexión; cada una se responde cuando termina, en cualquier orden.
+
+        Cuando el cliente deja de enviar (también con un cierre a medias) se
+        responden las peticiones pendientes; si la conexión falla al leer o al
+        escribir, se cancelan.
+        """
+        bloqueo_escritura = asyncio.Lock()
+        tareas = set()
+
+        def cancelar():
+            actual = asyncio.current_task()
+            for tarea in tareas:
+                if tarea is not actual:
+                    tarea.cancel()
+
+        async def escribir(respuesta):
+            datos = json.dumps(respuesta, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+            async with bloqueo_escritura:
+                try:
+                    escritor.write(datos)
+                    await escritor.drain()
+                except ConnectionError:
+                    # Nadie va a leer las demás respuestas
+                    cancelar()
+                    raise
+
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                inicio = time.perf_counter()
+                try:
+                    identificador, metodo, parametros = self.leer_peticion(linea)
+                except ErrorPeticion as e:
+                    await escribir(e.respuesta(None))
+                    continue
+                if metodo == "estadisticas":
+                    await escribir({"jsonrpc": "2.0", "id": identificador, "result": self.estadisticas()})
+                    continue
+                if self.cupos.locked() and self.en_espera >= self.limite_espera:
+                    self.rechazadas += 1
+                    await escribir({"jsonrpc": "2.0", "id": identificador,
+                                    "error": {"code": ERROR_OCUPADO, "message": "Servidor ocupado"}})
+                    continue
+                # Sin cupo no se lee la siguiente línea: la conexión queda frenada por TCP
+                self.en_espera += 1
+                try:
+                    await self.cupos.acquire()
+                finally:
+                    self.en_espera -= 1
+                liberar = self.reservar_cupo()
+                tarea = asyncio.create_task(self.responder(inicio, identificador, metodo, parametros, escribir,
+                                                           liberar))
+                # Una tarea cancelada antes de empezar no llega al finally de responder
+                tarea.add_done_callback(liberar)
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+            await asyncio.gather(*tareas, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            # Conexión caída o servidor cerrándose: lo que quede sin responder se cancela
+            cancelar()
+            escritor.close()
+
+
+async def servir(servidor, host="127.0.0.1", puerto=PUERTO_PREDETERMINADO, ruta_socket=None, listo=None):
+    """Inicia el grupo de procesos y atiende conexiones hasta que se cancela o llega SIGTERM"""
+    loop = asyncio.get_running_loop()
+    # Fuera del hilo principal (servidor embebido) no se pueden instalar manejadores de señales
+    if threading.current_thread() is threading.main_thread():
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    await servidor.iniciar()
+    try:
+        if ruta_socket is not None:
+            servidor_red = await asyncio.start_unix_server(servidor.atender, path=ruta_socket)
+        else:
+            servidor_red = await asyncio.start_server(servidor.atender, host, puerto)
+        async with servidor_red:
+            if listo is not None:
+                listo(servidor_red)
+            await servidor_red.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        servidor.cerrar()
+        if ruta_socket is not None:
+            with contextlib.suppress(OSError):
+                os.remove(ruta_socket)
+
+
+class ClienteAnalisis:
+    """Cliente síncrono de una conexión: una petición y su respuesta a la vez"""
+    def __init__(self, host="127.0.0.1", puerto=PUERTO_PREDETERMINADO, ruta_socket=None):
+        if ruta_socket is not None:
+            self.conexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.conexion.connect(ruta_socket)
+        else:
+            self.conexion = socket.create_connection((host, puerto))
+        self.archivo = self.conexion.makefile("rwb")
+        self.siguiente_id = 0
+
+    def llamar(self, metodo, **parametros):
+        """Resultado del método; lanza RuntimeError si el servidor responde con un error"""
+        self.siguiente_id += 1
+        peticion = {"jsonrpc": "2.0", "id": self.siguiente_id, "method": metodo, "params": parametros}
+        self.archivo.write(json.dumps(peticion).encode("utf-8") + b"\n")
+        self.archivo.flush()
+        respuesta = json.loads(self.archivo.readline())
+        if "error" in respuesta:
+            raise RuntimeError(f"{respuesta['error']['code']}: {respuesta['error']['message']}")
+        return respuesta["result"]
+
+    def cerrar(self):
+        self.archivo.close()
+        self.conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def main(argumentos=None):
+    lector = argparse.ArgumentParser(description="Servidor local de análisis (JSON-RPC por líneas)")
+    lector.add_argument("--host", default="127.0.0.1")
+    lector.add_argument("--puerto", type=int, default=PUERTO_PREDETERMINADO)
+    lector.add_argument("--socket", help="ruta de un socket Unix (en lugar de TCP)")
+    lector.add_argument("--procesos", type=int, default=None, help="procesos de trabajo (por defecto, uno por núcleo)")
+    lector.add_argument("--pendientes", type=int, default=None, help="peticiones en proceso a la vez")
+    lector.add_argument("--espera", type=int, default=None, help="peticiones que pueden esperar un cupo")
+    lector.add_argument("--limite", type=float, default=LIMITE_PREDETERMINADO,
+                        help="segundos que puede durar una petición en su proceso")
+    opciones = lector.parse_args(argumentos)
+
+    servidor = ServidorAnalisis(opciones.procesos, opciones.pendientes, opciones.espera, opciones.limite)
+    direccion = opciones.socket or f"{opciones.host}:{opciones.puerto}"
+    try:
+        asyncio.run(servir(servidor, opciones.host, opciones.puerto, opciones.socket,
+                           listo=lambda _: print(f"Escuchando en {direccion}", file=sys.stderr, flush=True)))
+    except KeyboardInterrupt:
+        pass
+    json.dump(servidor.estadisticas(), sys.stderr, ensure_ascii=False, indent=2)
+    print(file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Análisis reentrante: cada sesión tiene su lexer, su parser de PLY y sus errores.
+
+Los módulos del analizador solo guardan plantillas de solo lectura (reglas
+del lexer, tablas LR, parser de Lark); el estado de cada análisis vive en la
+SesionAnalisis que lo hace. Una sesión analiza un programa a la vez, así que
+para analizar en paralelo se usa una sesión por hilo: sesion_del_hilo()
+la crea la primera vez, y analizar_en_paralelo y analizar_async reparten los
+programas en un grupo de hilos.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from analizador_semantico import Interprete
+from analizador_sintactico import nuevo_parser
+from compilacion import Compilacion
+from lexico import nuevo_lexer
+
+
+class SesionAnalisis:
+    def __init__(self):
+        self.lexer = nuevo_lexer()
+        self.parser_sintactico = nuevo_parser()
+        self.analizados = 0
+
+    def compilacion(self, codigo):
+        """Compilacion del programa con el lexer y el parser de esta sesión"""
+        return Compilacion(codigo, self.lexer, self.parser_sintactico)
+
+    def analizar(self, codigo):
+        """Vistas léxica, sintáctica y semántica del programa"""
+        compilacion = self.compilacion(codigo)
+        tokens, palabras_reservadas, errores_lexicos = compilacion.vista_tokens()
+        try:
+            sintactico, errores_sintacticos = compilacion.vista_sintactica()
+        except Exception as e:
+            sintactico, errores_sintacticos = None, [f"Error: {str(e)}"]
+        semantico = compilacion.vista_semantica()
+        self.analizados += 1
+        return {
+            "exito": not errores_lexicos and not errores_sintacticos and semantico["exito"],
+            "tokens": tokens,
+            "palabras_reservadas": palabras_reservadas,
+            "errores_lexicos": errores_lexicos,
+            "sintactico": sintactico,
+            "errores_sintacticos": list(errores_sintacticos),
+            "semantico": semantico,
+        }
+
+    def ejecutar(self, codigo, entradas=(), compilado=False):
+        """Analiza y ejecuta el programa con un Interprete propio"""
+        interprete = Interprete(debug=False, compilado=compilado)
+        interprete.establecer_entradas(list(entradas))
+        return interprete.ejecutar_analisis(self.compilacion(codigo).vista_semantica())
+
+
+_local = threading.local()
+
+
+def sesion_del_hilo():
+    """SesionAnalisis del hilo actual (se crea en el primer uso)"""
+    sesion = getattr(_local, "sesion", None)
+    if sesion is None:
+        sesion = _local.sesion = SesionAnalisis()
+    return sesion
+
+
+def analizar_en_hilo(codigo):
+    return sesion_del_hilo().analizar(codigo)
+
+
+def analizar_en_paralelo(codigos, hilos=None):
+    """Resultado de SesionAnalisis.analizar de cada programa, en el mismo orden"""
+    with ThreadPoolExecutor(max_workers=hilos) as grupo:
+        return list(grupo.map(analizar_en_hilo, codigos))
+
+
+async def analizar_async(codigo, ejecutor=None):
+    """Analiza en un hilo del ejecutor (el predeterminado del loop si es None) sin bloquear el loop"""
+    return await asyncio.get_running_loop().run_in_executor(ejecutor, analizar_en_hilo, codigo)
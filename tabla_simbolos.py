@@ -0,0 +1,247 @@
+"""Tabla de símbolos por ámbito que ASTBuilder llena mientras transforma.
+
+El ámbito global contiene las funciones; cada función es un ámbito hijo y
+cada cuerpo de if, else, while y for es un ámbito de bloque dentro de ella.
+Cada símbolo guarda su tipo y valor inicial, la línea donde se declara y las
+líneas donde se usa. Los nombres los resuelve ASTBuilder con sus propias
+reglas: una variable es visible en toda su función desde que se declara, y
+las de la primera función se tratan como globales.
+
+ASTBuilder reduce de abajo hacia arriba, así que un símbolo se declara antes
+de que exista el ámbito del bloque que lo contiene: queda sin ámbito hasta
+que el bloque (o la función) lo adopta al reducirse.
+
+Las consultas usan índices: por nombre y por tipo (diccionarios que se
+llenan al declarar), por línea de declaración (lista ordenada para búsqueda
+binaria) y por línea de uso (diccionario). Los dos últimos se arman en la
+primera consulta.
+"""
+import bisect
+
+
+class Simbolo:
+    __slots__ = ("nombre", "tipo", "valor", "linea", "ambito", "usos")
+
+    def __init__(self, nombre, tipo, valor, linea, ambito=None):
+        self.nombre = nombre
+        self.tipo = tipo
+        self.valor = valor
+        self.linea = linea
+        self.ambito = ambito
+        # (línea, "lectura" | "escritura" | "llamada") de cada uso, en orden del código
+        self.usos = []
+
+    @property
+    def funcion(self):
+        return self.ambito.funcion
+
+    def __repr__(self):
+        return f"Simbolo({self.nombre!r}, {self.tipo!r}, linea={self.linea})"
+
+
+class Ambito:
+    __slots__ = ("nombre", "clase", "padre", "hijos", "simbolos", "linea", "funcion")
+
+    def __init__(self, nombre, clase, padre=None, linea=None):
+        self.nombre = nombre
+        # "global", "funcion" o "bloque"
+        self.clase = clase
+        self.padre = None
+        self.hijos = []
+        self.simbolos = {}
+        self.linea = linea
+        # Nombre de la función que contiene al ámbito (None en el global)
+        self.funcion = None
+        if clase == "funcion":
+            self.funcion = nombre
+        if padre is not None:
+            padre.adoptar((self,))
+
+    def adoptar(self, contenido):
+        """Pasa a este ámbito los símbolos y ámbitos de contenido que aún no tienen uno"""
+        for elemento in contenido:
+            if isinstance(elemento, Simbolo):
+                elemento.ambito = self
+                self.simbolos.setdefault(elemento.nombre, elemento)
+            else:
+                elemento.padre = self
+                self.hijos.append(elemento)
+                if self.funcion is not None:
+                    for ambito in elemento.recorrer():
+                        ambito.funcion = self.funcion
+
+    def recorrer(self):
+        """El ámbito y todos sus descendientes, en preorden"""
+        pendientes = [self]
+        while pendientes:
+            ambito = pendientes.pop()
+            yield ambito
+            pendientes.extend(reversed(ambito.hijos))
+
+    def __repr__(self):
+        return f"Ambito({self.nombre!r}, {self.clase!r}, simbolos={len(self.simbolos)})"
+
+
+class TablaSimbolos:
+    def __init__(self):
+        self.global_ = Ambito("global", "global")
+        # Todos los símbolos, en orden de declaración
+        self.simbolos = []
+        # Usos de nombres que no se pudieron resolver: (nombre, línea, función, clase de uso)
+        self.no_resueltos = []
+        # Llamadas a funciones sin resolver todavía (ver resolver_llamadas): (nombre, línea, función)
+        self.llamadas = []
+        self.por_nombre = {}
+        self.por_tipo = {}
+        # Variables visibles en cada función y las de la primera función (globales para el analizador)
+        self.visibles = {}
+        self.globales = {}
+        self._indice_nombres = None
+        self._indice_lineas = None
+        self._usos_por_linea = None
+
+    def declarar(self, simbolo, indice=None):
+        """Agrega simbolo a los índices (y a su ámbito, si ya tiene); indice lo ubica en simbolos"""
+        if simbolo.ambito is not None:
+            simbolo.ambito.simbolos.setdefault(simbolo.nombre, simbolo)
+        if indice is None:
+            self.simbolos.append(simbolo)
+        else:
+            self.simbolos.insert(indice, simbolo)
+        self.por_nombre.setdefault(simbolo.nombre, []).append(simbolo)
+        self.por_tipo.setdefault(simbolo.tipo, []).append(simbolo)
+        self._indice_nombres = self._indice_lineas = self._usos_por_linea = None
+        return simbolo
+
+    def funciones(self):
+        return self.global_.hijos
+
+    def declarar_funcion(self, ambito, visibles, indice=None):
+        """Agrega el ámbito de una función ya armada y el símbolo de la función en el global.
+
+        visibles son sus variables por nombre; las de la primera función son las globales.
+        """
+        if not self.global_.hijos:
+            self.globales = visibles
+        self.global_.adoptar((ambito,))
+        self.visibles[ambito.nombre] = visibles
+        return self.declarar(Simbolo(ambito.nombre, "funcion", "-", ambito.linea, self.global_), indice)
+
+    def resolver_llamadas(self):
+        """Registra cada llamada pendiente como uso de su función (al final: una función
+        puede llamar a otra declarada después)"""
+        for nombre, linea, funcion in self.llamadas:
+            simbolo = self.global_.simbolos.get(nombre)
+            if simbolo is None:
+                self.no_resueltos.append((nombre, linea, funcion, "llamada"))
+            else:
+                simbolo.usos.append((linea, "llamada"))
+        self.llamadas = []
+
+    def agregar_funcion(self, otra, desplazamiento=0):
+        """Copia en esta tabla la función de otra tabla, analizada aparte, con sus
+        líneas desplazadas. otra no se modifica, así puede volver a copiarse.
+
+        Los nombres que otra no pudo resolver se buscan entre las globales de
+        esta tabla, como los habría resuelto ASTBuilder con el programa completo.
+        """
+        def linea(valor):
+            return valor + desplazamiento if valor is not None else None
+
+        primera = not self.global_.hijos
+        funcion = otra.global_.hijos[0]
+        ambitos = {}
+        for ambito in funcion.recorrer():
+            copia = ambitos[ambito] = Ambito(ambito.nombre, ambito.clase, linea=linea(ambito.linea))
+            if ambito is not funcion:
+                ambitos[ambito.padre].adoptar((copia,))
+
+        copias = {}
+        for simbolo in otra.simbolos:
+            if simbolo.ambito in ambitos:
+                copia = copias[simbolo] = Simbolo(simbolo.nombre, simbolo.tipo, simbolo.valor,
+                                                  linea(simbolo.linea), ambitos[simbolo.ambito])
+                copia.usos = [(linea(uso), clase) for uso, clase in simbolo.usos]
+        visibles = {nombre: copias[simbolo] for nombre, simbolo in otra.visibles[funcion.nombre].items()}
+        self.declarar_funcion(ambitos[funcion], visibles)
+        for copia in copias.values():
+            self.declarar(copia)
+
+        for nombre, uso, nombre_funcion, clase in otra.no_resueltos:
+            simbolo = None if primera else self.globales.get(nombre)
+            if simbolo is None:
+                self.no_resueltos.append((nombre, linea(uso), nombre_funcion, clase))
+            else:
+                simbolo.usos.append((linea(uso), clase))
+        self.llamadas.extend((nombre, linea(uso), nombre_funcion) for nombre, uso, nombre_funcion in otra.llamadas)
+
+    def __len__(self):
+        return len(self.simbolos)
+
+    def indice_nombres(self):
+        """(nombres en minúsculas ordenados, símbolos en el mismo orden); se arma una vez"""
+        if self._indice_nombres is None:
+            ordenados = sorted(self.simbolos, key=lambda simbolo: (simbolo.nombre.lower(), simbolo.linea or 0))
+            self._indice_nombres = ([simbolo.nombre.lower() for simbolo in ordenados], ordenados)
+        return self._indice_nombres
+
+    def declaraciones(self, nombre):
+        """Símbolos declarados con ese nombre, en orden del código"""
+        return self.por_nombre.get(nombre, [])
+
+    def de_tipo(self, tipo):
+        return self.por_tipo.get(tipo, [])
+
+    def resolver(self, nombre, funcion=None):
+        """Símbolo al que se refiere nombre dentro de funcion (o fuera de toda función)"""
+        if funcion is not None:
+            simbolo = self.visibles.get(funcion, {}).get(nombre)
+            if simbolo is not None:
+                return simbolo
+        return self.globales.get(nombre) or self.global_.simbolos.get(nombre)
+
+    def usos(self, nombre):
+        """(línea, clase de uso, símbolo) de cada uso de los símbolos con ese nombre"""
+        return [(linea, clase, simbolo) for simbolo in self.declaraciones(nombre) for linea, clase in simbolo.usos]
+
+    def donde(self, nombre):
+        """Dónde se declara y dónde se usa nombre: {"declaraciones": [...], "usos": [...]}"""
+        return {
+            "declaraciones": [(simbolo.linea, simbolo.funcion) for simbolo in self.declaraciones(nombre)],
+            "usos": [(linea, clase, simbolo.funcion) for linea, clase, simbolo in self.usos(nombre)],
+        }
+
+    def indice_lineas(self):
+        """(líneas de declaración ordenadas, símbolos en el mismo orden); se arma una vez"""
+        if self._indice_lineas is None:
+            ordenados = sorted((simbolo for simbolo in self.simbolos if simbolo.linea is not None),
+                               key=lambda simbolo: simbolo.linea)
+            self._indice_lineas = ([simbolo.linea for simbolo in ordenados], ordenados)
+        return self._indice_lineas
+
+    def declarados_entre(self, desde, hasta):
+        """Símbolos declarados entre las líneas desde y hasta (inclusive), por búsqueda binaria"""
+        lineas, simbolos = self.indice_lineas()
+        return simbolos[bisect.bisect_left(lineas, desde):bisect.bisect_right(lineas, hasta)]
+
+    def usos_en_linea(self, linea):
+        """(símbolo, clase de uso) de los usos en esa línea"""
+        if self._usos_por_linea is None:
+            self._usos_por_linea = {}
+            for simbolo in self.simbolos:
+                for linea_uso, clase in simbolo.usos:
+                    self._usos_por_linea.setdefault(linea_uso, []).append((simbolo, clase))
+        return self._usos_por_linea.get(linea, [])
+
+    def en_linea(self, linea):
+        """Símbolos declarados y usados en una línea: {"declaraciones": [...], "usos": [...]}"""
+        return {"declaraciones": self.declarados_entre(linea, linea), "usos": self.usos_en_linea(linea)}
+
+    def buscar(self, prefijo):
+        """Símbolos cuyo nombre empieza con prefijo (sin distinguir mayúsculas), por búsqueda binaria"""
+        nombres, simbolos = self.indice_nombres()
+        prefijo = prefijo.lower()
+        posicion = bisect.bisect_left(nombres, prefijo)
+        while posicion < len(nombres) and nombres[posicion].startswith(prefijo):
+            yield simbolos[posicion]
+            posicion += 1
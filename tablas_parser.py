@@ -0,0 +1,68 @@
+"""Tablas de los parsers guardadas en un directorio de caché versionado.
+
+Lark serializa el parser LALR ya analizado y PLY guarda sus tablas LR con
+pickle (sin el reporte parser.out de debug). El nombre de cada archivo
+lleva la versión de la biblioteca y un hash de la gramática y las opciones,
+así que un cambio en cualquiera de ellas genera tablas nuevas en lugar de
+cargar unas viejas. Ejecutar este módulo construye todas las tablas.
+
+Uso: python tablas_parser.py
+"""
+import hashlib
+import os
+
+import lark
+from lark import Lark
+from ply import yacc
+
+
+DIRECTORIO_CACHE = os.environ.get(
+    "ANALIZADOR_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "analizador_lexico"))
+DIRECTORIO_TABLAS = os.path.join(DIRECTORIO_CACHE, "tablas")
+
+
+def directorio_tablas():
+    """Directorio de las tablas, o None si no se puede crear (se construye sin caché)"""
+    try:
+        os.makedirs(DIRECTORIO_TABLAS, exist_ok=True)
+    except OSError:
+        return None
+    return DIRECTORIO_TABLAS
+
+
+def huella(*partes):
+    return hashlib.sha256("\n".join(str(parte) for parte in partes).encode("utf-8")).hexdigest()[:16]
+
+
+def crear_parser_lark(grammar, **opciones):
+    """Lark LALR cargado desde su forma serializada cuando ya existe"""
+    directorio = directorio_tablas()
+    if directorio is not None:
+        # El transformer no cambia las tablas (Lark lo recibe aparte al cargarlas)
+        clave = huella(grammar, sorted((nombre, repr(valor)) for nombre, valor in opciones.items()
+                                       if nombre != "transformer"))
+        opciones["cache"] = os.path.join(directorio, f"lark-{lark.__version__}-{clave}.lark")
+    return Lark(grammar, parser='lalr', **opciones)
+
+
+def crear_parser_ply(modulo):
+    """yacc.yacc del módulo con las tablas LR en un archivo pickle del directorio de caché"""
+    directorio = directorio_tablas()
+    if directorio is None:
+        return yacc.yacc(module=modulo, debug=False, write_tables=False)
+    # PLY comprueba la firma de la gramática al leer y regenera si no coincide
+    ruta = os.path.join(directorio, f"ply-{yacc.__tabversion__}-{modulo.__name__}.pickle")
+    return yacc.yacc(module=modulo, debug=False, picklefile=ruta)
+
+
+if __name__ == "__main__":
+    import analizador_semantico
+    import analizador_sintactico
+    import analisis_incremental
+
+    # Los parsers de nivel de módulo se construyen al importar; estos se crean en el primer uso
+    analizador_semantico.parser_en_linea()
+    analizador_sintactico.nuevo_parser()
+    analisis_incremental.parser_funciones()
+    for nombre in sorted(os.listdir(DIRECTORIO_TABLAS)):
+        print(os.path.join(DIRECTORIO_TABLAS, nombre))
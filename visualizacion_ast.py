@@ -0,0 +1,166 @@
+"""Árbol de dibujo del AST con identificadores enteros, distribución por hojas
+y exportación a DOT o SVG sin matplotlib.
+
+Los nodos se numeran en preorden (0 es la raíz), así que el mismo AST con las
+mismas opciones produce siempre los mismos identificadores y se pueden usar
+para colapsar subárboles. Todo el recorrido es iterativo.
+"""
+from xml.sax.saxutils import escape
+
+from nodos_ast import Nodo
+
+
+# Separación entre hojas y entre niveles en el SVG, en píxeles
+ANCHO_HOJA = 90
+ALTO_NIVEL = 60
+
+
+class ArbolVisual:
+    """Etiquetas, padres e hijos de cada nodo del dibujo, indexados por entero"""
+    __slots__ = ("etiquetas", "padres", "hijos", "profundidades")
+
+    def __init__(self):
+        self.etiquetas = []
+        self.padres = []
+        self.hijos = []
+        self.profundidades = []
+
+    def agregar(self, etiqueta, padre):
+        identificador = len(self.etiquetas)
+        self.etiquetas.append(etiqueta)
+        self.padres.append(padre)
+        self.hijos.append([])
+        self.profundidades.append(0 if padre is None else self.profundidades[padre] + 1)
+        if padre is not None:
+            self.hijos[padre].append(identificador)
+        return identificador
+
+    def __len__(self):
+        return len(self.etiquetas)
+
+    def aristas(self):
+        for hijo, padre in enumerate(self.padres):
+            if padre is not None:
+                yield padre, hijo
+
+
+def hijos_visuales(valor):
+    """(etiqueta, valor) de cada hijo que se dibuja debajo de valor"""
+    if isinstance(valor, Nodo):
+        for clave, hijo in valor.items():
+            if clave == "tipo":
+                continue
+            if isinstance(hijo, (Nodo, list)):
+                yield clave, hijo
+            else:
+                yield f"{clave}: {hijo}", None
+    elif isinstance(valor, list):
+        for hijo in valor:
+            yield None, hijo
+
+
+def etiqueta_visual(valor):
+    if isinstance(valor, Nodo):
+        return valor.tipo
+    return str(valor)
+
+
+def construir_arbol(ast, profundidad_maxima=None, colapsados=()):
+    """ArbolVisual del AST.
+
+    Los nodos a profundidad_maxima y los identificadores en colapsados se
+    dibujan con un único hijo "… (n)" en lugar de su subárbol.
+    """
+    arbol = ArbolVisual()
+    colapsados = set(colapsados)
+    pendientes = [(ast, None, None)]
+    while pendientes:
+        valor, etiqueta, padre = pendientes.pop()
+        if valor is None:
+            arbol.agregar(etiqueta, padre)
+            continue
+        # Una lista se dibuja con el nombre de su campo; sin nombre, sus elementos cuelgan del padre
+        if isinstance(valor, list) and etiqueta is None and padre is not None:
+            pendientes.extend((hijo, None, padre) for hijo in reversed(valor))
+            continue
+        identificador = arbol.agregar((etiqueta or "lista") if isinstance(valor, list) else etiqueta_visual(valor), padre)
+        hijos = list(hijos_visuales(valor))
+        if not hijos:
+            continue
+        if identificador in colapsados or (profundidad_maxima is not None
+                                           and arbol.profundidades[identificador] >= profundidad_maxima):
+            arbol.agregar(f"… ({len(hijos)})", identificador)
+            continue
+        pendientes.extend((hijo, nombre, identificador) for nombre, hijo in reversed(hijos))
+    return arbol
+
+
+def distribuir(arbol):
+    """Posición (x, y) de cada nodo: cada subárbol ocupa un ancho igual a sus hojas"""
+    hojas = [0] * len(arbol)
+    # Los hijos siempre tienen identificador mayor que su padre (preorden)
+    for identificador in range(len(arbol) - 1, -1, -1):
+        hijos = arbol.hijos[identificador]
+        hojas[identificador] = sum(hojas[hijo] for hijo in hijos) if hijos else 1
+
+    posiciones = [None] * len(arbol)
+    if not len(arbol):
+        return posiciones
+    izquierdas = [0.0] * len(arbol)
+    for identificador in range(len(arbol)):
+        izquierda = izquierdas[identificador]
+        posiciones[identificador] = (izquierda + hojas[identificador] / 2, -arbol.profundidades[identificador])
+        for hijo in arbol.hijos[identificador]:
+            izquierdas[hijo] = izquierda
+            izquierda += hojas[hijo]
+    return posiciones
+
+
+def lineas_dot(arbol):
+    """Texto DOT (Graphviz) del árbol, línea por línea"""
+    yield "digraph AST {\n"
+    yield '    node [shape=box, fontname="monospace"];\n'
+    for identificador, etiqueta in enumerate(arbol.etiquetas):
+        texto = etiqueta.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        yield f'    n{identificador} [label="{texto}"];\n'
+    for padre, hijo in arbol.aristas():
+        yield f"    n{padre} -> n{hijo};\n"
+    yield "}\n"
+
+
+def lineas_svg(arbol):
+    """Documento SVG del árbol, línea por línea, con la distribución de distribuir()"""
+    posiciones = distribuir(arbol)
+    ancho = (max((x for x, _ in posiciones), default=0) + 0.5) * ANCHO_HOJA
+    alto = (max((-y for _, y in posiciones), default=0) + 1) * ALTO_NIVEL + ALTO_NIVEL / 2
+
+    def punto(identificador):
+        x, y = posiciones[identificador]
+        return x * ANCHO_HOJA, -y * ALTO_NIVEL + ALTO_NIVEL / 2
+
+    yield (f'<svg xmlns="http://www.w3.org/2000/svg" width="{ancho:.0f}" height="{alto:.0f}" '
+           f'font-family="monospace" font-size="11" text-anchor="middle">\n')
+    yield '<g stroke="#555">\n'
+    for padre, hijo in arbol.aristas():
+        x1, y1 = punto(padre)
+        x2, y2 = punto(hijo)
+        yield f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}"/>\n'
+    yield "</g>\n"
+    for identificador, etiqueta in enumerate(arbol.etiquetas):
+        x, y = punto(identificador)
+        yield f'<text x="{x:.1f}" y="{y:.1f}" fill="#000" stroke="#fff" stroke-width="3" paint-order="stroke">{escape(etiqueta)}</text>\n'
+    yield "</svg>\n"
+
+
+def escribir_arbol(arbol, ruta):
+    """Escribe un ArbolVisual en formato DOT o SVG según la extensión de ruta"""
+    lineas = lineas_svg(arbol) if ruta.lower().endswith(".svg") else lineas_dot(arbol)
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.writelines(lineas)
+
+
+def exportar_ast(ast, ruta, profundidad_maxima=None, colapsados=()):
+    """Escribe el AST en formato DOT o SVG; devuelve el ArbolVisual dibujado"""
+    arbol = construir_arbol(ast, profundidad_maxima, colapsados)
+    escribir_arbol(arbol, ruta)
+    return arbol